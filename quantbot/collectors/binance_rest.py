@@ -6,6 +6,9 @@ from typing import Any, Optional
 import httpx
 import pandas as pd
 
+from quantbot.execution.adapters._http import make_async_client
+from quantbot.utils.fastjson import loads
+
 # Spot REST base (api/v3)
 BASE_URL_SPOT = "https://api.binance.com"
 # USDⓈ-M Futures REST base (fapi)
@@ -49,7 +52,7 @@ def _get_client(*, futures: bool, timeout: float) -> httpx.AsyncClient:
                     asyncio.create_task(_client_futures.aclose())
                 except Exception:
                     pass
-            _client_futures = httpx.AsyncClient(timeout=timeout)
+            _client_futures = make_async_client(timeout)
             _client_futures_loop_id = loop_id
         return _client_futures
     if (
@@ -62,11 +65,21 @@ def _get_client(*, futures: bool, timeout: float) -> httpx.AsyncClient:
                 asyncio.create_task(_client_spot.aclose())
             except Exception:
                 pass
-        _client_spot = httpx.AsyncClient(timeout=timeout)
+        _client_spot = make_async_client(timeout)
         _client_spot_loop_id = loop_id
     return _client_spot
 
 
+async def aclose_clients() -> None:
+    """Close the pooled spot/futures clients (the live loop calls this on shutdown)."""
+    global _client_spot, _client_futures
+    clients = (_client_spot, _client_futures)
+    _client_spot = _client_futures = None
+    for c in clients:
+        if c is not None and not c.is_closed:
+            await c.aclose()
+
+
 def _base_url(*, futures: bool, base_url: Optional[str]) -> str:
     if base_url:
         return str(base_url).rstrip("/")
@@ -111,7 +124,7 @@ async def fetch_binance_klines(
 
         r = await client.get(url, params=params)
         r.raise_for_status()
-        data = r.json()
+        data = loads(r.content)
         if not data:
             break
         out.extend(data)
@@ -166,7 +179,7 @@ async def fetch_binance_klines_latest(
 
     r = await client.get(url, params={"symbol": sym, "interval": interval, "limit": int(limit)})
     r.raise_for_status()
-    data = r.json()
+    data = loads(r.content)
     if not data:
         return pd.DataFrame()
 
@@ -203,7 +216,7 @@ async def fetch_binance_orderbook(
 
     r = await client.get(url, params={"symbol": sym, "limit": int(limit)})
     r.raise_for_status()
-    return r.json()
+    return loads(r.content)
 
 
 async def fetch_binance_recent_trades(
@@ -226,5 +239,5 @@ async def fetch_binance_recent_trades(
 
     r = await client.get(url, params={"symbol": s, "limit": int(limit)})
     r.raise_for_status()
-    data = r.json()
+    data = loads(r.content)
     return data if isinstance(data, list) else []
@@ -136,9 +136,13 @@ def load_candles_df(venue: str, symbol: str, tf: str, limit: int = 500) -> pd.Da
             (venue, symbol, tf, int(limit)),
         )
         rows = cur.fetchall()
+    return _rows_to_df(list(reversed(rows)))
+
+
+def _rows_to_df(rows: list[tuple]) -> pd.DataFrame:
+    """(ts_ms, open, high, low, close, volume) rows in ascending ts order -> OHLCV frame."""
     if not rows:
         return pd.DataFrame(columns=["open", "high", "low", "close", "volume"])
-    rows = list(reversed(rows))
     ts = pd.to_datetime([r[0] for r in rows], unit="ms", utc=True)
     out = pd.DataFrame(
         {
@@ -153,6 +157,39 @@ def load_candles_df(venue: str, symbol: str, tf: str, limit: int = 500) -> pd.Da
     return out
 
 
+def load_candles_multi(venue: str, symbol: str, tfs: list[str], limit_per_tf: int = 500) -> dict[str, pd.DataFrame]:
+    """Load the last N candles of several timeframes in one query.
+
+    Same frames as calling load_candles_df once per tf, but a single connection and
+    statement (row_number() per tf). Every requested tf is present in the result; tfs
+    without data map to an empty frame.
+    """
+    tfs = list(dict.fromkeys(tfs))
+    if not tfs:
+        return {}
+    _init()
+    marks = ",".join("?" * len(tfs))
+    with _connect() as conn:
+        cur = conn.execute(
+            f"""
+            SELECT tf, ts_ms, open, high, low, close, volume FROM (
+                SELECT tf, ts_ms, open, high, low, close, volume,
+                       ROW_NUMBER() OVER (PARTITION BY tf ORDER BY ts_ms DESC) AS rn
+                FROM candles
+                WHERE venue=? AND symbol=? AND tf IN ({marks})
+            )
+            WHERE rn <= ?
+            ORDER BY tf, ts_ms
+            """,
+            (venue, symbol, *tfs, int(limit_per_tf)),
+        )
+        rows = cur.fetchall()
+    by_tf: dict[str, list[tuple]] = {tf: [] for tf in tfs}
+    for r in rows:
+        by_tf[r[0]].append(r[1:])
+    return {tf: _rows_to_df(rs) for tf, rs in by_tf.items()}
+
+
 def insert_news(item: NewsItem) -> None:
     _init()
     ts = item.ts or utc_now()
@@ -2,14 +2,49 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
 
 import httpx
 import pandas as pd
 
+from quantbot.execution.adapters._http import make_async_client
+from quantbot.utils.fastjson import loads
+
 
 BASE_URL = "https://api.upbit.com"
 
+# One pooled client (same scheme as binance_rest): the live loop polls the orderbook every
+# tick, and a client per call paid a fresh TCP+TLS handshake each time.
+_client: Optional[httpx.AsyncClient] = None
+_client_loop_id: Optional[int] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client, _client_loop_id
+
+    try:
+        loop_id: Optional[int] = id(asyncio.get_running_loop())
+    except RuntimeError:
+        loop_id = None
+    # AsyncClient is bound to the loop that created it; recreate after a loop restart.
+    if _client is None or _client.is_closed or (_client_loop_id is not None and loop_id is not None and _client_loop_id != loop_id):
+        if _client is not None and not _client.is_closed:
+            try:
+                asyncio.create_task(_client.aclose())
+            except Exception:
+                pass
+        _client = make_async_client(20)
+        _client_loop_id = loop_id
+    return _client
+
+
+async def aclose_client() -> None:
+    """Close the pooled client (the live loop calls this on shutdown)."""
+    global _client
+    client, _client = _client, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
 
 def _to_param_from_ts(ts: pd.Timestamp) -> str:
     # Upbit accepts `to` as ISO8601 (UTC) like 2025-12-18T00:00:00Z
@@ -36,35 +71,32 @@ async def fetch_upbit_candles(market: str, tf: str, total: int = 200) -> pd.Data
     else:
         raise ValueError(f"Unsupported tf for Upbit: {tf}")
 
-    client = httpx.AsyncClient(timeout=20)
+    client = _get_client()
     out: list[dict[str, Any]] = []
     to: str | None = None
 
-    try:
-        remaining = int(total)
-        while remaining > 0:
-            count = min(200, remaining)
-            params: dict[str, Any] = {"market": market, "count": count}
-            if to:
-                params["to"] = to
-            r = await client.get(BASE_URL + path, params=params, headers={"accept": "application/json"})
-            r.raise_for_status()
-            data = r.json()
-            if not data:
-                break
-            out.extend(data)
-
-            # next page: oldest candle time
-            oldest = data[-1].get("candle_date_time_utc")
-            if not oldest:
-                break
-            # subtract 1s to avoid duplication
-            dt = pd.to_datetime(oldest).tz_localize("UTC")
-            to = _to_param_from_ts(dt - pd.Timedelta(seconds=1))
-            remaining -= len(data)
-            await asyncio.sleep(0.05)
-    finally:
-        await client.aclose()
+    remaining = int(total)
+    while remaining > 0:
+        count = min(200, remaining)
+        params: dict[str, Any] = {"market": market, "count": count}
+        if to:
+            params["to"] = to
+        r = await client.get(BASE_URL + path, params=params, headers={"accept": "application/json"})
+        r.raise_for_status()
+        data = loads(r.content)
+        if not data:
+            break
+        out.extend(data)
+
+        # next page: oldest candle time
+        oldest = data[-1].get("candle_date_time_utc")
+        if not oldest:
+            break
+        # subtract 1s to avoid duplication
+        dt = pd.to_datetime(oldest).tz_localize("UTC")
+        to = _to_param_from_ts(dt - pd.Timedelta(seconds=1))
+        remaining -= len(data)
+        await asyncio.sleep(0.05)
 
     # Upbit returns newest first; convert to ascending
     rows = []
@@ -87,13 +119,9 @@ async def fetch_upbit_candles(market: str, tf: str, total: int = 200) -> pd.Data
 
 
 async def fetch_upbit_orderbook(market: str) -> Any:
-    client = httpx.AsyncClient(timeout=10)
-    try:
-        r = await client.get(BASE_URL + "/v1/orderbook", params={"markets": market})
-        r.raise_for_status()
-        return r.json()
-    finally:
-        await client.aclose()
+    r = await _get_client().get(BASE_URL + "/v1/orderbook", params={"markets": market}, timeout=10)
+    r.raise_for_status()
+    return loads(r.content)
 
 
 
@@ -102,11 +130,7 @@ async def fetch_upbit_recent_trades(market: str, count: int = 200) -> list[dict]
 
     Upbit returns a list where `ask_bid` is "BID" for buy-side trades and "ASK" for sell-side trades.
     """
-    client = httpx.AsyncClient(timeout=10)
-    try:
-        r = await client.get(BASE_URL + "/v1/trades/ticks", params={"market": market, "count": int(count)})
-        r.raise_for_status()
-        data = r.json()
-        return data if isinstance(data, list) else []
-    finally:
-        await client.aclose()
+    r = await _get_client().get(BASE_URL + "/v1/trades/ticks", params={"market": market, "count": int(count)}, timeout=10)
+    r.raise_for_status()
+    data = loads(r.content)
+    return data if isinstance(data, list) else []
@@ -194,6 +194,9 @@ class Settings(BaseSettings):
     KIWOOM_ACCOUNT_NO: str | None = None
     KIWOOM_BASE_URL: str = "https://api.kiwoom.com"
 
+    # HTTP client for the Kiwoom/Namoo adapters: "httpx" (default) or "aiohttp" (optional package).
+    HTTP_BACKEND: str = "httpx"
+
     # Keyword-based news scoring (toy)
     NEWS_POSITIVE: str = "수주,공급계약,계약,임상,승인,인수,합병,흑자전환"
     NEWS_NEGATIVE: str = "횡령,배임,유상증자,상장폐지,상폐,해킹,제재,조사"
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+"""Helpers for reading broker responses whose field names vary by API version/bridge."""
+
+from typing import Any, Mapping
+
+
+def first_present(d: Mapping[str, Any], *keys: str, default: Any = None) -> Any:
+    """Return the first value under `keys` that is neither None nor an empty string."""
+    for k in keys:
+        v = d.get(k)
+        if v is not None and v != "":
+            return v
+    return default
+
+
+def to_float(x: Any, default: float | None = None) -> float | None:
+    """float(x), or `default` when x is None or not numeric."""
+    if x is None:
+        return default
+    try:
+        return float(x)
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+"""Shared HTTP client construction for the REST adapters.
+
+Every adapter builds its client here so pool settings stay identical across venues.
+HTTP/2 is enabled only when the optional `h2` package is installed.
+
+`singleflight`/`cached_singleflight` collapse concurrent identical lookups (prices,
+orderbooks, exchange info) into one request per key.
+
+Adapters talk to their client only through `request_json`/`post_json` and `aclose()`,
+so an `AiohttpClient` (optional `aiohttp` package) can be injected in place of httpx
+for the market-data polling paths (Settings.HTTP_BACKEND="aiohttp").
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Hashable, Mapping, MutableMapping, Optional, Union
+
+import httpx
+
+from quantbot.utils.fastjson import dumps_bytes, loads
+
+try:
+    import h2  # type: ignore  # noqa: F401
+
+    _HTTP2 = True
+except Exception:  # pragma: no cover
+    _HTTP2 = False
+
+try:
+    import aiohttp  # type: ignore
+except Exception:  # pragma: no cover
+    aiohttp = None  # type: ignore
+
+
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0)
+
+
+def make_async_client(timeout: float = 10.0, **kwargs) -> httpx.AsyncClient:
+    """Build an AsyncClient with keepalive pool limits (and HTTP/2 when available).
+
+    Extra kwargs are passed through (e.g. `transport=httpx.MockTransport(...)` in tests).
+    """
+    kwargs.setdefault("limits", DEFAULT_LIMITS)
+    kwargs.setdefault("http2", _HTTP2)
+    return httpx.AsyncClient(timeout=timeout, **kwargs)
+
+
+class AiohttpClient:
+    """Minimal aiohttp-backed client for the request_json/post_json paths."""
+
+    def __init__(self, timeout: float = 10.0):
+        if aiohttp is None:
+            raise RuntimeError("HTTP_BACKEND=aiohttp requires the aiohttp package (pip install aiohttp)")
+        self._timeout = aiohttp.ClientTimeout(total=float(timeout))
+        self._session: Any = None
+        self._closed = False
+
+    @property
+    def is_closed(self) -> bool:
+        return self._closed
+
+    def _get_session(self) -> Any:
+        # ClientSession must be created inside the running loop, so build it lazily.
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=100, limit_per_host=20, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(timeout=self._timeout, connector=connector)
+        return self._session
+
+    async def request_json(
+        self,
+        method: str,
+        url: str,
+        *,
+        content: bytes | None = None,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Any:
+        async with self._get_session().request(method, url, data=content, params=params, headers=headers) as r:
+            r.raise_for_status()
+            return loads(await r.read())
+
+    async def aclose(self) -> None:
+        self._closed = True
+        if self._session is not None:
+            await self._session.close()
+
+
+AsyncHTTP = Union[httpx.AsyncClient, AiohttpClient]
+
+
+def make_http_client(timeout: float = 10.0, backend: str = "httpx") -> AsyncHTTP:
+    if (backend or "httpx").lower() == "aiohttp":
+        return AiohttpClient(timeout)
+    return make_async_client(timeout)
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+async def request_json(
+    client: AsyncHTTP,
+    method: str,
+    url: str,
+    *,
+    body: Any = None,
+    params: Optional[Mapping[str, Any]] = None,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Any:
+    """Send an optional JSON body and decode the JSON response (orjson when available).
+
+    When `headers` is given it must already carry the Content-Type for bodies.
+    """
+    content = None
+    if body is not None:
+        content = dumps_bytes(body)
+        if headers is None:
+            headers = _JSON_HEADERS
+    if isinstance(client, AiohttpClient):
+        return await client.request_json(method, url, content=content, params=params, headers=headers)
+    r = await client.request(method, url, content=content, params=params, headers=headers)
+    r.raise_for_status()
+    return loads(r.content)
+
+
+async def post_json(
+    client: AsyncHTTP, url: str, body: Any, headers: Optional[Mapping[str, str]] = None
+) -> Any:
+    return await request_json(client, "POST", url, body=body, headers=headers)
+
+
+# Process-wide clients keyed by base URL, so several adapters talking to the same host
+# share one keepalive pool. Adapters built with an injected client never close it;
+# the owner (the live loop) calls aclose_shared_clients() on shutdown.
+_SHARED_CLIENTS: dict[str, AsyncHTTP] = {}
+
+
+def shared_async_client(base_url: str, timeout: float = 10.0, backend: str = "httpx") -> AsyncHTTP:
+    key = (base_url or "").rstrip("/")
+    client = _SHARED_CLIENTS.get(key)
+    if client is None or client.is_closed:
+        client = make_http_client(timeout, backend)
+        _SHARED_CLIENTS[key] = client
+    return client
+
+
+async def aclose_shared_clients() -> None:
+    clients = list(_SHARED_CLIENTS.values())
+    _SHARED_CLIENTS.clear()
+    for c in clients:
+        try:
+            await c.aclose()
+        except Exception:
+            pass
+
+
+async def singleflight(
+    inflight: MutableMapping[Hashable, asyncio.Future],
+    key: Hashable,
+    fetch: Callable[[], Awaitable[Any]],
+    *,
+    track: Optional[Callable[[asyncio.Future], Any]] = None,
+) -> Any:
+    """Run `fetch` once per key; concurrent callers await the same in-flight result.
+
+    `track` lets the owner register the shared future (e.g. to cancel it on close).
+    """
+    fut = inflight.get(key)
+    if fut is None:
+        fut = asyncio.ensure_future(fetch())
+        if track is not None:
+            track(fut)
+        inflight[key] = fut
+        fut.add_done_callback(lambda _f, k=key: inflight.pop(k, None))
+    # shield: one caller being cancelled must not cancel the shared fetch.
+    return await asyncio.shield(fut)
+
+
+async def cached_singleflight(
+    cache: MutableMapping[Hashable, tuple[float, Any]],
+    inflight: MutableMapping[Hashable, asyncio.Future],
+    key: Hashable,
+    ttl: float,
+    fetch: Callable[[], Awaitable[Any]],
+    *,
+    track: Optional[Callable[[asyncio.Future], Any]] = None,
+) -> Any:
+    """`singleflight` behind a per-key TTL cache of (monotonic ts, value); ttl <= 0 disables both."""
+    if ttl <= 0:
+        return await fetch()
+    hit = cache.get(key)
+    if hit is not None and time.monotonic() - hit[0] < ttl:
+        return hit[1]
+    value = await singleflight(inflight, key, fetch, track=track)
+    cache[key] = (time.monotonic(), value)
+    return value
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+"""Process-wide short-TTL last-price cache keyed by (venue, symbol).
+
+Used to collapse duplicate ticker hits made within a few hundred ms (equity marks,
+IOC legs re-pricing the same symbol). Callers decide the TTL; 0 disables caching.
+"""
+
+import os
+import time
+
+_PRICE_CACHE: dict[tuple[str, str], tuple[float, float]] = {}  # key -> (price, expires_at)
+
+
+def default_price_ttl() -> float:
+    """TTL from QUANTBOT_PRICE_CACHE_TTL (seconds), 0 when unset/invalid."""
+    try:
+        return max(0.0, float(os.getenv("QUANTBOT_PRICE_CACHE_TTL", "0") or 0.0))
+    except ValueError:
+        return 0.0
+
+
+def get_cached_price(venue: str, symbol: str) -> float | None:
+    hit = _PRICE_CACHE.get((venue, symbol))
+    if hit is not None and time.monotonic() < hit[1]:
+        return hit[0]
+    return None
+
+
+def put_cached_price(venue: str, symbol: str, price: float, ttl: float) -> None:
+    if ttl > 0:
+        _PRICE_CACHE[(venue, symbol)] = (float(price), time.monotonic() + ttl)
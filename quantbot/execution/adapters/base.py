@@ -1,12 +1,48 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from functools import cached_property
+from typing import Any, Callable
 from quantbot.common.types import OrderRequest, OrderUpdate
+from quantbot.features.orderbook import OB_UNKNOWN, OBSnapshot, orderbook_parser
+from quantbot.utils.time import utc_now
 
 class BrokerAdapter(ABC):
+    # Shape of the orderbooks this adapter's venue returns (quantbot.features.orderbook.OB_*).
+    # Known shapes get a specialised parser; OB_UNKNOWN sniffs every snapshot.
+    orderbook_schema: int = OB_UNKNOWN
+
+    @cached_property
+    def _ob_parser(self) -> Callable[[Any, int], OBSnapshot]:
+        return orderbook_parser(self.orderbook_schema)
+
+    def parse_orderbook(self, orderbook: Any, depth: int = 10) -> OBSnapshot:
+        """Parse one of this venue's orderbook payloads (never raises)."""
+        return self._ob_parser(orderbook, depth)
+
+    def _reject(self, req: OrderRequest, err: Any, raw: dict[str, Any] | None = None) -> OrderUpdate:
+        """Canonical REJECTED update for a request that failed before/at the venue."""
+        return OrderUpdate(
+            venue=req.venue,
+            order_id="",
+            symbol=req.symbol,
+            status="REJECTED",
+            client_order_id=req.client_order_id,
+            ts=utc_now(),
+            raw=raw if raw is not None else {"error": str(err)},
+        )
+
     @abstractmethod
     async def place_order(self, req: OrderRequest) -> OrderUpdate:
         ...
 
+    async def get_single_order(self, symbol: str, order_id: str) -> OrderUpdate:
+        """Status of one order from the venue's direct single-order endpoint.
+
+        Optional; the executor falls back to `get_order_update` when this raises
+        NotImplementedError.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def get_last_price(self, symbol: str) -> float:
         ...
@@ -18,3 +54,12 @@ class BrokerAdapter(ABC):
     @abstractmethod
     async def get_positions(self) -> dict[str, float]:
         ...
+
+    async def close(self) -> None:
+        """Release the adapter's long-lived HTTP client (call once, on shutdown).
+
+        Adapters hold one pooled keep-alive client for their lifetime; creating a client
+        per request would pay a TCP+TLS handshake on every order / confirmation poll.
+        Must be idempotent. The default has nothing to release.
+        """
+        return None
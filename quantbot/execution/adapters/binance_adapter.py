@@ -8,8 +8,11 @@ from typing import Any
 
 import httpx
 
+from quantbot.execution.adapters._http import make_async_client
 from quantbot.execution.adapters.base import BrokerAdapter
+from quantbot.features.orderbook import OB_BOOK_LISTS
 from quantbot.common.types import OrderRequest, OrderUpdate
+from quantbot.utils.fastjson import loads
 from quantbot.utils.time import utc_now
 
 
@@ -20,11 +23,22 @@ class BinanceAdapter(BrokerAdapter):
       - https://developers.binance.com/docs/binance-spot-api-docs/rest-api/request-security
     """
 
-    def __init__(self, api_key: str, api_secret: str, base_url: str = "https://api.binance.com"):
+    orderbook_schema = OB_BOOK_LISTS
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        base_url: str = "https://api.binance.com",
+        client: httpx.AsyncClient | None = None,
+    ):
         self.api_key = api_key
         self.api_secret = api_secret.encode("utf-8")
         self.base_url = base_url.rstrip("/")
-        self.client = httpx.AsyncClient(timeout=15)
+        # One pooled keep-alive client for the adapter's lifetime; only close our own.
+        self._owns_client = client is None
+        self.client = client if client is not None else make_async_client(15)
+        self._closed = False
 
     @staticmethod
     def _norm_symbol(symbol: str) -> str:
@@ -40,17 +54,17 @@ class BinanceAdapter(BrokerAdapter):
         url = f"{self.base_url}{path}"
         r = await self.client.get(url, params=params)
         r.raise_for_status()
-        return r.json()
+        return loads(r.content)
 
     async def _signed(self, method: str, path: str, params: dict[str, Any] | None = None) -> Any:
         params = dict(params or {})
-        params.setdefault("timestamp", int(time.time() * 1000))
+        params.setdefault("timestamp", time.time_ns() // 1_000_000)
         params.setdefault("recvWindow", 5000)
         url = f"{self.base_url}{path}?{self._sign(params)}"
         headers = {"X-MBX-APIKEY": self.api_key}
         r = await self.client.request(method, url, headers=headers)
         r.raise_for_status()
-        return r.json()
+        return loads(r.content)
 
     async def place_order(self, req: OrderRequest) -> OrderUpdate:
         symbol = self._norm_symbol(req.symbol)
@@ -188,6 +202,9 @@ class BinanceAdapter(BrokerAdapter):
             raw=data,
         )
 
+    # GET .../order?orderId= is already the single-order endpoint.
+    get_single_order = get_order_update
+
     @staticmethod
     def _fmt_qty(x: float) -> str:
         # Binance expects decimal string; avoid scientific notation.
@@ -196,3 +213,10 @@ class BinanceAdapter(BrokerAdapter):
     @staticmethod
     def _fmt_price(x: float) -> str:
         return f"{float(x):.10f}".rstrip("0").rstrip(".")
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._owns_client:
+            await self.client.aclose()
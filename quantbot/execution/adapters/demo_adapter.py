@@ -8,7 +8,9 @@ from quantbot.execution.adapters.base import BrokerAdapter
 
 
 class DemoAdapter(BrokerAdapter):
-    def __init__(self):
+    def __init__(self, *, fill_latency: float = 0.0):
+        # Simulated fill delay in seconds; 0 keeps backtests free of forced sleeps.
+        self._fill_latency = max(0.0, float(fill_latency or 0.0))
         self._equity = 10_000_000.0
         self._pos: dict[str, float] = {}
         self._prices: dict[str, float] = {}
@@ -17,7 +19,8 @@ class DemoAdapter(BrokerAdapter):
         self._prices[symbol] = px
 
     async def place_order(self, req: OrderRequest) -> OrderUpdate:
-        await asyncio.sleep(0.02)
+        if self._fill_latency:
+            await asyncio.sleep(self._fill_latency)
         px = float(req.price or self._prices.get(req.symbol, 0.0))
         if px <= 0:
             return OrderUpdate(
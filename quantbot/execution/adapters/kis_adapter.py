@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import hashlib
 import time
-from typing import Any
 
 import httpx
 
+from quantbot.execution.adapters._http import make_async_client
 from quantbot.execution.adapters.base import BrokerAdapter
 from quantbot.common.types import OrderRequest, OrderUpdate
+from quantbot.utils.fastjson import dumps_bytes, loads
 from quantbot.utils.time import utc_now
 
 
@@ -21,6 +23,11 @@ class KISAdapter(BrokerAdapter):
 
     NOTE: KIS API parameters can vary by account type and environment (prod/vps). If your
     account rejects the request, check the portal for required fields and TR IDs.
+
+    Hashkeys come from the server (/uapi/hashkey) by default and are cached per body.
+    local_hashkey=True skips that round-trip with a locally computed SHA256 of
+    appsecret + body; the server's hashkey is opaque and this formula is unverified, so
+    only enable it after confirming your environment accepts it.
     """
 
     def __init__(
@@ -30,15 +37,26 @@ class KISAdapter(BrokerAdapter):
         account_no: str,
         product_code: str,
         base_url: str = "https://openapi.koreainvestment.com:9443",
+        local_hashkey: bool = False,
+        client: httpx.AsyncClient | None = None,
     ):
         self.app_key = app_key
         self.app_secret = app_secret
         self.account_no = account_no
         self.product_code = product_code
         self.base_url = base_url.rstrip("/")
-        self.client = httpx.AsyncClient(timeout=20)
+        # One pooled keep-alive client for the adapter's lifetime; only close our own.
+        self._owns_client = client is None
+        self.client = client if client is not None else make_async_client(20)
+        self._closed = False
         self._access_token: str | None = None
         self._access_token_exp: float = 0.0
+        # Invariant request headers, rebuilt only when the token changes.
+        self._base_headers: dict[str, str] = {}
+        self.local_hashkey = bool(local_hashkey)
+        self._hashkey_cache: dict[bytes, str] = {}
+        # Account fields are fixed per adapter; orders only add the per-order keys.
+        self._order_template: dict[str, str] = {"CANO": account_no, "ACNT_PRDT_CD": product_code}
 
     async def ensure_token(self) -> None:
         if self._access_token and time.time() < (self._access_token_exp - 60):
@@ -51,41 +69,48 @@ class KISAdapter(BrokerAdapter):
         }
         r = await self.client.post(url, json=payload)
         r.raise_for_status()
-        data = r.json()
+        data = loads(r.content)
         self._access_token = data.get("access_token")
         expires_in = float(data.get("expires_in") or 0)
         # KIS docs typically state 24h validity, but trust response.
         self._access_token_exp = time.time() + max(0.0, expires_in)
         if not self._access_token:
             raise RuntimeError(f"Failed to obtain KIS token: {data}")
-
-    async def _hashkey(self, body: dict[str, Any]) -> str:
-        """Generate hashkey for POST bodies (recommended/required for some endpoints)."""
-        await self.ensure_token()
-        url = f"{self.base_url}/uapi/hashkey"
-        headers = {
+        self._base_headers = {
             "content-type": "application/json",
             "authorization": f"Bearer {self._access_token}",
             "appkey": self.app_key,
             "appsecret": self.app_secret,
+            "custtype": "P",  # 개인
         }
-        r = await self.client.post(url, headers=headers, json=body)
+
+    async def _hashkey(self, body_bytes: bytes) -> str:
+        """Generate hashkey for POST bodies (recommended/required for some endpoints).
+
+        body_bytes must be the exact payload that will be sent with the order.
+        """
+        if self.local_hashkey:
+            return hashlib.sha256(self.app_secret.encode("utf-8") + body_bytes).hexdigest()
+
+        cached = self._hashkey_cache.get(body_bytes)
+        if cached:
+            return cached
+
+        await self.ensure_token()
+        url = f"{self.base_url}/uapi/hashkey"
+        r = await self.client.post(url, headers=self._base_headers, content=body_bytes)
         r.raise_for_status()
-        data = r.json()
+        data = loads(r.content)
         hk = data.get("HASH") or data.get("hash") or data.get("hashkey")
         if not hk:
             raise RuntimeError(f"Failed to obtain hashkey: {data}")
+        if len(self._hashkey_cache) >= 256:
+            self._hashkey_cache.pop(next(iter(self._hashkey_cache)))
+        self._hashkey_cache[body_bytes] = hk
         return hk
 
     def _headers(self, tr_id: str, hashkey: str | None = None) -> dict[str, str]:
-        h = {
-            "content-type": "application/json",
-            "authorization": f"Bearer {self._access_token}",
-            "appkey": self.app_key,
-            "appsecret": self.app_secret,
-            "tr_id": tr_id,
-            "custtype": "P",  # 개인
-        }
+        h = {**self._base_headers, "tr_id": tr_id}
         if hashkey:
             h["hashkey"] = hashkey
         return h
@@ -101,7 +126,7 @@ class KISAdapter(BrokerAdapter):
         headers = self._headers("FHKST01010100")
         r = await self.client.get(url, headers=headers, params=params)
         r.raise_for_status()
-        data = r.json()
+        data = loads(r.content)
         # official response contains output -> stck_prpr (현재가)
         out = data.get("output") or {}
         px = out.get("stck_prpr") or out.get("stck_prpr1") or out.get("stck_prpr2")
@@ -121,9 +146,7 @@ class KISAdapter(BrokerAdapter):
         ord_dvsn = "00" if order_type == "LIMIT" else "01"
         ord_unpr = "0" if order_type != "LIMIT" else str(req.price if req.price is not None else 0)
 
-        body = {
-            "CANO": self.account_no,
-            "ACNT_PRDT_CD": self.product_code,
+        body = self._order_template | {
             "PDNO": req.symbol,
             "ORD_DVSN": ord_dvsn,
             "ORD_QTY": str(req.qty),
@@ -133,11 +156,13 @@ class KISAdapter(BrokerAdapter):
         tr_id = "TTTC0802U" if side == "BUY" else "TTTC0801U"
 
         try:
-            hk = await self._hashkey(body)
+            # Serialize once (sorted keys) so the hashed bytes are exactly what we send.
+            body_bytes = dumps_bytes(body, sort_keys=True)
+            hk = await self._hashkey(body_bytes)
             headers = self._headers(tr_id, hashkey=hk)
-            r = await self.client.post(url, headers=headers, json=body)
+            r = await self.client.post(url, headers=headers, content=body_bytes)
             r.raise_for_status()
-            data = r.json()
+            data = loads(r.content)
 
             out = data.get("output") or {}
             order_id = out.get("ODNO") or out.get("odno") or ""
@@ -179,3 +204,10 @@ class KISAdapter(BrokerAdapter):
     async def get_positions(self) -> dict[str, float]:
         # TODO: Implement via '주식잔고조회' endpoint.
         return {}
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._owns_client:
+            await self.client.aclose()
@@ -1,15 +1,50 @@
 from __future__ import annotations
 
+import asyncio
+import calendar
+import datetime as _dt
+import hashlib
+import json
+import os
 import time
+from pathlib import Path
 from typing import Any, Dict, Optional, List
 
-import httpx
+import numpy as np
 
 from quantbot.common.types import OrderRequest, OrderUpdate
+from quantbot.execution.adapters._fields import first_present, to_float
+from quantbot.execution.adapters._http import AsyncHTTP, cached_singleflight, make_async_client, post_json
 from quantbot.execution.adapters.base import BrokerAdapter
+from quantbot.features.orderbook import OB_BOOK_LISTS, OB_SOA
 from quantbot.utils.time import utc_now
 
 
+# Orderbook field names per level (1..10): Kiwoom ka10004 names first, then common fallbacks.
+_KIWOOM_OB_KEYS: tuple[tuple[tuple[str, ...], tuple[str, ...], tuple[str, ...], tuple[str, ...]], ...] = tuple(
+    (
+        (f"buy_{i}th_pre_bid", f"bid{i}", f"buy{i}_price"),
+        (f"buy_{i}th_pre_bid_rsqn", f"bid{i}_qty", f"buy{i}_qty"),
+        (f"sel_{i}th_pre_bid", f"ask{i}", f"sel{i}_price"),
+        (f"sel_{i}th_pre_bid_rsqn", f"ask{i}_qty", f"sel{i}_qty"),
+    )
+    for i in range(1, 11)
+)
+# Same keys flattened level-major (bid_px, bid_qty, ask_px, ask_qty per level) for np.fromiter.
+_KIWOOM_OB_FIELDS: tuple[tuple[str, ...], ...] = tuple(keys for level in _KIWOOM_OB_KEYS for keys in level)
+
+# Kiwoom reports token expiry in Korea Standard Time (UTC+9, no DST).
+_KST_OFFSET_SEC = 9 * 3600
+
+# Response field aliases, probed in order.
+_ORDER_ID_KEYS = ("ord_no", "order_no", "ordNo")
+_STATUS_KEYS = ("status", "result")
+_EQUITY_KEYS = ("day_stk_asst", "tot_evlt_amt", "dbst_bal")
+_POSITION_LIST_KEYS = ("day_bal_rt", "positions", "items")
+# req.meta keys allowed to override the order body template.
+_ORDER_OVERRIDE_KEYS = ("dmst_stex_tp", "accno", "passwd", "input_pw", "cond_uv")
+
+
 class KiwoomRestAdapter(BrokerAdapter):
     """Kiwoom REST API adapter (stocks)."""
 
@@ -20,57 +55,183 @@ class KiwoomRestAdapter(BrokerAdapter):
         account_no: str,
         base_url: str = "https://api.kiwoom.com",
         timeout: float = 5.0,
+        client: AsyncHTTP | None = None,
+        ob_ttl: float = 0.0,
+        token_cache_path: str | None = "~/.quantbot/kiwoom_token.json",
+        numpy_orderbook: bool = False,
     ):
         self.appkey = appkey
         self.secretkey = secretkey
         self.account_no = account_no
         self.base_url = base_url.rstrip("/")
-        self.client = httpx.AsyncClient(timeout=timeout)
+        # Endpoint URLs used on the polling/order paths, built once.
+        self._order_url = f"{self.base_url}/api/dostk/ordr"
+        self._orderbook_url = f"{self.base_url}/api/dostk/mrkcond"
+        self._acnt_url = f"{self.base_url}/api/dostk/acnt"
+        # An injected client is shared with other adapters; only close what we created.
+        self._owns_client = client is None
+        self.client = client if client is not None else make_async_client(timeout)
+        # Order fields that only change via req.meta overrides.
+        self._order_body_template: Dict[str, Any] = {
+            "dmst_stex_tp": "KRX",
+            "accno": self.account_no,
+            "passwd": "",
+            "input_pw": "00",
+            "cond_uv": "",
+        }
 
         self._token: Optional[str] = None
         self._token_expiry_ts: float = 0.0
+        # Serializes refreshes so a burst of callers triggers a single /oauth2/token POST.
+        self._token_lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
+        # Background tasks/futures owned by this adapter; cancelled by close().
+        self._tasks: set[asyncio.Future] = set()
+        self._closed = False
+        # Optional short-TTL orderbook cache (0 = off); concurrent misses share one request.
+        self._ob_ttl = max(0.0, float(ob_ttl or 0.0))
+        self._ob_cache: Dict[str, tuple[float, Dict[str, Any]]] = {}
+        self._ob_refresh: Dict[str, asyncio.Future] = {}
+        # Opt-in SoA orderbook: {"bid_px","bid_qty","ask_px","ask_qty"} float64 arrays
+        # instead of [[p, q], ...] lists (features.orderbook accepts both shapes).
+        self.numpy_orderbook = bool(numpy_orderbook)
+        self.orderbook_schema = OB_SOA if self.numpy_orderbook else OB_BOOK_LISTS
+        # Request headers derived from the current token; rebuilt on refresh.
+        self._auth_header: str = ""
+        self._base_headers: Dict[str, str] = {}
+        self._headers_by_api_id: Dict[str, Dict[str, str]] = {}
+        # kt00017 (daily account status) feeds both get_equity and get_positions.
+        self._acnt_cache: tuple[float, Dict[str, Any]] | None = None
+        self._acnt_ttl = 1.0
+        # (minute bucket, local YYYYMMDD) so strftime runs at most once a minute.
+        self._cached_ymd: tuple[int, str] | None = None
+        self._acnt_body_cache: Dict[str, str] = {}
+
+        # Reuse a still-valid token from a previous run (skips the cold-start /oauth2/token).
+        self._token_cache_path = Path(token_cache_path).expanduser() if token_cache_path else None
+        self._load_cached_token()
 
     async def _get_token(self) -> str:
-        now = time.time()
-        if self._token and now < self._token_expiry_ts - 10:
+        if self._token and time.time() < self._token_expiry_ts - 10:
             return self._token
 
-        r = await self.client.post(
+        async with self._token_lock:
+            # Another coroutine may have refreshed while we waited for the lock.
+            if self._token and time.time() < self._token_expiry_ts - 10:
+                return self._token
+            return await self._refresh_token()
+
+    async def _refresh_token(self) -> str:
+        """POST /oauth2/token and update token state. Caller must hold _token_lock."""
+        now = time.time()
+        data = await post_json(
+            self.client,
             f"{self.base_url}/oauth2/token",
-            json={"grant_type": "client_credentials", "appkey": self.appkey, "secretkey": self.secretkey},
+            {"grant_type": "client_credentials", "appkey": self.appkey, "secretkey": self.secretkey},
             headers={"Content-Type": "application/json;charset=UTF-8"},
         )
-        r.raise_for_status()
-        data = r.json()
         tok = data.get("token")
         if not tok:
             raise RuntimeError(f"Kiwoom token response missing token: {data}")
 
         expires_dt = str(data.get("expires_dt") or "")
-        self._token = tok
         try:
             if len(expires_dt) >= 14:
-                import datetime as _dt
-
-                exp = _dt.datetime.strptime(expires_dt[:14], "%Y%m%d%H%M%S")
-                self._token_expiry_ts = exp.timestamp()
+                # expires_dt is KST "YYYYMMDDhhmmss"; parse by slicing instead of strptime.
+                e = expires_dt
+                exp_ts = float(
+                    calendar.timegm(
+                        (int(e[0:4]), int(e[4:6]), int(e[6:8]), int(e[8:10]), int(e[10:12]), int(e[12:14]), 0, 0, 0)
+                    )
+                    - _KST_OFFSET_SEC
+                )
             else:
-                self._token_expiry_ts = now + 3600
+                exp_ts = now + 3600
+        except Exception:
+            exp_ts = now + 3600
+
+        self._set_token(tok, exp_ts)
+        self._save_cached_token()
+        return tok
+
+    def _set_token(self, tok: str, expiry_ts: float) -> None:
+        self._token = tok
+        self._token_expiry_ts = expiry_ts
+        self._auth_header = "Bearer " + tok
+        self._base_headers = {"Content-Type": "application/json;charset=UTF-8", "authorization": self._auth_header}
+        self._headers_by_api_id = {}
+
+    def _token_cache_key(self) -> str:
+        # Fingerprint so a cached token is never reused for another appkey/host.
+        return hashlib.sha256(f"{self.base_url}|{self.appkey}".encode("utf-8")).hexdigest()[:32]
+
+    def _load_cached_token(self) -> None:
+        if self._token_cache_path is None:
+            return
+        try:
+            data = json.loads(self._token_cache_path.read_text(encoding="utf-8"))
+            if data.get("key") != self._token_cache_key():
+                return
+            tok = str(data.get("token") or "")
+            exp = float(data.get("exp") or 0.0)
+            if tok and time.time() < exp - 60:
+                self._set_token(tok, exp)
         except Exception:
-            self._token_expiry_ts = now + 3600
+            return
+
+    def _save_cached_token(self) -> None:
+        if self._token_cache_path is None or not self._token:
+            return
+        try:
+            path = self._token_cache_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            payload = json.dumps({"key": self._token_cache_key(), "token": self._token, "exp": self._token_expiry_ts})
+            fd = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(str(tmp), str(path))
+        except Exception:
+            pass
+
+    def _track(self, fut: asyncio.Future) -> asyncio.Future:
+        self._tasks.add(fut)
+        fut.add_done_callback(self._tasks.discard)
+        return fut
+
+    async def start(self) -> None:
+        """Fetch a token up front and keep it fresh in the background.
 
-        return self._token
+        Without start() the token is still refreshed lazily by _get_token.
+        """
+        await self._get_token()
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = self._track(asyncio.create_task(self._token_refresher()))
+
+    async def _token_refresher(self) -> None:
+        while True:
+            await asyncio.sleep(max(30.0, self._token_expiry_ts - 120 - time.time()))
+            try:
+                async with self._token_lock:
+                    if time.time() >= self._token_expiry_ts - 120:
+                        await self._refresh_token()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Keep the lazy path as a fallback; retry shortly.
+                await asyncio.sleep(5.0)
 
     async def _post_tr(self, path: str, api_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
-        tok = await self._get_token()
-        headers = {
-            "Content-Type": "application/json;charset=UTF-8",
-            "authorization": f"Bearer {tok}",
-            "api-id": api_id,
-        }
-        r = await self.client.post(f"{self.base_url}{path}", json=body, headers=headers)
-        r.raise_for_status()
-        return r.json()
+        return await self._post_tr_fast(f"{self.base_url}{path}", api_id, body)
+
+    async def _post_tr_fast(self, url: str, api_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """_post_tr with a prebuilt absolute URL."""
+        await self._get_token()
+        headers = self._headers_by_api_id.get(api_id)
+        if headers is None:
+            headers = {**self._base_headers, "api-id": api_id}
+            self._headers_by_api_id[api_id] = headers
+        return await post_json(self.client, url, body, headers)
 
     async def place_order(self, req: OrderRequest) -> OrderUpdate:
         side = req.side.upper()
@@ -87,23 +248,25 @@ class KiwoomRestAdapter(BrokerAdapter):
                 trde_tp = "2"
 
             api_id = "kt10000" if side == "BUY" else "kt10001"
-            body = {
-                "dmst_stex_tp": meta.get("dmst_stex_tp", "KRX"),
-                "accno": meta.get("accno") or self.account_no,
-                "passwd": meta.get("passwd", ""),
-                "input_pw": meta.get("input_pw", "00"),
+            body = self._order_body_template | {
                 "stk_cd": req.symbol,
                 "ord_qty": str(req.qty),
                 "ord_uv": str(req.price or 0),
                 "trde_tp": trde_tp,
-                "cond_uv": meta.get("cond_uv", ""),
             }
+            if meta:
+                for k in _ORDER_OVERRIDE_KEYS:
+                    if k in meta:
+                        body[k] = meta[k]
+                if not body["accno"]:
+                    body["accno"] = self.account_no
 
-            data = await self._post_tr("/api/dostk/ordr", api_id, body)
+            data = await self._post_tr_fast(self._order_url, api_id, body)
+            self._acnt_cache = None
 
-            order_no = str(data.get("ord_no") or data.get("order_no") or data.get("ordNo") or "")
-            status = str(data.get("status") or data.get("result") or "NEW")
-            filled_qty = float(data.get("filled_qty") or 0.0)
+            order_no = str(first_present(data, *_ORDER_ID_KEYS, default=""))
+            status = str(first_present(data, *_STATUS_KEYS, default="NEW"))
+            filled_qty = to_float(data.get("filled_qty"), 0.0)
             avg_px = data.get("avg_fill_price")
 
             return OrderUpdate(
@@ -113,64 +276,107 @@ class KiwoomRestAdapter(BrokerAdapter):
                 client_order_id=req.client_order_id,
                 status=status,
                 filled_qty=filled_qty,
-                avg_fill_price=float(avg_px) if avg_px is not None else None,
-                fee=data.get("fee"),
+                avg_fill_price=to_float(avg_px) or None,
+                fee=to_float(data.get("fee")),
                 ts=utc_now(),
                 raw=data,
             )
         except Exception as e:
-            return OrderUpdate(
-                venue=req.venue,
-                symbol=req.symbol,
-                order_id="",
-                client_order_id=req.client_order_id,
-                status="REJECTED",
-                filled_qty=0.0,
-                avg_fill_price=None,
-                fee=None,
-                ts=utc_now(),
-                raw={"error": str(e)},
-            )
+            return self._reject(req, e)
+
+    def _normalize_orderbook_np(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        # One pass fills a (levels, 4) matrix [bid_px, bid_qty, ask_px, ask_qty]; empty levels
+        # are then dropped with a boolean mask instead of per-level branches.
+        m = np.fromiter(
+            (to_float(first_present(data, *keys), 0.0) for keys in _KIWOOM_OB_FIELDS),
+            dtype=np.float64,
+            count=len(_KIWOOM_OB_FIELDS),
+        ).reshape(-1, 4)
+        bid_ok = m[:, 0] > 0
+        ask_ok = m[:, 2] > 0
+        return {
+            "bid_px": m[bid_ok, 0],
+            "bid_qty": m[bid_ok, 1],
+            "ask_px": m[ask_ok, 2],
+            "ask_qty": m[ask_ok, 3],
+            "raw": data,
+        }
 
     def _normalize_orderbook(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if self.numpy_orderbook:
+            return self._normalize_orderbook_np(data)
         bids: List[List[float]] = []
         asks: List[List[float]] = []
+        add_bid = bids.append
+        add_ask = asks.append
         try:
-            for i in range(1, 11):
-                bp = data.get(f"buy_{i}th_pre_bid") or data.get(f"bid{i}") or data.get(f"buy{i}_price")
-                bq = data.get(f"buy_{i}th_pre_bid_rsqn") or data.get(f"bid{i}_qty") or data.get(f"buy{i}_qty") or 0
-                ap = data.get(f"sel_{i}th_pre_bid") or data.get(f"ask{i}") or data.get(f"sel{i}_price")
-                aq = data.get(f"sel_{i}th_pre_bid_rsqn") or data.get(f"ask{i}_qty") or data.get(f"sel{i}_qty") or 0
-                if bp is not None and float(bp) > 0:
-                    bids.append([float(bp), float(bq or 0.0)])
-                if ap is not None and float(ap) > 0:
-                    asks.append([float(ap), float(aq or 0.0)])
+            for bp_keys, bq_keys, ap_keys, aq_keys in _KIWOOM_OB_KEYS:
+                bp = first_present(data, *bp_keys)
+                if bp is not None:
+                    bp = float(bp)
+                    if bp > 0:
+                        add_bid([bp, float(first_present(data, *bq_keys, default=0.0))])
+                ap = first_present(data, *ap_keys)
+                if ap is not None:
+                    ap = float(ap)
+                    if ap > 0:
+                        add_ask([ap, float(first_present(data, *aq_keys, default=0.0))])
         except Exception:
             pass
         return {"bids": bids, "asks": asks, "raw": data}
 
-    async def get_orderbook(self, symbol: str) -> Dict[str, Any]:
-        data = await self._post_tr("/api/dostk/mrkcond", "ka10004", {"stk_cd": symbol})
+    async def _fetch_orderbook(self, symbol: str) -> Dict[str, Any]:
+        data = await self._post_tr_fast(self._orderbook_url, "ka10004", {"stk_cd": symbol})
         if isinstance(data, dict):
             return self._normalize_orderbook(data)
         return {"bids": [], "asks": [], "raw": data}
 
+    async def get_orderbook(self, symbol: str) -> Dict[str, Any]:
+        return await cached_singleflight(
+            self._ob_cache, self._ob_refresh, symbol, self._ob_ttl, lambda: self._fetch_orderbook(symbol), track=self._track
+        )
+
     async def get_last_price(self, symbol: str) -> float:
         ob = await self.get_orderbook(symbol)
-        bids = ob.get("bids") or []
-        asks = ob.get("asks") or []
-        bid = float(bids[0][0]) if bids else 0.0
-        ask = float(asks[0][0]) if asks else 0.0
+        if "bid_px" in ob:
+            bid = float(ob["bid_px"][0]) if len(ob["bid_px"]) else 0.0
+            ask = float(ob["ask_px"][0]) if len(ob["ask_px"]) else 0.0
+        else:
+            bids = ob.get("bids") or []
+            asks = ob.get("asks") or []
+            bid = float(bids[0][0]) if bids else 0.0
+            ask = float(asks[0][0]) if asks else 0.0
         if bid and ask:
             return (bid + ask) / 2
         return bid or ask or 0.0
 
-    async def get_equity(self) -> float:
-        import datetime as _dt
-
+    def _today_ymd(self) -> str:
+        bucket = int(time.time() // 60)
+        cached = self._cached_ymd
+        if cached is not None and cached[0] == bucket:
+            return cached[1]
         ymd = _dt.datetime.now().strftime("%Y%m%d")
-        data = await self._post_tr("/api/dostk/acnt", "kt00017", {"qry_dt": ymd})
-        for k in ("day_stk_asst", "tot_evlt_amt", "dbst_bal"):
+        self._cached_ymd = (bucket, ymd)
+        return ymd
+
+    def _acnt_body(self) -> Dict[str, str]:
+        # Reused until the date rolls over; never mutated after creation.
+        ymd = self._today_ymd()
+        if self._acnt_body_cache.get("qry_dt") != ymd:
+            self._acnt_body_cache = {"qry_dt": ymd}
+        return self._acnt_body_cache
+
+    async def _fetch_acnt(self) -> Dict[str, Any]:
+        hit = self._acnt_cache
+        if hit is not None and time.monotonic() - hit[0] < self._acnt_ttl:
+            return hit[1]
+        data = await self._post_tr_fast(self._acnt_url, "kt00017", self._acnt_body())
+        self._acnt_cache = (time.monotonic(), data)
+        return data
+
+    async def get_equity(self) -> float:
+        data = await self._fetch_acnt()
+        for k in _EQUITY_KEYS:
             if k in data:
                 try:
                     return float(data[k])
@@ -179,17 +385,14 @@ class KiwoomRestAdapter(BrokerAdapter):
         return 0.0
 
     async def get_positions(self) -> Dict[str, float]:
-        import datetime as _dt
-
-        ymd = _dt.datetime.now().strftime("%Y%m%d")
-        data = await self._post_tr("/api/dostk/acnt", "kt00017", {"qry_dt": ymd})
-        items = data.get("day_bal_rt") or data.get("positions") or data.get("items")
+        data = await self._fetch_acnt()
+        items = first_present(data, *_POSITION_LIST_KEYS)
         out: Dict[str, float] = {}
         if isinstance(items, list):
             for it in items:
                 try:
-                    code = str(it.get("stk_cd") or it.get("code") or "")
-                    qty = float(it.get("rmnd_qty") or it.get("qty") or 0.0)
+                    code = str(first_present(it, "stk_cd", "code", default=""))
+                    qty = float(first_present(it, "rmnd_qty", "qty", default=0.0))
                     if code and qty:
                         out[code] = qty
                 except Exception:
@@ -197,4 +400,14 @@ class KiwoomRestAdapter(BrokerAdapter):
         return out
 
     async def close(self) -> None:
-        await self.client.aclose()
+        if self._closed:
+            return
+        self._closed = True
+        self._refresh_task = None
+        tasks = list(self._tasks)
+        for t in tasks:
+            t.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if self._owns_client:
+            await self.client.aclose()
@@ -2,8 +2,8 @@ from __future__ import annotations
 
 from typing import Any
 
-import httpx
-
+from quantbot.execution.adapters._fields import to_float
+from quantbot.execution.adapters._http import AsyncHTTP, make_async_client, post_json, request_json
 from quantbot.execution.adapters.base import BrokerAdapter
 from quantbot.common.types import OrderRequest, OrderUpdate
 from quantbot.utils.time import utc_now
@@ -19,9 +19,12 @@ class NamooAdapter(BrokerAdapter):
     브릿지 구현은 repo의 `namoo_bridge/` 참고.
     """
 
-    def __init__(self, bridge_url: str = "http://127.0.0.1:8700"):
+    def __init__(self, bridge_url: str = "http://127.0.0.1:8700", client: AsyncHTTP | None = None):
         self.bridge_url = bridge_url.rstrip("/")
-        self.client = httpx.AsyncClient(timeout=20)
+        # An injected client is shared with other adapters; only close what we created.
+        self._owns_client = client is None
+        self.client = client if client is not None else make_async_client(20)
+        self._closed = False
 
     async def place_order(self, req: OrderRequest) -> OrderUpdate:
         payload: dict[str, Any] = {
@@ -34,52 +37,40 @@ class NamooAdapter(BrokerAdapter):
             "meta": req.meta or {},
         }
         try:
-            r = await self.client.post(f"{self.bridge_url}/order", json=payload)
-            r.raise_for_status()
-            data = r.json()
+            data = await post_json(self.client, f"{self.bridge_url}/order", payload)
             return OrderUpdate(
                 venue=req.venue,
                 order_id=str(data.get("order_id") or ""),
                 client_order_id=req.client_order_id,
                 symbol=req.symbol,
                 status=str(data.get("status") or "NEW"),
-                filled_qty=float(data.get("filled_qty") or 0.0),
-                avg_fill_price=(float(data["avg_fill_price"]) if data.get("avg_fill_price") is not None else None),
-                fee=(float(data["fee"]) if data.get("fee") is not None else None),
+                filled_qty=to_float(data.get("filled_qty"), 0.0),
+                avg_fill_price=to_float(data.get("avg_fill_price")),
+                fee=to_float(data.get("fee")),
                 ts=utc_now(),
                 raw=data,
             )
         except Exception as e:
-            return OrderUpdate(
-                venue=req.venue,
-                order_id="",
-                client_order_id=req.client_order_id,
-                symbol=req.symbol,
-                status="REJECTED",
-                filled_qty=0.0,
-                avg_fill_price=None,
-                fee=None,
-                ts=utc_now(),
-                raw={"error": str(e)},
-            )
+            return self._reject(req, e)
 
     async def get_last_price(self, symbol: str) -> float:
-        r = await self.client.get(f"{self.bridge_url}/quote", params={"symbol": symbol})
-        r.raise_for_status()
-        data = r.json()
+        data = await request_json(self.client, "GET", f"{self.bridge_url}/quote", params={"symbol": symbol})
         return float(data["last_price"])
 
     async def get_equity(self) -> float:
-        r = await self.client.get(f"{self.bridge_url}/equity")
-        r.raise_for_status()
-        data = r.json()
+        data = await request_json(self.client, "GET", f"{self.bridge_url}/equity")
         return float(data.get("equity") or 0.0)
 
     async def get_positions(self) -> dict[str, float]:
-        r = await self.client.get(f"{self.bridge_url}/positions")
-        r.raise_for_status()
-        data = r.json()
+        data = await request_json(self.client, "GET", f"{self.bridge_url}/positions")
         out: dict[str, float] = {}
         for k, v in (data.get("positions") or {}).items():
             out[str(k)] = float(v)
         return out
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._owns_client:
+            await self.client.aclose()
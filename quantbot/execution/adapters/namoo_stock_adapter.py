@@ -1,41 +1,65 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Dict, Optional
 
-import httpx
-
 from quantbot.common.types import OrderRequest, OrderUpdate
+from quantbot.execution.adapters._fields import first_present, to_float
+from quantbot.execution.adapters._http import AsyncHTTP, cached_singleflight, make_async_client, request_json
 from quantbot.execution.adapters.base import BrokerAdapter
 from quantbot.utils.time import utc_now
 
+# Response field aliases, probed in order.
+_ORDER_ID_KEYS = ("ord_no", "order_id", "orderNo")
+_STATUS_KEYS = ("status", "result")
+_FILLED_QTY_KEYS = ("filled_qty", "filledQty")
+_AVG_PX_KEYS = ("avg_fill_price", "avgFillPrice")
+_QUOTE_PRICE_KEYS = ("price", "cur_prc", "last", "trade_price", "now", "close")
+_CASH_KEYS = ("cash", "balance", "ord_cash", "available", "dbst_bal")
+
 
 class NamooStockAdapter(BrokerAdapter):
     """REST adapter for a local 나무증권(OpenAPI) bridge service."""
 
-    def __init__(self, base_url: str, account_no: str, timeout: float = 5.0):
+    def __init__(
+        self,
+        base_url: str,
+        account_no: str,
+        timeout: float = 5.0,
+        client: AsyncHTTP | None = None,
+        ob_ttl: float = 0.0,
+    ):
         self.base_url = (base_url or "").rstrip("/")
         self.account_no = account_no
-        self.client = httpx.AsyncClient(timeout=timeout)
+        # An injected client is shared with other adapters; only close what we created.
+        self._owns_client = client is None
+        self.client = client if client is not None else make_async_client(timeout)
+        # Symbols whose /quote lacked a price last time; their orderbook is fetched in parallel.
+        self._quote_misses: set[str] = set()
+        # Background tasks/futures owned by this adapter; cancelled by close().
+        self._tasks: set[asyncio.Future] = set()
+        self._closed = False
+        # Optional short-TTL orderbook cache (0 = off); concurrent misses share one request.
+        self._ob_ttl = max(0.0, float(ob_ttl or 0.0))
+        self._ob_cache: Dict[str, tuple[float, Dict[str, Any]]] = {}
+        self._ob_refresh: Dict[str, asyncio.Future] = {}
+
+    def _track(self, fut: asyncio.Future) -> asyncio.Future:
+        self._tasks.add(fut)
+        fut.add_done_callback(self._tasks.discard)
+        return fut
 
     async def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
-        r = await self.client.get(f"{self.base_url}{path}", params=params)
-        r.raise_for_status()
-        return r.json()
+        return await request_json(self.client, "GET", f"{self.base_url}{path}", params=params)
 
     async def _post(self, path: str, body: Dict[str, Any]) -> Any:
-        r = await self.client.post(f"{self.base_url}{path}", json=body)
-        r.raise_for_status()
-        return r.json()
+        return await request_json(self.client, "POST", f"{self.base_url}{path}", body=body)
 
     async def _put(self, path: str, body: Dict[str, Any]) -> Any:
-        r = await self.client.put(f"{self.base_url}{path}", json=body)
-        r.raise_for_status()
-        return r.json()
+        return await request_json(self.client, "PUT", f"{self.base_url}{path}", body=body)
 
     async def _delete(self, path: str, body: Dict[str, Any]) -> Any:
-        r = await self.client.request("DELETE", f"{self.base_url}{path}", json=body)
-        r.raise_for_status()
-        return r.json()
+        return await request_json(self.client, "DELETE", f"{self.base_url}{path}", body=body)
 
     def _normalize_orderbook(self, data: Any) -> Dict[str, Any]:
         """Best-effort normalize to {'bids':[[p,q],...],'asks':[[p,q],...]}.
@@ -55,10 +79,10 @@ class NamooStockAdapter(BrokerAdapter):
                         except Exception:
                             continue
                     return {"bids": bids, "asks": asks, "raw": data}
-                bid = data.get("bid") or data.get("best_bid") or data.get("bestBid")
-                ask = data.get("ask") or data.get("best_ask") or data.get("bestAsk")
-                bids = [[float(bid), float(data.get("bid_size") or data.get("bidQty") or 0.0)]] if bid is not None else []
-                asks = [[float(ask), float(data.get("ask_size") or data.get("askQty") or 0.0)]] if ask is not None else []
+                bid = first_present(data, "bid", "best_bid", "bestBid")
+                ask = first_present(data, "ask", "best_ask", "bestAsk")
+                bids = [[float(bid), float(first_present(data, "bid_size", "bidQty", default=0.0))]] if bid is not None else []
+                asks = [[float(ask), float(first_present(data, "ask_size", "askQty", default=0.0))]] if ask is not None else []
                 return {"bids": bids, "asks": asks, "raw": data}
             if isinstance(data, list) and data and isinstance(data[0], dict):
                 # sometimes list wrapper
@@ -95,10 +119,10 @@ class NamooStockAdapter(BrokerAdapter):
                     },
                 )
 
-            status = str(data.get("status") or data.get("result") or "NEW")
-            order_id = str(data.get("ord_no") or data.get("order_id") or data.get("orderNo") or "")
-            filled_qty = float(data.get("filled_qty") or data.get("filledQty") or 0.0)
-            avg_px = data.get("avg_fill_price") or data.get("avgFillPrice")
+            status = str(first_present(data, *_STATUS_KEYS, default="NEW"))
+            order_id = str(first_present(data, *_ORDER_ID_KEYS, default=""))
+            filled_qty = to_float(first_present(data, *_FILLED_QTY_KEYS), 0.0)
+            avg_px = first_present(data, *_AVG_PX_KEYS)
 
             return OrderUpdate(
                 venue=req.venue,
@@ -107,45 +131,62 @@ class NamooStockAdapter(BrokerAdapter):
                 client_order_id=req.client_order_id,
                 status=status,
                 filled_qty=filled_qty,
-                avg_fill_price=float(avg_px) if avg_px is not None else None,
-                fee=data.get("fee"),
+                avg_fill_price=to_float(avg_px) or None,
+                fee=to_float(data.get("fee")),
                 ts=utc_now(),
                 raw=data,
             )
         except Exception as e:
-            return OrderUpdate(
-                venue=req.venue,
-                symbol=req.symbol,
-                order_id="",
-                client_order_id=req.client_order_id,
-                status="REJECTED",
-                filled_qty=0.0,
-                avg_fill_price=None,
-                fee=None,
-                ts=utc_now(),
-                raw={"error": str(e)},
-            )
-
-    async def get_last_price(self, symbol: str) -> float:
-        data = await self._get("/quote", params={"code": symbol})
-        for k in ("price", "cur_prc", "last", "trade_price", "now", "close"):
-            if k in data and data[k] is not None:
-                return float(data[k])
-        # fallback: mid from orderbook
-        ob = await self.get_orderbook(symbol)
+            return self._reject(req, e)
+
+    @staticmethod
+    def _price_from_quote(data: Any) -> float | None:
+        if isinstance(data, dict):
+            px = first_present(data, *_QUOTE_PRICE_KEYS)
+            if px is not None:
+                return float(px)
+        return None
+
+    @staticmethod
+    def _mid_from_orderbook(ob: Dict[str, Any]) -> float:
         bids = ob.get("bids") or []
         asks = ob.get("asks") or []
         bid = float(bids[0][0]) if bids else 0.0
         ask = float(asks[0][0]) if asks else 0.0
         return (bid + ask) / 2 if bid and ask else max(bid, ask)
 
-    async def get_orderbook(self, symbol: str) -> Dict[str, Any]:
+    async def get_last_price(self, symbol: str) -> float:
+        # For symbols that recently missed, start the orderbook fallback alongside the quote
+        # so the fallback costs one round-trip instead of two.
+        ob_task = self._track(asyncio.create_task(self.get_orderbook(symbol))) if symbol in self._quote_misses else None
+        try:
+            px = self._price_from_quote(await self._get("/quote", params={"code": symbol}))
+        except BaseException:
+            if ob_task is not None:
+                ob_task.cancel()
+            raise
+        if px is not None:
+            self._quote_misses.discard(symbol)
+            if ob_task is not None:
+                ob_task.cancel()
+            return px
+        # fallback: mid from orderbook
+        self._quote_misses.add(symbol)
+        ob = await ob_task if ob_task is not None else await self.get_orderbook(symbol)
+        return self._mid_from_orderbook(ob)
+
+    async def _fetch_orderbook(self, symbol: str) -> Dict[str, Any]:
         data = await self._get("/orderbook", params={"code": symbol})
         return self._normalize_orderbook(data)
 
+    async def get_orderbook(self, symbol: str) -> Dict[str, Any]:
+        return await cached_singleflight(
+            self._ob_cache, self._ob_refresh, symbol, self._ob_ttl, lambda: self._fetch_orderbook(symbol), track=self._track
+        )
+
     async def get_equity(self) -> float:
         data = await self._get("/balance", params={"acc_no": self.account_no})
-        for k in ("cash", "balance", "ord_cash", "available", "dbst_bal"):
+        for k in _CASH_KEYS:
             if k in data and data[k] is not None:
                 try:
                     return float(data[k])
@@ -160,8 +201,8 @@ class NamooStockAdapter(BrokerAdapter):
         if isinstance(items, list):
             for it in items:
                 try:
-                    code = str(it.get("code") or it.get("stk_cd") or it.get("symbol"))
-                    qty = float(it.get("qty") or it.get("rmnd_qty") or it.get("quantity") or 0.0)
+                    code = str(first_present(it, "code", "stk_cd", "symbol", default=""))
+                    qty = float(first_present(it, "qty", "rmnd_qty", "quantity", default=0.0))
                     if code and qty:
                         out[code] = qty
                 except Exception:
@@ -169,4 +210,13 @@ class NamooStockAdapter(BrokerAdapter):
         return out
 
     async def close(self) -> None:
-        await self.client.aclose()
+        if self._closed:
+            return
+        self._closed = True
+        tasks = list(self._tasks)
+        for t in tasks:
+            t.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if self._owns_client:
+            await self.client.aclose()
@@ -1,29 +1,79 @@
 from __future__ import annotations
 
-import json
-import hashlib
-from dataclasses import dataclass, asdict
+import asyncio
+import functools
+import itertools
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-import httpx
+import numpy as np
 
 from quantbot.common.types import OrderRequest, OrderUpdate, Venue
+from quantbot.execution.adapters._http import shared_async_client
+from quantbot.execution.adapters._price_cache import default_price_ttl, get_cached_price, put_cached_price
 from quantbot.execution.adapters.base import BrokerAdapter
+from quantbot.risk.position_tracker import _BINANCE_QUOTES_SORTED
+from quantbot.utils.fastjson import dumps_bytes, loads
 from quantbot.utils.time import utc_now
 
 
+# Paper order ids: a counter seeded from wall-clock microseconds, so ids stay unique
+# (and increasing) across restarts without hashing anything per order.
+_PAPER_ID = itertools.count(time.time_ns() // 1000)
+
+# State directories already created by this process (skips a mkdir/stat per adapter).
+_ENSURED_DIRS: set[Path] = set()
+
+
+# Per-position columns, stored as parallel arrays indexed by the position of the base
+# asset in state["bases"] (struct-of-arrays rather than one dict per position).
+_POS_COLUMNS = ("qty", "avg_cost", "hw", "lw")
+
+
 def _state_default() -> dict[str, Any]:
     return {
         "cash": 0.0,
-        "positions": {},      # base_asset -> {"qty": float, "avg_cost": float, "high_water": float}
+        "bases": [],          # base assets; index i describes qty[i], avg_cost[i], hw[i], lw[i]
+        "qty": [],
+        "avg_cost": [],
+        "hw": [],             # high water
+        "lw": [],             # low water
         "realized_pnl": 0.0,
         "realized_pnl_net": 0.0,
+        "journal_seq": 0,     # last journal record folded into this snapshot
         "updated_at": None,
     }
 
 
+def _migrate_state(state: dict[str, Any]) -> dict[str, Any]:
+    """Convert the legacy {"positions": {base: {...}}} layout to parallel arrays."""
+    out = _state_default()
+    out.update({k: v for k, v in state.items() if k != "positions"})
+    legacy = state.get("positions")
+    if isinstance(legacy, dict):
+        out["bases"] = []
+        for col in _POS_COLUMNS:
+            out[col] = []
+        for base, info in legacy.items():
+            info = info or {}
+            out["bases"].append(str(base))
+            out["qty"].append(float(info.get("qty", 0.0)))
+            out["avg_cost"].append(float(info.get("avg_cost", 0.0)))
+            out["hw"].append(float(info.get("high_water", 0.0)))
+            out["lw"].append(float(info.get("low_water", 0.0)))
+    n = len(out["bases"])
+    if any(len(out[col]) != n for col in _POS_COLUMNS):
+        raise ValueError("paper state position arrays are misaligned")
+    return out
+
+
+@functools.lru_cache(maxsize=4096)
 def _parse_symbol_base_quote(venue: str, symbol: str) -> tuple[str, str]:
     # Keep compatible with live._parse_symbol_base_quote without importing to avoid cycles.
     if venue == "upbit":
@@ -33,8 +83,7 @@ def _parse_symbol_base_quote(venue: str, symbol: str) -> tuple[str, str]:
         return symbol, "KRW"
 
     if venue == "binance":
-        quotes = ["USDT", "USDC", "BUSD", "FDUSD", "TUSD", "BTC", "ETH", "BNB", "TRY", "EUR", "GBP", "BRL", "AUD", "KRW", "JPY"]
-        for q in sorted(quotes, key=len, reverse=True):
+        for q in _BINANCE_QUOTES_SORTED:
             if symbol.endswith(q) and len(symbol) > len(q):
                 return symbol[:-len(q)], q
         return symbol, ""
@@ -42,42 +91,62 @@ def _parse_symbol_base_quote(venue: str, symbol: str) -> tuple[str, str]:
 
 
 async def _public_last_price(venue: str, symbol: str) -> float:
-    """Fetch last price via public endpoints (no auth). Supports upbit/binance."""
+    """Fetch last price via public endpoints (no auth). Supports upbit/binance.
+
+    Uses the process-wide pooled clients from _http (closed by the live loop on shutdown).
+    """
     if venue == "upbit":
-        url = "https://api.upbit.com/v1/ticker"
-        async with httpx.AsyncClient(timeout=10) as client:
-            r = await client.get(url, params={"markets": symbol})
-            r.raise_for_status()
-            data = r.json()
-            if not data:
-                raise RuntimeError(f"upbit ticker empty for {symbol}")
-            return float(data[0]["trade_price"])
+        client = shared_async_client("https://api.upbit.com", 10)
+        r = await client.get("https://api.upbit.com/v1/ticker", params={"markets": symbol})
+        r.raise_for_status()
+        data = loads(r.content)
+        if not data:
+            raise RuntimeError(f"upbit ticker empty for {symbol}")
+        return float(data[0]["trade_price"])
 
     if venue == "binance":
-        url = "https://api.binance.com/api/v3/ticker/price"
-        async with httpx.AsyncClient(timeout=10) as client:
-            r = await client.get(url, params={"symbol": symbol})
-            r.raise_for_status()
-            data = r.json()
-            return float(data["price"])
+        client = shared_async_client("https://api.binance.com", 10)
+        r = await client.get("https://api.binance.com/api/v3/ticker/price", params={"symbol": symbol})
+        r.raise_for_status()
+        data = loads(r.content)
+        return float(data["price"])
 
     if venue == "binance_futures":
-        url = "https://fapi.binance.com/fapi/v1/ticker/price"
-        async with httpx.AsyncClient(timeout=10) as client:
-            r = await client.get(url, params={"symbol": symbol})
-            r.raise_for_status()
-            data = r.json()
-            return float(data["price"])
+        client = shared_async_client("https://fapi.binance.com", 10)
+        r = await client.get("https://fapi.binance.com/fapi/v1/ticker/price", params={"symbol": symbol})
+        r.raise_for_status()
+        data = loads(r.content)
+        return float(data["price"])
 
     raise RuntimeError(f"public last price not supported for venue={venue}")
 
 
+async def _public_last_prices(venue: str, symbols: list[str]) -> dict[str, float]:
+    """Batch public last prices. Upbit serves all markets in one ticker call."""
+    if venue != "upbit":
+        raise RuntimeError(f"public batch last price not supported for venue={venue}")
+    if not symbols:
+        return {}
+    client = shared_async_client("https://api.upbit.com", 10)
+    r = await client.get("https://api.upbit.com/v1/ticker", params={"markets": ",".join(symbols)})
+    r.raise_for_status()
+    return {str(row["market"]): float(row["trade_price"]) for row in (loads(r.content) or [])}
+
+
 @dataclass
 class PaperConfig:
     initial_cash: float = 1_000_000.0
     fee_bps: int = 10          # 10bps = 0.10% per side
     slippage_bps: int = 5      # 5bps slippage for market orders
     state_path: str = "state/paper_state.json"
+    # State writes are coalesced and flushed at most this often (0 = write on every change).
+    flush_interval_sec: float = 1.0
+    # Reuse a last price for this long (seconds); 0 = always fetch. Opt-in because fills are
+    # priced off it. Defaults to QUANTBOT_PRICE_CACHE_TTL.
+    price_cache_ttl_sec: float = field(default_factory=default_price_ttl)
+    # Append each fill to <state_path>.journal so a crash between snapshots loses nothing;
+    # the snapshot (above) then only needs to run every flush_interval_sec.
+    journal: bool = True
 
 
 class PaperAdapter(BrokerAdapter):
@@ -93,9 +162,24 @@ class PaperAdapter(BrokerAdapter):
         self.venue: Venue = venue
         self.cfg = config
         self.market_adapter = market_adapter
+        # Best-effort: assume single quote currency "KRW" for upbit, "USDT" for binance
+        self._quote = "KRW" if venue == "upbit" else "USDT"
+        self._sym_prefix = f"{self._quote}-" if venue == "upbit" else ""
+        self._sym_suffix = "" if venue == "upbit" else self._quote
         self._state_file = Path(self.cfg.state_path)
-        self._state_file.parent.mkdir(parents=True, exist_ok=True)
+        state_dir = self._state_file.parent
+        if state_dir not in _ENSURED_DIRS:
+            state_dir.mkdir(parents=True, exist_ok=True)
+            _ENSURED_DIRS.add(state_dir)
         self._state = _state_default()
+        self._pos_idx: dict[str, int] = {}
+        self._dirty = False
+        self._flush_task: asyncio.Task | None = None
+        self._write_lock = threading.RLock()  # a cancelled flush may still be writing in its thread
+        self._flush_lock = asyncio.Lock()     # keeps snapshots landing on disk in order
+        self._journal_file = Path(str(self._state_file) + ".journal")
+        self._journal_prev = Path(str(self._state_file) + ".journal.prev")
+        self._journal_fh: Any = None
         self._load()
 
         # Initialize cash if this is a fresh state
@@ -107,18 +191,177 @@ class PaperAdapter(BrokerAdapter):
     def _load(self) -> None:
         try:
             if self._state_file.exists():
-                self._state = json.loads(self._state_file.read_text(encoding="utf-8"))
+                self._state = _migrate_state(loads(self._state_file.read_bytes()))
         except Exception:
             self._state = _state_default()
-
-    def _save(self) -> None:
-        self._state["updated_at"] = utc_now().isoformat()
-        self._state_file.write_text(json.dumps(self._state, ensure_ascii=False, indent=2), encoding="utf-8")
+        self._state["bases"] = bases = [sys.intern(str(b)) for b in self._state["bases"]]
+        self._pos_idx = {b: i for i, b in enumerate(bases)}
+        if self.cfg.journal:
+            self._replay_journal()
+
+    # ---- journal (write-ahead log of fills) ----
+    def _replay_journal(self) -> None:
+        """Apply journal records newer than the snapshot (.prev first: it is the older file)."""
+        st = self._state
+        seq = int(st.get("journal_seq") or 0)
+        for path in (self._journal_prev, self._journal_file):
+            try:
+                if not path.exists():
+                    continue
+                for line in path.read_bytes().splitlines():
+                    try:
+                        rec = loads(line)
+                    except Exception:
+                        break  # torn tail from a crash mid-append
+                    if int(rec.get("seq") or 0) <= seq:
+                        continue
+                    seq = int(rec["seq"])
+                    i = self._slot(str(rec["base"]))
+                    for col in _POS_COLUMNS:
+                        st[col][i] = float(rec[col])
+                    st["cash"] = float(rec["cash"])
+                    st["realized_pnl"] = float(rec["realized_pnl"])
+                    st["realized_pnl_net"] = float(rec["realized_pnl_net"])
+                    st["updated_at"] = rec.get("t")
+            except Exception:
+                continue
+        st["journal_seq"] = seq
+
+    def _journal_append(self, base: str, order_id: str, ts_iso: str) -> None:
+        # Absolute values (not deltas), so replaying a record twice is harmless. Flushed to
+        # the OS per fill; durable against a process crash, fsync'd only by the snapshot.
+        st = self._state
+        st["journal_seq"] = seq = int(st.get("journal_seq") or 0) + 1
+        i = self._pos_idx[base]
+        rec = {"seq": seq, "t": ts_iso, "order": order_id, "base": base, "cash": st["cash"],
+               "realized_pnl": st["realized_pnl"], "realized_pnl_net": st["realized_pnl_net"]}
+        for col in _POS_COLUMNS:
+            rec[col] = st[col][i]
+        if self._journal_fh is None:
+            self._journal_fh = open(self._journal_file, "ab")
+        self._journal_fh.write(dumps_bytes(rec) + b"\n")
+        self._journal_fh.flush()
+
+    def _rotate_journal(self) -> None:
+        """Move the live journal aside; it is deleted once the snapshot covering it is on disk."""
+        with self._write_lock:
+            if self._journal_fh is not None:
+                self._journal_fh.close()
+                self._journal_fh = None
+            if not self._journal_file.exists():
+                return
+            if self._journal_prev.exists():
+                # previous snapshot write failed: keep its records and append ours
+                with open(self._journal_prev, "ab") as f:
+                    f.write(self._journal_file.read_bytes())
+                self._journal_file.unlink()
+            else:
+                os.replace(self._journal_file, self._journal_prev)
+
+    def _slot(self, base: str) -> int:
+        """Array index for base, appending a zeroed position if it is new."""
+        i = self._pos_idx.get(base)
+        if i is None:
+            base = sys.intern(base)  # small, fixed set of codes: lookups hit the identity fast path
+            i = len(self._state["bases"])
+            self._state["bases"].append(base)
+            for col in _POS_COLUMNS:
+                self._state[col].append(0.0)
+            self._pos_idx[base] = i
+        return i
+
+    def _position_view(self, base: str) -> dict[str, float]:
+        """Legacy dict view of one position (qty/avg_cost/high_water/low_water)."""
+        i = self._pos_idx.get(base)
+        if i is None:
+            return {"qty": 0.0, "avg_cost": 0.0, "high_water": 0.0, "low_water": 0.0}
+        st = self._state
+        return {"qty": st["qty"][i], "avg_cost": st["avg_cost"][i], "high_water": st["hw"][i], "low_water": st["lw"][i]}
+
+    def _save(self, ts_iso: str | None = None) -> None:
+        """Mark state dirty; a background task writes it (see PaperConfig.flush_interval_sec)."""
+        self._state["updated_at"] = ts_iso or utc_now().isoformat()
+        self._dirty = True
+        interval = float(self.cfg.flush_interval_sec or 0.0)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            interval = 0.0  # no event loop (e.g. constructor/CLI): write now
+        if interval <= 0:
+            self._write_snapshot(self._snapshot())
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop(interval))
+
+    def _snapshot(self) -> dict[str, Any]:
+        # Copy on the event loop so a worker thread can encode it while orders keep
+        # mutating self._state. Position columns are lists updated in place, so copy those too.
+        self._dirty = False
+        if self.cfg.journal:
+            self._rotate_journal()
+        return {k: (list(v) if isinstance(v, list) else v) for k, v in self._state.items()}
+
+    def _write_snapshot(self, snapshot: dict[str, Any]) -> None:
+        # Compact JSON (orjson when installed) - the file is machine state, not meant for hand edits.
+        with self._write_lock:
+            self._write_state(dumps_bytes(snapshot))
+            if self.cfg.journal:
+                try:
+                    self._journal_prev.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def _write_state(self, data: bytes) -> None:
+        # tmp + fsync + os.replace: a crash mid-write never leaves a truncated state file.
+        with self._write_lock:  # re-entrant: _write_snapshot already holds it
+            tmp = Path(str(self._state_file) + ".tmp")
+            try:
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self._state_file)
+            except Exception:
+                try:
+                    tmp.unlink()
+                except Exception:
+                    pass
+                raise
+
+    async def _flush_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            if not self._dirty:
+                return
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write pending state now (encoding and disk I/O run in a worker thread)."""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+            await asyncio.to_thread(self._write_snapshot, self._snapshot())
+
+    async def close(self) -> None:
+        task, self._flush_task = self._flush_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except BaseException:
+                pass
+        await self.flush()
+        if self._journal_fh is not None:
+            self._journal_fh.close()
+            self._journal_fh = None
 
     # ---- interface ----
     async def place_order(self, req: OrderRequest) -> OrderUpdate:
         order_type = (req.order_type or "MARKET").upper()
         meta = req.meta or {}
+        order_id = f"PAPER-{next(_PAPER_ID):012x}"
+        # One timestamp per order: reused for the update and the state's updated_at.
+        ts = utc_now()
 
         # Determine fill price (market reference)
         px = await self.get_last_price(req.symbol)
@@ -137,25 +380,25 @@ class PaperAdapter(BrokerAdapter):
                 if tif == "IOC":
                     return OrderUpdate(
                         venue=self.venue,
-                        order_id="PAPER-" + hashlib.sha256(f"{req.client_order_id}|{utc_now().isoformat()}".encode("utf-8")).hexdigest()[:12],
+                        order_id=order_id,
                         client_order_id=req.client_order_id,
                         symbol=req.symbol,
                         status="CANCELED",
                         filled_qty=0.0,
                         avg_fill_price=None,
-                        ts=utc_now(),
+                        ts=ts,
                         raw={"reason": "IOC_NOT_CROSSING", "limit": limit_px, "mkt": market_fill},
                     )
                 # GTC pending orders are not simulated in this lightweight paper adapter
                 return OrderUpdate(
                     venue=self.venue,
-                    order_id="PAPER-" + hashlib.sha256(f"{req.client_order_id}|{utc_now().isoformat()}".encode("utf-8")).hexdigest()[:12],
+                    order_id=order_id,
                     client_order_id=req.client_order_id,
                     symbol=req.symbol,
                     status="NEW",
                     filled_qty=0.0,
                     avg_fill_price=None,
-                    ts=utc_now(),
+                    ts=ts,
                     raw={"reason": "LIMIT_PENDING_NOT_SUPPORTED", "limit": limit_px, "mkt": market_fill},
                 )
 
@@ -172,21 +415,39 @@ class PaperAdapter(BrokerAdapter):
         base, quote = _parse_symbol_base_quote(self.venue, req.symbol)
         fee_rate = self.cfg.fee_bps / 10_000.0
 
-        order_id = "PAPER-" + hashlib.sha256(f"{req.client_order_id}|{utc_now().isoformat()}".encode("utf-8")).hexdigest()[:12]
-
-        # Update state
-        positions: dict[str, Any] = self._state.setdefault("positions", {})
-        pos = positions.get(base) or {"qty": 0.0, "avg_cost": 0.0, "high_water": 0.0, "low_water": 0.0}
+        # Update state: work on locals, write back once at the end (a rejection leaves state untouched).
+        state = self._state
+        slot = self._pos_idx.get(base)
+        if slot is None:
+            have = avg_cost = hw = lw = 0.0
+        else:
+            have = float(state["qty"][slot])
+            avg_cost = float(state["avg_cost"][slot])
+            hw = float(state["hw"][slot])
+            lw = float(state["lw"][slot])
+        realized_pnl = float(state.get("realized_pnl", 0.0))
+        realized_pnl_net = float(state.get("realized_pnl_net", 0.0))
 
         notional = qty * fill_price
         fee = notional * fee_rate
 
-        cash = float(self._state.get("cash", 0.0))
+        cash = float(state.get("cash", 0.0))
+        remaining = float(qty)
+
+        def _insufficient(need: float) -> OrderUpdate:
+            return OrderUpdate(
+                venue=self.venue,
+                order_id=order_id,
+                client_order_id=req.client_order_id,
+                symbol=req.symbol,
+                status="REJECTED",
+                filled_qty=0.0,
+                avg_fill_price=None,
+                ts=ts,
+                raw={"reason": "INSUFFICIENT_CASH", "cash": cash, "need": need},
+            )
 
         if req.side == "BUY":
-            have = float(pos.get("qty", 0.0))
-            remaining = float(qty)
-
             # 1) Cover short first (have < 0)
             if have < 0 and remaining > 0:
                 cover_qty = min(remaining, abs(have))
@@ -194,35 +455,19 @@ class PaperAdapter(BrokerAdapter):
                 fee_cover = cover_cost * fee_rate
                 total_cost = cover_cost + fee_cover
                 if cash < total_cost - 1e-12:
-                    return OrderUpdate(
-                        venue=self.venue,
-                        order_id=order_id,
-                        client_order_id=req.client_order_id,
-                        symbol=req.symbol,
-                        status="REJECTED",
-                        filled_qty=0.0,
-                        avg_fill_price=None,
-                        ts=utc_now(),
-                        raw={"reason": "INSUFFICIENT_CASH", "cash": cash, "need": total_cost},
-                    )
+                    return _insufficient(total_cost)
 
                 cash -= total_cost
 
                 # realized pnl for covered portion
-                avg_cost = float(pos.get("avg_cost", 0.0))
                 realized = (avg_cost - fill_price) * cover_qty  # short: profit if price falls
-                realized_net = realized - fee_cover - (cover_qty * avg_cost * fee_rate)
-                self._state["realized_pnl"] = float(self._state.get("realized_pnl", 0.0)) + float(realized)
-                self._state["realized_pnl_net"] = float(self._state.get("realized_pnl_net", 0.0)) + float(realized_net)
+                realized_pnl += realized
+                realized_pnl_net += realized - fee_cover - (cover_qty * avg_cost * fee_rate)
 
-                new_qty = have + cover_qty  # less negative
-                pos["qty"] = new_qty
+                have += cover_qty  # less negative
                 # keep avg_cost for remaining short; if fully covered reset
-                if abs(new_qty) < 1e-12:
-                    pos["qty"] = 0.0
-                    pos["avg_cost"] = 0.0
-                    pos["high_water"] = 0.0
-                    pos["low_water"] = 0.0
+                if abs(have) < 1e-12:
+                    have = avg_cost = hw = lw = 0.0
                 remaining -= cover_qty
 
             # 2) If still BUY qty remains, open/add long
@@ -231,43 +476,21 @@ class PaperAdapter(BrokerAdapter):
                 fee_buy = buy_cost * fee_rate
                 total_cost = buy_cost + fee_buy
                 if cash < total_cost - 1e-12:
-                    return OrderUpdate(
-                        venue=self.venue,
-                        order_id=order_id,
-                        client_order_id=req.client_order_id,
-                        symbol=req.symbol,
-                        status="REJECTED",
-                        filled_qty=0.0,
-                        avg_fill_price=None,
-                        ts=utc_now(),
-                        raw={"reason": "INSUFFICIENT_CASH", "cash": cash, "need": total_cost},
-                    )
+                    return _insufficient(total_cost)
 
-                have2 = float(pos.get("qty", 0.0))
-                if have2 < 0:
+                if have < 0:
                     # should not happen (we covered first), but guard anyway
-                    have2 = 0.0
-                    pos["qty"] = 0.0
-                    pos["avg_cost"] = 0.0
-
-                new_qty = have2 + remaining
-                if new_qty > 0:
-                    new_avg = (have2 * float(pos.get("avg_cost", 0.0)) + remaining * fill_price) / new_qty
-                else:
-                    new_avg = 0.0
-                pos["qty"] = new_qty
-                pos["avg_cost"] = new_avg
-                hw = float(pos.get("high_water", 0.0))
-                lw = float(pos.get("low_water", 0.0))
-                pos["high_water"] = max(hw, fill_price) if hw > 0 else fill_price
-                pos["low_water"] = min(lw, fill_price) if lw > 0 else fill_price
+                    have = avg_cost = 0.0
+
+                new_qty = have + remaining
+                avg_cost = (have * avg_cost + remaining * fill_price) / new_qty if new_qty > 0 else 0.0
+                have = new_qty
+                hw = max(hw, fill_price) if hw > 0 else fill_price
+                lw = min(lw, fill_price) if lw > 0 else fill_price
 
                 cash -= total_cost
 
         else:  # SELL
-            have = float(pos.get("qty", 0.0))
-            remaining = float(qty)
-
             # 1) Reduce/close long first (have > 0)
             if have > 0 and remaining > 0:
                 sell_qty = min(remaining, have)
@@ -275,20 +498,13 @@ class PaperAdapter(BrokerAdapter):
                 fee_sell = proceeds * fee_rate
                 cash += proceeds - fee_sell
 
-                avg_cost = float(pos.get("avg_cost", 0.0))
                 realized = (fill_price - avg_cost) * sell_qty
-                realized_net = realized - fee_sell - (sell_qty * avg_cost * fee_rate)
-                self._state["realized_pnl"] = float(self._state.get("realized_pnl", 0.0)) + float(realized)
-                self._state["realized_pnl_net"] = float(self._state.get("realized_pnl_net", 0.0)) + float(realized_net)
-
-                new_qty = have - sell_qty
-                if new_qty <= 1e-12:
-                    pos["qty"] = 0.0
-                    pos["avg_cost"] = 0.0
-                    pos["high_water"] = 0.0
-                    pos["low_water"] = 0.0
-                else:
-                    pos["qty"] = new_qty
+                realized_pnl += realized
+                realized_pnl_net += realized - fee_sell - (sell_qty * avg_cost * fee_rate)
+
+                have -= sell_qty
+                if have <= 1e-12:
+                    have = avg_cost = hw = lw = 0.0
                 remaining -= sell_qty
 
             # 2) If still SELL qty remains, open/add short
@@ -297,22 +513,28 @@ class PaperAdapter(BrokerAdapter):
                 fee_short = proceeds * fee_rate
                 cash += proceeds - fee_short
 
-                have2 = float(pos.get("qty", 0.0))
-                abs_old = abs(have2)
+                abs_old = abs(have)
                 abs_new = abs_old + remaining
                 if abs_new > 0:
-                    pos["avg_cost"] = (abs_old * float(pos.get("avg_cost", 0.0)) + remaining * fill_price) / abs_new
-                pos["qty"] = have2 - remaining  # more negative
+                    avg_cost = (abs_old * avg_cost + remaining * fill_price) / abs_new
+                have -= remaining  # more negative
 
                 # watermarks for short
-                hw = float(pos.get("high_water", 0.0))
-                lw = float(pos.get("low_water", 0.0))
-                pos["low_water"] = min(lw, fill_price) if lw > 0 else fill_price
-                pos["high_water"] = max(hw, fill_price) if hw > 0 else fill_price
-
-        positions[base] = pos
-        self._state["cash"] = cash
-        self._save()
+                lw = min(lw, fill_price) if lw > 0 else fill_price
+                hw = max(hw, fill_price) if hw > 0 else fill_price
+
+        slot = self._slot(base)
+        state["qty"][slot] = have
+        state["avg_cost"][slot] = avg_cost
+        state["hw"][slot] = hw
+        state["lw"][slot] = lw
+        state["cash"] = cash
+        state["realized_pnl"] = realized_pnl
+        state["realized_pnl_net"] = realized_pnl_net
+        ts_iso = ts.isoformat()
+        if self.cfg.journal:
+            self._journal_append(base, order_id, ts_iso)
+        self._save(ts_iso)
 
         return OrderUpdate(
             venue=self.venue,
@@ -323,46 +545,72 @@ class PaperAdapter(BrokerAdapter):
             filled_qty=float(qty),
             avg_fill_price=float(fill_price),
             fee=float(fee),
-            ts=utc_now(),
-            raw={"paper": True, "base": base, "quote": quote, "cash": cash, "pos": pos, "meta": (req.meta or {})},
+            ts=ts,
+            raw={"paper": True, "base": base, "quote": quote, "cash": cash, "pos": self._position_view(base), "meta": (req.meta or {})},
         )
 
     async def get_last_price(self, symbol: str) -> float:
+        ttl = float(self.cfg.price_cache_ttl_sec or 0.0)
+        if ttl > 0:
+            px = get_cached_price(self.venue, symbol)
+            if px is not None:
+                return px
         if self.market_adapter is not None:
-            return float(await self.market_adapter.get_last_price(symbol))
-        return float(await _public_last_price(self.venue, symbol))
+            px = float(await self.market_adapter.get_last_price(symbol))
+        else:
+            px = float(await _public_last_price(self.venue, symbol))
+        put_cached_price(self.venue, symbol, px, ttl)
+        return px
+
+    async def get_last_prices(self, symbols: list[str]) -> dict[str, float]:
+        """Last prices for several symbols in one request when the venue supports it."""
+        batch = getattr(self.market_adapter, "get_last_prices", None) if self.market_adapter is not None else None
+        if batch is not None:
+            out = {k: float(v) for k, v in (await batch(symbols)).items()}
+        elif self.market_adapter is None and self.venue == "upbit":
+            out = await _public_last_prices(self.venue, symbols)
+        else:
+            raise RuntimeError(f"batch last price not supported for venue={self.venue}")
+        ttl = float(self.cfg.price_cache_ttl_sec or 0.0)
+        for sym, px in out.items():
+            put_cached_price(self.venue, sym, px, ttl)
+        return out
 
     async def get_equity(self) -> float:
         cash = float(self._state.get("cash", 0.0))
         equity = cash
-        positions: dict[str, Any] = self._state.get("positions", {}) or {}
-        # mark-to-market for tracked positions
-        for base, info in positions.items():
-            qty = float(info.get("qty", 0.0))
-            if qty == 0:
-                continue
-            # Need a symbol to price; best-effort: assume single quote currency "KRW" for upbit, "USDT" for binance
-            quote = "KRW" if self.venue == "upbit" else "USDT"
-            sym = f"{quote}-{base}" if self.venue == "upbit" else f"{base}{quote}"
-            try:
-                px = await self.get_last_price(sym)
-                equity += qty * float(px)
-            except Exception:
-                continue
-        return float(equity)
+        st = self._state
+        held = [(self._symbol_for(base), float(qty)) for base, qty in zip(st["bases"], st["qty"]) if qty != 0]
+        if not held:
+            return float(equity)
+
+        # mark-to-market: one batched ticker call, per-symbol only if that fails
+        try:
+            prices = await self.get_last_prices([sym for sym, _ in held])
+        except Exception:
+            prices = {}
+        missing = [sym for sym, _ in held if sym not in prices]
+        if missing:
+            fetched = await asyncio.gather(*(self.get_last_price(sym) for sym in missing), return_exceptions=True)
+            for sym, px in zip(missing, fetched):
+                if not isinstance(px, BaseException):
+                    prices[sym] = float(px)
+        # positions without a price are left out (weight 0), as before
+        n = len(held)
+        qty_arr = np.fromiter((qty for _, qty in held), dtype=np.float64, count=n)
+        px_arr = np.fromiter((float(prices.get(sym, 0.0)) for sym, _ in held), dtype=np.float64, count=n)
+        return float(equity + np.dot(qty_arr, px_arr))
+
+    def _symbol_for(self, base: str) -> str:
+        return self._sym_prefix + base + self._sym_suffix
 
     async def get_positions(self) -> dict[str, float]:
-        out: dict[str, float] = {}
-        positions: dict[str, Any] = self._state.get("positions", {}) or {}
-        for base, info in positions.items():
-            out[base] = float(info.get("qty", 0.0))
+        out: dict[str, float] = dict(zip(self._state["bases"], map(float, self._state["qty"])))
         # include cash as quote "position"
-        quote = "KRW" if self.venue == "upbit" else "USDT"
-        out[quote] = float(self._state.get("cash", 0.0))
+        out[self._quote] = float(self._state.get("cash", 0.0))
         return out
 
     # ---- helpers for stop/trailing ----
     def get_position_info(self, base_asset: str) -> dict[str, float]:
-        positions: dict[str, Any] = self._state.get("positions", {}) or {}
-        info = positions.get(base_asset) or {"qty": 0.0, "avg_cost": 0.0, "high_water": 0.0}
-        return {"qty": float(info.get("qty", 0.0)), "avg_cost": float(info.get("avg_cost", 0.0)), "high_water": float(info.get("high_water", 0.0))}
+        info = self._position_view(base_asset)
+        return {"qty": float(info["qty"]), "avg_cost": float(info["avg_cost"]), "high_water": float(info["high_water"])}
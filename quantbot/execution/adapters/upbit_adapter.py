@@ -1,18 +1,31 @@
 from __future__ import annotations
 
+import base64
 import hashlib
+import hmac
 import uuid
 import urllib.parse
 from typing import Any
 
 import httpx
-import jwt
 
+from quantbot.execution.adapters._http import make_async_client
+from quantbot.execution.adapters._price_cache import default_price_ttl, get_cached_price, put_cached_price
 from quantbot.execution.adapters.base import BrokerAdapter
+from quantbot.features.orderbook import OB_UPBIT_UNITS
 from quantbot.common.types import OrderRequest, OrderUpdate
+from quantbot.utils.fastjson import dumps_bytes, loads
 from quantbot.utils.time import utc_now
 
 
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# HS256 JWT header is the same for every request.
+_JWT_HEADER_B64 = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+
+
 class UpbitAdapter(BrokerAdapter):
     """Upbit Exchange REST adapter.
 
@@ -27,11 +40,27 @@ class UpbitAdapter(BrokerAdapter):
     Docs (auth): https://docs.upbit.com/kr/reference/auth
     """
 
-    def __init__(self, access_key: str, secret_key: str, base_url: str = "https://api.upbit.com"):
+    orderbook_schema = OB_UPBIT_UNITS
+
+    def __init__(
+        self,
+        access_key: str,
+        secret_key: str,
+        base_url: str = "https://api.upbit.com",
+        price_ttl: float | None = None,
+        client: httpx.AsyncClient | None = None,
+    ):
         self.access_key = access_key
         self.secret_key = secret_key
+        self._secret_bytes = secret_key.encode("utf-8")
         self.base_url = base_url.rstrip("/")
-        self.client = httpx.AsyncClient(timeout=15)
+        # Pooled keep-alive client (HTTP/2 when h2 is installed) so bursts of IOC legs and
+        # ticker polls reuse one connection. An injected client is shared; only close our own.
+        self._owns_client = client is None
+        self.client = client if client is not None else make_async_client(15)
+        self._closed = False
+        # Short ticker cache (seconds); None -> QUANTBOT_PRICE_CACHE_TTL, 0 disables.
+        self._price_ttl = default_price_ttl() if price_ttl is None else max(0.0, float(price_ttl))
 
     def _make_jwt(self, params: dict[str, Any] | None = None) -> str:
         payload: dict[str, Any] = {
@@ -44,9 +73,11 @@ class UpbitAdapter(BrokerAdapter):
             payload["query_hash"] = qh
             payload["query_hash_alg"] = "SHA512"
 
-        token = jwt.encode(payload, self.secret_key, algorithm="HS256")
-        # PyJWT may return str or bytes depending on version
-        return token.decode() if isinstance(token, bytes) else token
+        # HS256 JWT built directly (header.payload.signature); equivalent to PyJWT's output
+        # for this flat payload without its per-call option/algorithm handling.
+        msg = _JWT_HEADER_B64 + b"." + _b64url(dumps_bytes(payload))
+        sig = hmac.new(self._secret_bytes, msg, hashlib.sha256).digest()
+        return (msg + b"." + _b64url(sig)).decode("ascii")
 
     async def _get(self, path: str, params: dict[str, Any] | None = None, auth: bool = False) -> Any:
         url = f"{self.base_url}{path}"
@@ -56,7 +87,7 @@ class UpbitAdapter(BrokerAdapter):
             headers["Authorization"] = f"Bearer {token}"
         r = await self.client.get(url, params=params, headers=headers)
         r.raise_for_status()
-        return r.json()
+        return loads(r.content)
 
     async def _post(self, path: str, params: dict[str, Any] | None = None, auth: bool = True) -> Any:
         url = f"{self.base_url}{path}"
@@ -66,7 +97,7 @@ class UpbitAdapter(BrokerAdapter):
             headers["Authorization"] = f"Bearer {token}"
         r = await self.client.post(url, params=params, headers=headers)
         r.raise_for_status()
-        return r.json()
+        return loads(r.content)
 
     async def place_order(self, req: OrderRequest) -> OrderUpdate:
         # Upbit expects:
@@ -150,13 +181,70 @@ class UpbitAdapter(BrokerAdapter):
                 raw={"error": str(e)},
             )
 
+    async def get_single_order(self, symbol: str, order_id: str) -> OrderUpdate:
+        """GET /v1/order?uuid=... (auth) -> OrderUpdate with executed volume / average price."""
+        data = await self._get("/v1/order", params={"uuid": order_id}, auth=True)
+        state = (data.get("state") or "wait").lower()
+        filled_qty = float(data.get("executed_volume") or 0.0)
+        if state == "done":
+            status = "FILLED"
+        elif state == "cancel":
+            status = "CANCELED"
+        else:
+            status = "PARTIALLY_FILLED" if filled_qty > 0 else "NEW"
+        avg_price = None
+        trades = data.get("trades") or []
+        try:
+            vol = sum(float(t.get("volume") or 0.0) for t in trades)
+            if vol > 0:
+                avg_price = sum(float(t.get("price") or 0.0) * float(t.get("volume") or 0.0) for t in trades) / vol
+        except Exception:
+            avg_price = None
+        fee = None
+        if data.get("paid_fee") is not None:
+            try:
+                fee = float(data.get("paid_fee"))
+            except Exception:
+                fee = None
+
+        return OrderUpdate(
+            venue="upbit",
+            order_id=str(data.get("uuid") or order_id),
+            client_order_id=None,
+            symbol=symbol,
+            status=status,
+            filled_qty=filled_qty,
+            avg_fill_price=avg_price,
+            fee=fee,
+            ts=utc_now(),
+            raw=data,
+        )
+
     async def get_last_price(self, symbol: str) -> float:
+        if self._price_ttl > 0:
+            px = get_cached_price("upbit", symbol)
+            if px is not None:
+                return px
         # GET /v1/ticker?markets=KRW-BTC
         data = await self._get("/v1/ticker", params={"markets": symbol}, auth=False)
         if isinstance(data, list) and data:
-            return float(data[0]["trade_price"])
+            px = float(data[0]["trade_price"])
+            put_cached_price("upbit", symbol, px, self._price_ttl)
+            return px
         raise ValueError(f"Unexpected ticker response for {symbol}: {data}")
 
+    async def get_last_prices(self, symbols: list[str]) -> dict[str, float]:
+        """Batch ticker: one GET /v1/ticker?markets=A,B,... for all symbols."""
+        if not symbols:
+            return {}
+        data = await self._get("/v1/ticker", params={"markets": ",".join(symbols)}, auth=False)
+        if not isinstance(data, list):
+            raise ValueError(f"Unexpected ticker response for {symbols}: {data}")
+        out = {str(row["market"]): float(row["trade_price"]) for row in data}
+        for sym, px in out.items():
+            put_cached_price("upbit", sym, px, self._price_ttl)
+        return out
+
     async def get_equity(self) -> float:
         # GET /v1/accounts (auth)
         data = await self._get("/v1/accounts", params={}, auth=True)
@@ -179,3 +267,10 @@ class UpbitAdapter(BrokerAdapter):
                 out[cur] = float(row.get("balance") or 0.0)
             return out
         return out
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._owns_client:
+            await self.client.aclose()
@@ -1,13 +1,56 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import asdict
+import math
+import os
+import time
+from collections import OrderedDict
 from typing import Optional, Sequence
 
-from quantbot.common.types import ExecutionResult, OrderRequest, OrderUpdate
+from quantbot.common.types import ExecutionResult, OrderRequest, OrderUpdate, Signal
 from quantbot.execution.adapters.base import BrokerAdapter
 from quantbot.utils.time import utc_now
 
+_TERMINAL = frozenset({"FILLED", "CANCELED", "REJECTED"})
+
+# Binance caps newClientOrderId at 36 chars; the strictest venue we send leg ids to.
+_MAX_CLIENT_ID = 36
+
+
+def _leg_client_id(cid: str | None, suffix: str) -> str | None:
+    """`cid-suffix`, trimmed from the left (symbol side) so the timestamp and suffix survive."""
+    if not cid:
+        return None
+    out = f"{cid}-{suffix}"
+    return out if len(out) <= _MAX_CLIENT_ID else out[-_MAX_CLIENT_ID:]
+
+# Venue order payload fields worth keeping on a confirmed update (Binance / Upbit / error bodies).
+_RAW_KEYS = (
+    "orderId", "clientOrderId", "symbol", "side", "type", "status", "price", "origQty",
+    "executedQty", "cumQuote", "cummulativeQuoteQty", "avgPrice", "updateTime",
+    "uuid", "market", "ord_type", "state", "volume", "executed_volume", "paid_fee",
+    "trades_count", "error", "code", "msg", "status_code",
+)
+
+
+def _keep_raw() -> bool:
+    """QUANTBOT_KEEP_RAW=1 keeps full broker payloads on confirmed updates (debugging)."""
+    return os.getenv("QUANTBOT_KEEP_RAW", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _slim_raw(d: dict | None) -> dict:
+    """Small projection of a broker payload: the fields journals/classifiers read, first 5 fills."""
+    if not d:
+        return {}
+    if not isinstance(d, dict):
+        return {"value": d}
+    out = {k: d[k] for k in _RAW_KEYS if k in d}
+    for k in ("fills", "trades"):
+        v = d.get(k)
+        if isinstance(v, list):
+            out[k] = v[:5]
+    return out
+
 
 class OrderExecutor:
     """Executes orders via a BrokerAdapter.
@@ -24,19 +67,63 @@ class OrderExecutor:
         confirm_fills: bool = True,
         confirm_max_attempts: int = 3,
         confirm_base_sleep_sec: float = 0.15,
+        confirm_max_sleep_sec: float = 1.0,
     ):
         self.adapter = adapter
         self.persist_orders = persist_orders
         self.confirm_fills = bool(confirm_fills)
         self.confirm_max_attempts = int(confirm_max_attempts)
         self.confirm_base_sleep_sec = float(confirm_base_sleep_sec)
+        self.confirm_max_sleep_sec = float(confirm_max_sleep_sec)
+        # (venue, order_id) -> last terminal confirmation; closed orders never change again.
+        self._terminal_cache: OrderedDict[tuple[str, str], OrderUpdate] = OrderedDict()
+        self._terminal_cache_size = 10_000
+        self._persister = None
+        self.keep_raw = _keep_raw()
+
+    def _persist_order(self, req: OrderRequest, upd: OrderUpdate) -> None:
+        """Queue the order for the `orders` table (bulk-written in the background)."""
+        if not self.persist_orders:
+            return
+        try:
+            if self._persister is None:
+                # imported lazily: the storage layer connects to DB_URL on import
+                from quantbot.storage.order_persister import OrderPersister
+
+                self._persister = OrderPersister()
+            self._persister.enqueue(req, upd)
+        except Exception:
+            pass
+
+    async def close(self) -> None:
+        """Flush queued order rows and close the adapter's HTTP client. Call once on shutdown."""
+        if self._persister is not None:
+            try:
+                await self._persister.close()
+            except Exception:
+                pass
+        try:
+            await self.adapter.close()
+        except Exception:
+            pass
+
+    def _remember_terminal(self, upd: OrderUpdate) -> None:
+        key = (str(upd.venue), str(upd.order_id or ""))
+        if not key[1]:
+            return
+        cache = self._terminal_cache
+        cache[key] = upd
+        cache.move_to_end(key)
+        if len(cache) > self._terminal_cache_size:
+            cache.popitem(last=False)
 
     async def _confirm_order_if_needed(self, req: OrderRequest, upd: OrderUpdate) -> OrderUpdate:
         """Best-effort post-trade confirmation.
 
         Some venues (notably Binance futures) may return an ACK/NEW response where executedQty is 0
         even though the order is filled shortly after. That breaks journaling and position tracking.
-        If the adapter exposes `get_order_update`, we poll it a few times.
+        We poll the adapter's `get_single_order` (direct single-order endpoint) a few times,
+        falling back to `get_order_update` when the adapter does not implement it.
         """
         if not self.confirm_fills:
             return upd
@@ -45,32 +132,46 @@ class OrderExecutor:
             if upd is None:
                 return upd
             # Already has meaningful fill info or terminal status.
+            cached = self._terminal_cache.get((str(upd.venue), str(upd.order_id or "")))
+            if cached is not None:
+                return cached
             st = str(upd.status or "").upper()
-            if float(upd.filled_qty or 0.0) > 0.0 or st in {"FILLED", "CANCELED", "REJECTED"}:
+            if float(upd.filled_qty or 0.0) > 0.0 or st in _TERMINAL:
                 return upd
             if not (upd.order_id or "").strip():
                 return upd
 
-            getter = getattr(self.adapter, "get_order_update", None)
-            if getter is None or not callable(getter):
+            legacy = getattr(self.adapter, "get_order_update", None)
+            legacy = legacy if callable(legacy) else None
+            getter = getattr(self.adapter, "get_single_order", None)
+            if not callable(getter):
+                getter = legacy
+            if getter is None:
                 return upd
 
             last = upd
-            for i in range(max(1, self.confirm_max_attempts)):
+            attempts = max(1, self.confirm_max_attempts)
+            for i in range(attempts):
                 try:
-                    conf: OrderUpdate = await getter(req.symbol, str(upd.order_id))  # type: ignore[misc]
+                    try:
+                        conf: OrderUpdate = await getter(req.symbol, str(upd.order_id))  # type: ignore[misc]
+                    except NotImplementedError:
+                        if legacy is None or getter is legacy:
+                            return upd
+                        getter = legacy
+                        conf = await getter(req.symbol, str(upd.order_id))  # type: ignore[misc]
                     if conf is not None:
                         conf_st = str(conf.status or "").upper()
                         conf_filled = float(conf.filled_qty or 0.0)
                         # Return as soon as we have a meaningful update.
                         if conf_filled > 0.0 or conf_st in {"FILLED", "CANCELED", "REJECTED", "PARTIALLY_FILLED"}:
                             merged_raw = {
-                                "confirm_source": "get_order_update",
+                                "confirm_source": getattr(getter, "__name__", "get_order_update"),
                                 "confirm_attempts": i + 1,
-                                "initial": (upd.raw or {}),
-                                "confirmed": (conf.raw or {}),
+                                "initial": (upd.raw or {}) if self.keep_raw else _slim_raw(upd.raw),
+                                "confirmed": (conf.raw or {}) if self.keep_raw else _slim_raw(conf.raw),
                             }
-                            return OrderUpdate(
+                            merged = OrderUpdate(
                                 venue=conf.venue,
                                 order_id=conf.order_id,
                                 symbol=req.symbol,
@@ -82,10 +183,16 @@ class OrderExecutor:
                                 ts=conf.ts,
                                 raw=merged_raw,
                             )
+                            if conf_st in _TERMINAL:
+                                self._remember_terminal(merged)
+                            return merged
                         last = conf
                 except Exception:
                     pass
-                await asyncio.sleep(self.confirm_base_sleep_sec * (1.0 + 0.75 * i))
+                if i == attempts - 1:
+                    break  # nothing left to wait for
+                # exponential backoff: base, 2*base, 4*base ... capped
+                await asyncio.sleep(min(self.confirm_max_sleep_sec, self.confirm_base_sleep_sec * (2 ** i)))
             # No confirmation; keep original.
             return upd
         except Exception:
@@ -96,6 +203,7 @@ class OrderExecutor:
         try:
             upd = await self.adapter.place_order(req)
             upd = await self._confirm_order_if_needed(req, upd)
+            self._persist_order(req, upd)
             return ExecutionResult(req=req, update=upd)
         except Exception as e:
             upd = OrderUpdate(
@@ -112,18 +220,148 @@ class OrderExecutor:
             )
             return ExecutionResult(req=req, update=upd)
 
+    async def execute_many(self, reqs: Sequence[OrderRequest]) -> list[ExecutionResult]:
+        """Submit several independent orders at once; results come back in request order.
+
+        Uses the adapter's `place_orders_batch` (one venue call per batch) when it has one,
+        otherwise runs `execute` for every request concurrently.
+        """
+        if not reqs:
+            return []
+        batch = getattr(self.adapter, "place_orders_batch", None)
+        if batch is None or not callable(batch) or len(reqs) == 1:
+            return list(await asyncio.gather(*(self.execute(r) for r in reqs)))
+        try:
+            updates = await batch(list(reqs))  # type: ignore[misc]
+        except Exception as e:
+            # Never resubmit here: part of the batch may already be live at the venue.
+            updates = [
+                OrderUpdate(
+                    venue=r.venue,
+                    order_id="",
+                    symbol=r.symbol,
+                    status="REJECTED",
+                    filled_qty=0.0,
+                    avg_fill_price=None,
+                    fee=None,
+                    client_order_id=r.client_order_id,
+                    ts=utc_now(),
+                    raw={"error": str(e)},
+                )
+                for r in reqs
+            ]
+        confirmed = await asyncio.gather(*(self._confirm_order_if_needed(r, u) for r, u in zip(reqs, updates)))
+        for r, u in zip(reqs, confirmed):
+            self._persist_order(r, u)
+        return [ExecutionResult(req=r, update=u) for r, u in zip(reqs, confirmed)]
+
+    @staticmethod
+    def _build_req(
+        sig: Signal,
+        qty: float,
+        order_type: str = "MARKET",
+        price: float | None = None,
+        *,
+        seq: int = 0,
+        ts_ms: int | None = None,
+    ) -> OrderRequest:
+        ts_ms = int(time.time() * 1000) if ts_ms is None else ts_ms
+        return OrderRequest(
+            venue=sig.venue,
+            symbol=sig.symbol,
+            side=sig.side,  # type: ignore[arg-type]
+            order_type=order_type,  # type: ignore[arg-type]
+            qty=float(qty),
+            price=price,
+            client_order_id=f"{sig.symbol}-SIG-{ts_ms}-{seq}",
+            meta={"score": float(sig.score)},
+        )
+
+    async def execute_from_signal(
+        self,
+        sig: Signal,
+        *,
+        qty: float,
+        order_type: str = "MARKET",
+        price: float | None = None,
+    ) -> ExecutionResult:
+        """Turn one BUY/SELL signal into an order (see execute_from_signals for baskets)."""
+        return (await self.execute_from_signals([(sig, qty, price)], order_type=order_type))[0]
+
+    async def execute_from_signals(
+        self,
+        items: Sequence[tuple[Signal, float] | tuple[Signal, float, float | None]],
+        *,
+        order_type: str = "MARKET",
+    ) -> list[ExecutionResult]:
+        """Dispatch a basket of (signal, qty[, limit price]) at once; results in input order.
+
+        All requests are built first and sent through execute_many (one batch call when the
+        adapter has `place_orders_batch`, otherwise concurrently), so N orders cost about
+        one round-trip instead of N. HOLD signals and non-positive qty are rejected locally.
+        """
+        ts_ms = int(time.time() * 1000)
+        out: list[ExecutionResult | None] = [None] * len(items)
+        send: list[tuple[int, OrderRequest]] = []
+        for i, item in enumerate(items):
+            sig, qty = item[0], float(item[1])
+            price = item[2] if len(item) > 2 else None
+            req = self._build_req(sig, qty, order_type, price, seq=i, ts_ms=ts_ms)
+            if sig.side not in ("BUY", "SELL") or qty <= 0:
+                reason = "HOLD" if sig.side not in ("BUY", "SELL") else "ZERO_QTY"
+                out[i] = ExecutionResult(
+                    req=req,
+                    update=OrderUpdate(
+                        venue=req.venue,
+                        order_id="",
+                        symbol=req.symbol,
+                        status="REJECTED",
+                        client_order_id=req.client_order_id,
+                        ts=utc_now(),
+                        raw={"reason": reason},
+                    ),
+                )
+            else:
+                send.append((i, req))
+        if send:
+            results = await self.execute_many([r for _, r in send])
+            for (i, _), res in zip(send, results):
+                out[i] = res
+        return out  # type: ignore[return-value]
+
+    async def _qty_step(self, symbol: str) -> float:
+        """Venue qty step for `symbol`, or 0.0 when the adapter doesn't expose symbol rules."""
+        if not hasattr(self.adapter, "get_symbol_rules"):
+            return 0.0
+        try:
+            rules = await self.adapter.get_symbol_rules(symbol, order_type="LIMIT")
+            return float(getattr(rules, "qty_step", 0.0) or 0.0)
+        except Exception:
+            return 0.0
+
     async def execute_ioc_limit_prices_then_market(
         self,
         req: OrderRequest,
         prices: Sequence[float],
         *,
         fallback_market: bool = True,
+        parallel: bool = False,
     ) -> ExecutionResult:
         """Place one or more LIMIT-IOC orders (in order), then market-fill remainder.
 
         The caller supplies a list of candidate limit prices (already including any
         pads / hint prices). We will try them sequentially for the remaining qty.
 
+        parallel=True submits the price legs at once (as one batch when the adapter
+        supports `place_orders_batch`) and waits for all of them (wall clock ~ one
+        round-trip instead of N). IOC legs can't be cancelled once another one fills,
+        so req.qty is split across the legs: their sum never exceeds req.qty, and
+        whatever they leave unfilled goes to the market fallback as usual. Each share is
+        rounded down to the symbol's qty step (adapter `get_symbol_rules`, when it has
+        one) and the rounding remainder goes to the market fallback as well. Legs are
+        dropped from the end of the ladder while an equal share would round to zero or
+        fall below min_notional.
+
         Returns
         - ExecutionResult with a synthetic OrderUpdate where filled_qty/avg_fill_price/fee
           are aggregated across all legs.
@@ -132,6 +370,25 @@ class OrderExecutor:
             return await self.execute(req)
 
         total_qty = float(req.qty)
+        # Nothing to send: answer without touching the venue.
+        if total_qty <= 1e-12 or (not prices and not fallback_market):
+            return ExecutionResult(
+                req=req,
+                update=OrderUpdate(
+                    venue=req.venue,
+                    symbol=req.symbol,
+                    order_id="",
+                    client_order_id=req.client_order_id,
+                    status="FILLED" if total_qty <= 1e-12 else "REJECTED",
+                    filled_qty=0.0,
+                    avg_fill_price=None,
+                    fee=None,
+                    ts=utc_now(),
+                    raw={"ioc_legs": [], "market": None, "reason": "ZERO_QTY" if total_qty <= 1e-12 else "NO_PRICES"},
+                ),
+            )
+        # Optional venue minimum (req.meta["min_notional"]): legs below it would only be rejected.
+        min_notional = float((req.meta or {}).get("min_notional") or 0.0)
         filled_total = 0.0
         fee_total = 0.0
         wsum = 0.0
@@ -139,35 +396,85 @@ class OrderExecutor:
         raw_legs: list[dict] = []
 
         remaining = total_qty
-        for px in prices:
-            if remaining <= 0:
-                break
+        ioc_meta = {**(req.meta or {}), "timeInForce": "IOC"}
+        prices = [float(px) for px in prices]  # coerce once; the loop below uses them as floats
+        # Every leg gets its own client id (venues reject duplicates in flight, and the orders
+        # table keys rows on it).
+        cid = req.client_order_id
+        if parallel and len(prices) > 1:
+            # IOC legs can't be cancelled once one fills: split req.qty so they sum to at most
+            # req.qty, dropping legs from the end while an equal share is below min_notional.
+            step = await self._qty_step(req.symbol)
 
-            ioc_req = OrderRequest(
-                venue=req.venue,
-                symbol=req.symbol,
-                side=req.side,
-                order_type="LIMIT",
-                qty=remaining,
-                price=float(px),
-                client_order_id=req.client_order_id,
-                meta={**(req.meta or {}), "timeInForce": "IOC"},
-            )
-            ioc_res = await self.execute(ioc_req)
-            leg_ids.append(str(ioc_res.update.order_id or ""))
-            raw_legs.append(ioc_res.update.raw or {})
+            def share(k: int) -> float:
+                q = total_qty / k
+                # epsilon: 0.0003 / 0.0001 must not floor to 2
+                return math.floor(q / step + 1e-9) * step if step > 0 else q
+
+            n = len(prices)
+            while n > 1 and (share(n) <= 0 or share(n) * min(prices[:n]) < min_notional):
+                n -= 1
+            leg_qty = share(n)
+            reqs = [
+                (i, OrderRequest(
+                    venue=req.venue,
+                    symbol=req.symbol,
+                    side=req.side,
+                    order_type="LIMIT",
+                    qty=leg_qty,
+                    price=px,
+                    client_order_id=_leg_client_id(cid, f"L{i}"),
+                    meta=ioc_meta,
+                ))
+                for i, px in enumerate(prices[:n])
+                if leg_qty > 0 and px * leg_qty >= min_notional
+            ]
+            results = await self.execute_many([r for _, r in reqs])
+            legs: dict[int, ExecutionResult] | None = {i: res for (i, _), res in zip(reqs, results)}
+        else:
+            legs = None
+
+        for i, px in enumerate(prices):
+            if legs is not None:
+                # parallel legs were all sent, sized so they sum to at most req.qty
+                ioc_res = legs.get(i)
+                if ioc_res is None:
+                    continue
+            elif remaining <= 0:
+                break
+            elif px * remaining < min_notional:
+                continue
+            else:
+                ioc_req = OrderRequest(
+                    venue=req.venue,
+                    symbol=req.symbol,
+                    side=req.side,
+                    order_type="LIMIT",
+                    qty=remaining,
+                    price=px,
+                    client_order_id=_leg_client_id(cid, f"L{i}"),
+                    meta=ioc_meta,
+                )
+                ioc_res = await self.execute(ioc_req)
+            u = ioc_res.update
+            leg_ids.append(str(u.order_id or ""))
+            raw_legs.append(u.raw or {})
 
-            f = float(ioc_res.update.filled_qty or 0.0)
+            # one coercion per field (adapters may hand back strings); skip it for empty values
+            f = float(u.filled_qty) if u.filled_qty else 0.0
             if f > 0:
                 filled_total += f
-                px_f = float(ioc_res.update.avg_fill_price) if ioc_res.update.avg_fill_price is not None else float(px)
-                wsum += px_f * f
+                avg = u.avg_fill_price
+                wsum += (float(avg) if avg is not None else px) * f
 
-            fee_total += float(ioc_res.update.fee or 0.0)
+            if u.fee:
+                fee_total += float(u.fee)
             remaining = max(0.0, total_qty - filled_total)
 
         mkt_raw = None
-        if remaining > 0 and fallback_market:
+        # dust remainder: a market order for it would be rejected below min notional
+        dust = min_notional > 0 and bool(prices) and prices[-1] * remaining < min_notional
+        if remaining > 0 and fallback_market and not dust:
             mkt_req = OrderRequest(
                 venue=req.venue,
                 symbol=req.symbol,
@@ -175,21 +482,22 @@ class OrderExecutor:
                 order_type="MARKET",
                 qty=remaining,
                 price=None,
-                client_order_id=f"{req.client_order_id}-MKT" if req.client_order_id else None,
+                client_order_id=_leg_client_id(cid, "MKT"),
                 meta=req.meta or {},
             )
-            mkt_res = await self.execute(mkt_req)
-            mkt_raw = mkt_res.update.raw or {}
-            leg_ids.append(str(mkt_res.update.order_id or ""))
-            f2 = float(mkt_res.update.filled_qty or 0.0)
+            mu = (await self.execute(mkt_req)).update
+            mkt_raw = mu.raw or {}
+            leg_ids.append(str(mu.order_id or ""))
+            f2 = float(mu.filled_qty) if mu.filled_qty else 0.0
             if f2 > 0:
                 filled_total += f2
-                px2 = float(mkt_res.update.avg_fill_price or 0.0) or 0.0
+                px2 = float(mu.avg_fill_price) if mu.avg_fill_price else 0.0
                 if px2 <= 0:
                     # fallback to last IOC price if we have it, else 0
-                    px2 = float(prices[-1]) if prices else 0.0
+                    px2 = prices[-1] if prices else 0.0
                 wsum += px2 * f2
-            fee_total += float(mkt_res.update.fee or 0.0)
+            if mu.fee:
+                fee_total += float(mu.fee)
             remaining = max(0.0, total_qty - filled_total)
 
         avg_px = (wsum / filled_total) if filled_total > 0 else None
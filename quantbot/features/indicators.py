@@ -3,6 +3,11 @@ from __future__ import annotations
 import pandas as pd
 import numpy as np
 
+try:
+    from numba import njit  # type: ignore
+except Exception:  # pragma: no cover
+    njit = None  # type: ignore
+
 
 def _sma(s: pd.Series, length: int) -> pd.Series:
     return s.rolling(length, min_periods=length).mean()
@@ -26,37 +31,187 @@ def _rsi(close: pd.Series, length: int = 14) -> pd.Series:
     rsi = 100.0 - (100.0 / (1.0 + rs))
     return rsi
 
-def add_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df["SMA_30"] = _sma(df["close"], 30)
-    df["SMA_120"] = _sma(df["close"], 120)
-    df["SMA_200"] = _sma(df["close"], 200)
-    # 864d ~= 3.4y trading days (calendar ~ 4y). Needs long history.
-    df["SMA_864"] = _sma(df["close"], 864)
-    df["RSI_14"] = _rsi(df["close"], 14)
-
-    # Bollinger Bands (20, 2)
-    bb_mid = _sma(df["close"], 20)
-    bb_std = df["close"].rolling(20, min_periods=20).std()
-    df["BBM_20_2"] = bb_mid
-    df["BBU_20_2"] = bb_mid + 2 * bb_std
-    df["BBL_20_2"] = bb_mid - 2 * bb_std
-
-    df["VOL_SMA_5"] = _sma(df["volume"], 5)
-    df["VOL_SMA_20"] = _sma(df["volume"], 20)
-    df["VOL_SURGE"] = (df["volume"] / df["VOL_SMA_5"]).replace([float("inf")], pd.NA)
-    return df
+
+# Windows computed by the fused kernel, in output-row order.
+_CLOSE_WINDOWS = (30, 120, 200, 864, 20)   # SMA_30/120/200/864, BBM_20
+_VOL_WINDOWS = (5, 20)
+
+
+def _fused_indicators(close, vol, c_windows, v_windows, rsi_len):
+    """One pass over close/volume for every rolling mean, the BB(20) std and Wilder RSI.
+
+    Running sums are Kahan-compensated (add the new value, remove the one leaving the
+    window) so long series do not drift from pandas' rolling().mean(). Like pandas, a
+    window holding one repeated value (e.g. a zero-volume run after traded bars) yields
+    that value exactly instead of the running sum's rounding residue. The BB std is
+    recomputed over its 20 values (two-pass) rather than from a running sum of squares.
+    Inputs must be finite; add_indicators falls back to pandas otherwise.
+    """
+    n = close.shape[0]
+    nc = c_windows.shape[0]
+    nv = v_windows.shape[0]
+    c_out = np.full((nc, n), np.nan)
+    v_out = np.full((nv, n), np.nan)
+    bb_std = np.full(n, np.nan)
+    rsi = np.full(n, np.nan)
+    c_sum = np.zeros(nc)
+    c_cmp = np.zeros(nc)
+    v_sum = np.zeros(nv)
+    v_cmp = np.zeros(nv)
+    bb_row = nc - 1
+    bb_len = c_windows[bb_row]
+    alpha = 1.0 / rsi_len
+    avg_gain = 0.0
+    avg_loss = 0.0
+    # length of the run of equal values ending at i
+    c_run = 0
+    v_run = 0
+
+    for i in range(n):
+        x = close[i]
+        c_run = c_run + 1 if i > 0 and x == close[i - 1] else 1
+        for k in range(nc):
+            length = c_windows[k]
+            y = x - c_cmp[k]
+            t = c_sum[k] + y
+            c_cmp[k] = (t - c_sum[k]) - y
+            c_sum[k] = t
+            if i >= length:
+                y = -close[i - length] - c_cmp[k]
+                t = c_sum[k] + y
+                c_cmp[k] = (t - c_sum[k]) - y
+                c_sum[k] = t
+            if i >= length - 1:
+                c_out[k, i] = x if c_run >= length else c_sum[k] / length
+
+        v = vol[i]
+        v_run = v_run + 1 if i > 0 and v == vol[i - 1] else 1
+        for k in range(nv):
+            length = v_windows[k]
+            y = v - v_cmp[k]
+            t = v_sum[k] + y
+            v_cmp[k] = (t - v_sum[k]) - y
+            v_sum[k] = t
+            if i >= length:
+                y = -vol[i - length] - v_cmp[k]
+                t = v_sum[k] + y
+                v_cmp[k] = (t - v_sum[k]) - y
+                v_sum[k] = t
+            if i >= length - 1:
+                v_out[k, i] = v if v_run >= length else v_sum[k] / length
+
+        if i >= bb_len - 1:
+            m = c_out[bb_row, i]
+            ss = 0.0
+            for j in range(i - bb_len + 1, i + 1):
+                d = close[j] - m
+                ss += d * d
+            bb_std[i] = np.sqrt(ss / (bb_len - 1))
+
+        # Wilder RSI == EMA(alpha=1/len, adjust=False) of gains/losses, seeded by the first delta
+        if i >= 1:
+            delta = close[i] - close[i - 1]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            if i == 1:
+                avg_gain = gain
+                avg_loss = loss
+            else:
+                avg_gain = (1.0 - alpha) * avg_gain + alpha * gain
+                avg_loss = (1.0 - alpha) * avg_loss + alpha * loss
+            if i >= rsi_len and avg_loss != 0.0:
+                rsi[i] = 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+
+    return c_out, v_out, bb_std, rsi
+
+
+_fused_indicators_jit = njit(cache=True)(_fused_indicators) if njit is not None else None
+
+
+def add_indicators(df: pd.DataFrame, *, inplace: bool = False) -> pd.DataFrame:
+    """Return `df` with SMA/RSI/Bollinger/volume columns added.
+
+    The new columns are built first and attached in one step: by default via
+    `df.assign` (the input frame is not modified and its existing columns are not
+    copied); with inplace=True they are written onto `df` itself.
+    """
+    cols: dict[str, object] | None = None
+    if _fused_indicators_jit is not None and len(df):
+        close = df["close"].to_numpy(dtype=np.float64)
+        vol = df["volume"].to_numpy(dtype=np.float64)
+        if np.isfinite(close).all() and np.isfinite(vol).all():
+            c_out, v_out, bb_std, rsi = _fused_indicators_jit(
+                close, vol, np.array(_CLOSE_WINDOWS, dtype=np.int64), np.array(_VOL_WINDOWS, dtype=np.int64), 14
+            )
+            bb_mid = c_out[4]
+            cols = {
+                "SMA_30": c_out[0],
+                "SMA_120": c_out[1],
+                "SMA_200": c_out[2],
+                "SMA_864": c_out[3],
+                "RSI_14": rsi,
+                "BBM_20_2": bb_mid,
+                "BBU_20_2": bb_mid + 2 * bb_std,
+                "BBL_20_2": bb_mid - 2 * bb_std,
+                "VOL_SMA_5": v_out[0],
+                "VOL_SMA_20": v_out[1],
+            }
+
+    if cols is None:
+        close_s = df["close"]
+        # Bollinger Bands (20, 2)
+        bb_mid = _sma(close_s, 20)
+        bb_std = close_s.rolling(20, min_periods=20).std()
+        cols = {
+            "SMA_30": _sma(close_s, 30),
+            "SMA_120": _sma(close_s, 120),
+            "SMA_200": _sma(close_s, 200),
+            # 864d ~= 3.4y trading days (calendar ~ 4y). Needs long history.
+            "SMA_864": _sma(close_s, 864),
+            "RSI_14": _rsi(close_s, 14),
+            "BBM_20_2": bb_mid,
+            "BBU_20_2": bb_mid + 2 * bb_std,
+            "BBL_20_2": bb_mid - 2 * bb_std,
+            "VOL_SMA_5": _sma(df["volume"], 5),
+            "VOL_SMA_20": _sma(df["volume"], 20),
+        }
+
+    cols["VOL_SURGE"] = (df["volume"] / cols["VOL_SMA_5"]).replace([float("inf")], pd.NA)
+
+    if inplace:
+        for k, v in cols.items():
+            df[k] = v
+        return df
+    return df.assign(**cols)
+
+_ALIGN_KEYS = ("close", "SMA_30", "SMA_120", "SMA_200", "SMA_864")
+
 
 def inverse_alignment(last: pd.Series) -> bool:
-    keys = ["SMA_30","SMA_120","SMA_200","SMA_864"]
-    if any(pd.isna(last.get(k)) for k in keys):
+    # One row -> dict conversion, then plain float compares (no per-key Series indexing).
+    v = last.to_dict() if hasattr(last, "to_dict") else last
+    try:
+        c, a, b, cc, d = (float(v.get(k)) for k in _ALIGN_KEYS)
+    except (TypeError, ValueError):
+        return False  # missing / NA
+    if a != a or b != b or cc != cc or d != d:
         return False
-    return (last["close"] < last["SMA_30"] < last["SMA_120"] < last["SMA_200"] < last["SMA_864"])
+    return c < a < b < cc < d
 
 def fibonacci_levels(df: pd.DataFrame, lookback: int = 60) -> dict:
-    sub = df.tail(lookback)
-    recent_high = float(sub["high"].max())
-    recent_low = float(sub["low"].min())
+    # plain ndarray slices instead of a tail() frame + two Series reductions
+    n = max(0, int(lookback))
+    start = max(0, len(df) - n)
+    hi = df["high"].to_numpy(dtype=np.float64)[start:] if n else np.empty(0)
+    lo = df["low"].to_numpy(dtype=np.float64)[start:] if n else np.empty(0)
+    recent_high = float(hi.max()) if hi.size else float("nan")
+    recent_low = float(lo.min()) if lo.size else float("nan")
+    if recent_high != recent_high or recent_low != recent_low:
+        # NaN inside the window: skip it like Series.max/min do
+        hi = hi[~np.isnan(hi)]
+        lo = lo[~np.isnan(lo)]
+        recent_high = float(hi.max()) if hi.size else float("nan")
+        recent_low = float(lo.min()) if lo.size else float("nan")
     diff = recent_high - recent_low
     return {
         "low": recent_low,
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, Iterable, Tuple
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Tuple, TypedDict
+
+import numpy as np
 
 
 def _lvl_to_pq(lvl: Any, *, side: str = "") -> Tuple[float, float] | None:
@@ -54,56 +57,236 @@ def _lvl_to_pq(lvl: Any, *, side: str = "") -> Tuple[float, float] | None:
         return None
 
 
-def _iter_levels(orderbook: Any, *, side: str, depth: int) -> Iterable[Tuple[float, float]]:
-    """Yield (price, qty) for a given side."""
+# Orderbook shapes, detected once per snapshot (see _detect_schema).
+OB_UNKNOWN = 0
+OB_UPBIT_UNITS = 1     # [{'orderbook_units': [{'bid_price','bid_size','ask_price','ask_size'}, ...]}]
+OB_SOA = 2             # {'bid_px','bid_qty','ask_px','ask_qty'} arrays
+OB_BOOK_LISTS = 3      # Binance: {'bids': [[p,q],...], 'asks': [[p,q],...]}
+OB_BOOK = 4            # {'bids','asks'} with dict (or mixed) levels
+OB_STOCK_LEVELS = 5    # {'bid': [...], 'ask': [...]}
+OB_UNITS_DICT = 6      # {'orderbook_units': [...]}
+
+
+class NdOrderbook(TypedDict):
+    """OB_SOA payload: best-first float64 arrays per side (see KiwoomRestAdapter(numpy_orderbook=True))."""
+
+    bid_px: np.ndarray
+    bid_qty: np.ndarray
+    ask_px: np.ndarray
+    ask_qty: np.ndarray
+
+
+_UNITS_KEYS = {"bid": ("bid_price", "bid_size"), "ask": ("ask_price", "ask_size")}
+
+
+def _detect_schema(orderbook: Any) -> int:
+    """Classify an orderbook payload so readers can skip per-level key probing."""
+    if isinstance(orderbook, list):
+        return OB_UPBIT_UNITS if orderbook else OB_UNKNOWN
+    if not isinstance(orderbook, dict):
+        return OB_UNKNOWN
+    if "bid_px" in orderbook and "ask_px" in orderbook:
+        return OB_SOA
+    if "bids" in orderbook and "asks" in orderbook:
+        first = (orderbook.get("bids") or orderbook.get("asks") or [None])[0]
+        return OB_BOOK_LISTS if isinstance(first, (list, tuple)) else OB_BOOK
+    if "bid" in orderbook and "ask" in orderbook and isinstance(orderbook.get("bid"), list):
+        return OB_STOCK_LEVELS
+    if "orderbook_units" in orderbook and isinstance(orderbook.get("orderbook_units"), list):
+        return OB_UNITS_DICT
+    return OB_UNKNOWN
+
+
+def _soa_side(orderbook: NdOrderbook, side: str, depth: int) -> tuple[np.ndarray, np.ndarray]:
+    px = np.asarray(orderbook.get(f"{side}_px"), dtype=np.float64)[:depth]
+    sz = np.asarray(orderbook.get(f"{side}_qty"), dtype=np.float64)[:depth]
+    n = min(len(px), len(sz))
+    return px[:n], sz[:n]
+
+
+def _soa_notionals(orderbook: NdOrderbook, depth: int) -> tuple[float, float]:
+    """(bid, ask) notional of an OB_SOA book as two dot products - no per-level Python."""
+    bp, bq = _soa_side(orderbook, "bid", depth)
+    ap, aq = _soa_side(orderbook, "ask", depth)
+    return float(np.dot(bp, bq)), float(np.dot(ap, aq))
+
+
+def _generic_levels(levels: Any, side: str, depth: int) -> list[Tuple[float, float]]:
+    out = []
+    for lvl in (levels or [])[:depth]:
+        pq = _lvl_to_pq(lvl, side=side)
+        if pq:
+            out.append(pq)
+    return out
+
+
+def _iter_levels(orderbook: Any, *, side: str, depth: int, schema: int | None = None) -> Iterable[Tuple[float, float]]:
+    """Yield (price, qty) for a given side.
+
+    Pass `schema` (from _detect_schema) when reading both sides of one snapshot. The
+    known shapes use fixed keys/positions; a level that does not fit drops the whole
+    side back to the generic per-level parser, so results match either way.
+    """
     if side not in {"bid", "ask"}:
         return []
+    if schema is None:
+        schema = _detect_schema(orderbook)
 
-    # Upbit
-    if isinstance(orderbook, list) and orderbook:
+    if schema == OB_UPBIT_UNITS:
         units = orderbook[0].get("orderbook_units") or []
-        out = []
-        for u in units[:depth]:
-            pq = _lvl_to_pq(u, side=side)
-            if pq:
-                out.append(pq)
-        return out
-
-    # Dict-style
-    if isinstance(orderbook, dict):
-        # Binance style
-        if "bids" in orderbook and "asks" in orderbook:
-            levels = orderbook.get("bids") if side == "bid" else orderbook.get("asks")
-            out = []
-            for lvl in (levels or [])[:depth]:
-                pq = _lvl_to_pq(lvl, side=side)
-                if pq:
-                    out.append(pq)
-            return out
+        pk, qk = _UNITS_KEYS[side]
+        try:
+            return [(float(u[pk]), float(u[qk])) for u in units[:depth]]
+        except Exception:
+            return _generic_levels(units, side, depth)
 
+    if schema == OB_SOA:
+        # Struct-of-arrays (e.g. KiwoomRestAdapter(numpy_orderbook=True))
+        px = orderbook.get(f"{side}_px")
+        qty = orderbook.get(f"{side}_qty")
+        if px is None or qty is None:
+            return []
+        return list(zip(px[:depth].tolist(), qty[:depth].tolist()))
+
+    if schema == OB_BOOK_LISTS or schema == OB_BOOK:
+        levels = orderbook.get("bids") if side == "bid" else orderbook.get("asks")
+        if schema == OB_BOOK_LISTS:
+            lv = (levels or [])[:depth]
+            try:
+                out = [(float(lvl[0]), float(lvl[1])) for lvl in lv if isinstance(lvl, (list, tuple))]
+                if len(out) == len(lv):
+                    return out
+            except Exception:
+                pass
+        return _generic_levels(levels, side, depth)
+
+    if schema == OB_STOCK_LEVELS:
         # Some stock REST APIs use 'bid'/'ask' as lists
-        if "bid" in orderbook and "ask" in orderbook and isinstance(orderbook.get("bid"), list):
-            levels = orderbook.get("bid") if side == "bid" else orderbook.get("ask")
-            out = []
-            for lvl in (levels or [])[:depth]:
-                pq = _lvl_to_pq(lvl, side=side)
-                if pq:
-                    out.append(pq)
-            return out
-
-        # Nested orderbook_units inside a dict
-        if "orderbook_units" in orderbook and isinstance(orderbook.get("orderbook_units"), list):
-            levels = orderbook.get("orderbook_units")
-            out = []
-            for u in (levels or [])[:depth]:
-                pq = _lvl_to_pq(u, side=side)
-                if pq:
-                    out.append(pq)
-            return out
+        return _generic_levels(orderbook.get(side), side, depth)
+
+    if schema == OB_UNITS_DICT:
+        return _generic_levels(orderbook.get("orderbook_units"), side, depth)
 
     return []
 
 
+@dataclass(slots=True)
+class OBSnapshot:
+    """One orderbook snapshot parsed once (top `depth` levels) for all per-tick features.
+
+    Build it with parse_orderbook(); orderbook_imbalance_score, orderbook_depth_notional,
+    best_bid_ask and spread_bps accept it in place of the raw payload.
+    """
+
+    bid_px: np.ndarray
+    bid_sz: np.ndarray
+    ask_px: np.ndarray
+    ask_sz: np.ndarray
+    bid_notional: float
+    ask_notional: float
+    best_bid: float
+    best_ask: float
+
+
+def _side_arrays(levels: Iterable[Tuple[float, float]], depth: int) -> tuple[np.ndarray, np.ndarray, float]:
+    px = np.empty(depth)
+    sz = np.empty(depth)
+    notional = 0.0
+    n = 0
+    for p, q in levels:
+        px[n] = p
+        sz[n] = q
+        notional += float(p) * float(q)
+        n += 1
+    return px[:n], sz[:n], notional
+
+
+def _snapshot(bid_px: np.ndarray, bid_sz: np.ndarray, ask_px: np.ndarray, ask_sz: np.ndarray, best_both: bool) -> OBSnapshot:
+    has_b, has_a = len(bid_px) > 0, len(ask_px) > 0
+    if best_both and not (has_b and has_a):
+        has_b = has_a = False  # book-style best_bid_ask needs both sides
+    return OBSnapshot(
+        bid_px, bid_sz, ask_px, ask_sz,
+        float(np.dot(bid_px, bid_sz)), float(np.dot(ask_px, ask_sz)),
+        float(bid_px[0]) if has_b else 0.0, float(ask_px[0]) if has_a else 0.0,
+    )
+
+
+def _parse_soa(orderbook: Any, depth: int = 10) -> OBSnapshot:
+    bid_px, bid_sz = _soa_side(orderbook, "bid", depth)
+    ask_px, ask_sz = _soa_side(orderbook, "ask", depth)
+    return _snapshot(bid_px, bid_sz, ask_px, ask_sz, best_both=False)
+
+
+def _parse_upbit_units(orderbook: Any, depth: int = 10) -> OBSnapshot:
+    units = orderbook[0]["orderbook_units"][:depth]
+    if not units:
+        return parse_orderbook(orderbook, depth)
+    m = np.array([(u["bid_price"], u["bid_size"], u["ask_price"], u["ask_size"]) for u in units], dtype=np.float64)
+    if np.isnan(m).any():
+        raise ValueError("missing level field")  # None becomes NaN here
+    return _snapshot(m[:, 0], m[:, 1], m[:, 2], m[:, 3], best_both=False)
+
+
+def _levels_2d(levels: Any) -> np.ndarray:
+    m = np.array(levels, dtype=np.float64)
+    if m.size == 0:
+        return m.reshape(0, 2)
+    if m.ndim != 2 or m.shape[1] < 2 or np.isnan(m[:, :2]).any():
+        raise ValueError("not [price, qty] levels")
+    return m
+
+
+def _parse_book_lists(orderbook: Any, depth: int = 10) -> OBSnapshot:
+    b = _levels_2d(orderbook["bids"][:depth])
+    a = _levels_2d(orderbook["asks"][:depth])
+    return _snapshot(b[:, 0], b[:, 1], a[:, 0], a[:, 1], best_both=True)
+
+
+_SPECIALISED: dict[int, Callable[[Any, int], OBSnapshot]] = {
+    OB_SOA: _parse_soa,
+    OB_UPBIT_UNITS: _parse_upbit_units,
+    OB_BOOK_LISTS: _parse_book_lists,
+}
+
+
+def orderbook_parser(schema: int) -> Callable[[Any, int], OBSnapshot]:
+    """parse_orderbook specialised for one payload shape.
+
+    Bind it once per venue/adapter: the fixed-shape parsers read known keys straight
+    into arrays with no per-snapshot detection or per-level key probing. A payload that
+    does not fit falls back to the generic parse_orderbook, so the result never depends
+    on the schema being right.
+    """
+    fast = _SPECIALISED.get(schema)
+    if fast is None:
+        return parse_orderbook
+
+    def parse(orderbook: Any, depth: int = 10) -> OBSnapshot:
+        try:
+            return fast(orderbook, depth)
+        except Exception:
+            return parse_orderbook(orderbook, depth)
+
+    return parse
+
+
+def parse_orderbook(orderbook: Any, depth: int = 10) -> OBSnapshot:
+    """Walk the top `depth` levels of each side once. Never raises (bad input -> empty book)."""
+    try:
+        schema = _detect_schema(orderbook)
+        if schema == OB_SOA:
+            return _parse_soa(orderbook, depth)
+        bid_px, bid_sz, bid_n = _side_arrays(_iter_levels(orderbook, side="bid", depth=depth, schema=schema), depth)
+        ask_px, ask_sz, ask_n = _side_arrays(_iter_levels(orderbook, side="ask", depth=depth, schema=schema), depth)
+    except Exception:
+        bid_px = bid_sz = ask_px = ask_sz = np.empty(0)
+        bid_n = ask_n = 0.0
+    # best_bid_ask reads level 0 with its own rules (e.g. scalar stock quotes), keep them
+    best_bid, best_ask = best_bid_ask(orderbook)
+    return OBSnapshot(bid_px, bid_sz, ask_px, ask_sz, bid_n, ask_n, best_bid, best_ask)
+
+
 def orderbook_imbalance_score(orderbook: Any, depth: int = 10) -> float:
     """Compute a simple orderbook imbalance score in [-1, 1].
 
@@ -112,15 +295,21 @@ def orderbook_imbalance_score(orderbook: Any, depth: int = 10) -> float:
       - Binance: {'bids': [[price,qty],...], 'asks': [[price,qty],...]}
 
     The score is (bid_notional - ask_notional) / (bid_notional + ask_notional).
+    An OBSnapshot is used as parsed (its own depth; `depth` is ignored).
     """
     try:
-        bid_notional = 0.0
-        ask_notional = 0.0
-
-        for p, q in _iter_levels(orderbook, side="bid", depth=depth):
-            bid_notional += float(p) * float(q)
-        for p, q in _iter_levels(orderbook, side="ask", depth=depth):
-            ask_notional += float(p) * float(q)
+        if isinstance(orderbook, OBSnapshot):
+            bid_notional = orderbook.bid_notional
+            ask_notional = orderbook.ask_notional
+        elif (schema := _detect_schema(orderbook)) == OB_SOA:
+            bid_notional, ask_notional = _soa_notionals(orderbook, depth)
+        else:
+            bid_notional = 0.0
+            ask_notional = 0.0
+            for p, q in _iter_levels(orderbook, side="bid", depth=depth, schema=schema):
+                bid_notional += float(p) * float(q)
+            for p, q in _iter_levels(orderbook, side="ask", depth=depth, schema=schema):
+                ask_notional += float(p) * float(q)
 
         denom = bid_notional + ask_notional
         if denom <= 0:
@@ -134,6 +323,8 @@ def orderbook_imbalance_score(orderbook: Any, depth: int = 10) -> float:
 def best_bid_ask(orderbook: Any) -> tuple[float, float]:
     """Return (best_bid, best_ask). If not available returns (0,0)."""
     try:
+        if isinstance(orderbook, OBSnapshot):
+            return orderbook.best_bid, orderbook.best_ask
         if isinstance(orderbook, list) and orderbook:
             units = (orderbook[0].get('orderbook_units') or [])
             if not units:
@@ -142,6 +333,14 @@ def best_bid_ask(orderbook: Any) -> tuple[float, float]:
             best_ask = float(units[0].get('ask_price') or 0.0)
             return best_bid, best_ask
         if isinstance(orderbook, dict):
+            # Struct-of-arrays
+            if 'bid_px' in orderbook and 'ask_px' in orderbook:
+                bpx = orderbook.get('bid_px')
+                apx = orderbook.get('ask_px')
+                if len(bpx) and len(apx):
+                    return float(bpx[0]), float(apx[0])
+                return 0.0, 0.0
+
             # Binance-style
             bids = orderbook.get('bids') or []
             asks = orderbook.get('asks') or []
@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import Any
 
 # Reuse the robust parsers from orderbook.py
-from quantbot.features.orderbook import _iter_levels
+from quantbot.features.orderbook import OB_SOA, OBSnapshot, _detect_schema, _iter_levels, _soa_notionals
 
 
 def orderbook_depth_notional(orderbook: Any, depth: int = 10) -> float:
@@ -12,10 +12,15 @@ def orderbook_depth_notional(orderbook: Any, depth: int = 10) -> float:
     Returns quote-currency notional for both sides combined.
     """
     try:
+        if isinstance(orderbook, OBSnapshot):
+            return float(orderbook.bid_notional + orderbook.ask_notional)
+        schema = _detect_schema(orderbook)
+        if schema == OB_SOA:
+            return float(sum(_soa_notionals(orderbook, depth)))
         tot = 0.0
-        for p, q in _iter_levels(orderbook, side="bid", depth=depth):
+        for p, q in _iter_levels(orderbook, side="bid", depth=depth, schema=schema):
             tot += float(p) * float(q)
-        for p, q in _iter_levels(orderbook, side="ask", depth=depth):
+        for p, q in _iter_levels(orderbook, side="ask", depth=depth, schema=schema):
             tot += float(p) * float(q)
         return float(tot)
     except Exception:
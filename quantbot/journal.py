@@ -1,40 +1,130 @@
 from __future__ import annotations
 
-import json
+import atexit
+import os
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, Iterable
+from typing import Any, Dict, Iterator
 
+from quantbot.utils.fastjson import dumps_line, loads
 from quantbot.utils.time import utc_now
 
 
+# Appends are buffered in memory and written by one background thread, so a call on the
+# trading loop costs an encode + list append instead of open/write/close syscalls.
+_FLUSH_INTERVAL_SEC = 0.1
+_FSYNC_INTERVAL_SEC = 1.0
+_MAX_BUFFER_BYTES = 64 * 1024
+
+
+class BufferedJournalWriter:
+    """Append-only JSONL writer with a long-lived fd and a batched flush."""
+
+    def __init__(self, path: str):
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        self.path = str(p)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._buf = bytearray()
+        self._lock = threading.Lock()      # guards _buf
+        self._io_lock = threading.Lock()   # keeps concurrent flushes writing in order
+        self._last_fsync = time.monotonic()
+
+    def write(self, event: Dict[str, Any]) -> None:
+        line = dumps_line(event)
+        with self._lock:
+            self._buf += line
+            full = len(self._buf) >= _MAX_BUFFER_BYTES
+        if full:
+            _WAKE.set()
+
+    def flush(self, fsync: bool = False) -> None:
+        with self._io_lock:
+            with self._lock:
+                if not self._buf:
+                    data = b""
+                else:
+                    data = bytes(self._buf)
+                    self._buf.clear()
+            view = memoryview(data)
+            while view:
+                n = os.write(self._fd, view)
+                view = view[n:]
+            now = time.monotonic()
+            if data and (fsync or now - self._last_fsync >= _FSYNC_INTERVAL_SEC):
+                os.fsync(self._fd)
+                self._last_fsync = now
+
+
+_WRITERS: dict[str, BufferedJournalWriter] = {}
+_WRITERS_LOCK = threading.Lock()
+_WAKE = threading.Event()
+_FLUSHER: threading.Thread | None = None
+
+
+def _flush_loop() -> None:
+    while True:
+        _WAKE.wait(_FLUSH_INTERVAL_SEC)
+        _WAKE.clear()
+        for w in list(_WRITERS.values()):
+            try:
+                w.flush()
+            except Exception:
+                pass
+
+
+def _get_writer(path: str) -> BufferedJournalWriter:
+    global _FLUSHER
+    w = _WRITERS.get(path)
+    if w is not None:
+        return w
+    with _WRITERS_LOCK:
+        w = _WRITERS.get(path)
+        if w is None:
+            w = BufferedJournalWriter(path)
+            _WRITERS[path] = w
+        if _FLUSHER is None:
+            _FLUSHER = threading.Thread(target=_flush_loop, name="journal-flush", daemon=True)
+            _FLUSHER.start()
+    return w
+
+
+def flush_all() -> None:
+    """Write and fsync everything buffered (call on shutdown; also runs at exit)."""
+    for w in list(_WRITERS.values()):
+        try:
+            w.flush(fsync=True)
+        except Exception:
+            pass
+
+
+atexit.register(flush_all)
+
+
 def append_event(event: Dict[str, Any], path: str = "state/fills.jsonl") -> None:
     """Append a JSONL event.
 
     This is deliberately simple (no DB requirement) so you can compute daily/monthly
     PnL without slowing the trading loop.
     """
-    p = Path(path)
-    p.parent.mkdir(parents=True, exist_ok=True)
+    _get_writer(path).write({"ts": utc_now().isoformat(), **event})
 
-    e = {"ts": utc_now().isoformat(), **event}
-    with p.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(e, ensure_ascii=False) + "\n")
 
-
-def iter_events(path: str = "state/fills.jsonl") -> Iterable[Dict[str, Any]]:
+def iter_events(path: str = "state/fills.jsonl") -> Iterator[Dict[str, Any]]:
+    """Yield events one line at a time (malformed lines are skipped)."""
     p = Path(path)
     if not p.exists():
-        return []
-    out = []
-    for line in p.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            out.append(json.loads(line))
-        except Exception:
-            continue
-    return out
+        return
+    with p.open("rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield loads(line)
+            except Exception:
+                continue
 
 
 def append_equity_snapshot(snapshot: Dict[str, Any], path: str = "state/equity_history.jsonl") -> None:
@@ -42,11 +132,7 @@ def append_equity_snapshot(snapshot: Dict[str, Any], path: str = "state/equity_h
 
     Keep this lightweight: writer can throttle (e.g. once per minute) in the live loop.
     """
-    p = Path(path)
-    p.parent.mkdir(parents=True, exist_ok=True)
-    e = {"ts": utc_now().isoformat(), **snapshot}
-    with p.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(e, ensure_ascii=False) + "\n")
+    _get_writer(path).write({"ts": utc_now().isoformat(), **snapshot})
 
 
 def append_sizing_snapshot(snapshot: Dict[str, Any], path: str = "state/sizing_history.jsonl") -> None:
@@ -55,11 +141,7 @@ def append_sizing_snapshot(snapshot: Dict[str, Any], path: str = "state/sizing_h
     This is a low-overhead debug tape that explains why a trade was sized,
     bumped up to meet minNotional, or skipped.
     """
-    p = Path(path)
-    p.parent.mkdir(parents=True, exist_ok=True)
-    e = {"ts": utc_now().isoformat(), **snapshot}
-    with p.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(e, ensure_ascii=False) + "\n")
+    _get_writer(path).write({"ts": utc_now().isoformat(), **snapshot})
 
 
 def append_cooldown_snapshot(snapshot: Dict[str, Any], path: str = "state/cooldown_history.jsonl") -> None:
@@ -68,8 +150,4 @@ def append_cooldown_snapshot(snapshot: Dict[str, Any], path: str = "state/cooldo
     This helps debug why the bot skipped entries (cooldown active), and what event
     (EXIT fill / ENTRY reject / rate-limit) triggered the cooldown.
     """
-    p = Path(path)
-    p.parent.mkdir(parents=True, exist_ok=True)
-    e = {"ts": utc_now().isoformat(), **snapshot}
-    with p.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(e, ensure_ascii=False) + "\n")
+    _get_writer(path).write({"ts": utc_now().isoformat(), **snapshot})
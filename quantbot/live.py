@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import json
 import math
+import os
 import time
 import inspect
 from collections import deque
@@ -14,13 +15,13 @@ from rich.console import Console
 
 from quantbot.config import get_settings
 from quantbot.utils.time import utc_now
-from quantbot.collectors.upbit_rest import fetch_upbit_candles, fetch_upbit_orderbook
-from quantbot.collectors.binance_rest import fetch_binance_klines, fetch_binance_klines_latest, fetch_binance_orderbook
-from quantbot.collectors.store import upsert_candles, load_candles_df
+from quantbot.collectors.upbit_rest import aclose_client as aclose_upbit_client, fetch_upbit_candles, fetch_upbit_orderbook
+from quantbot.collectors.binance_rest import aclose_clients as aclose_binance_clients, fetch_binance_klines, fetch_binance_klines_latest, fetch_binance_orderbook
+from quantbot.collectors.store import upsert_candles, load_candles_multi
 from quantbot.bar_builder.resampler import resample_ohlcv, RULE_MAP
 from quantbot.features.indicators import add_indicators
-from quantbot.features.orderbook import orderbook_imbalance_score
-from quantbot.strategy.blender import generate_signal, BlenderWeights
+from quantbot.features.orderbook import OB_BOOK_LISTS, OB_UNKNOWN, OB_UPBIT_UNITS, orderbook_imbalance_score, orderbook_parser
+from quantbot.strategy.blender import generate_signal, orderbook_can_decide, BlenderWeights
 from quantbot.strategy.scalping import generate_scalp_signal, ScalpingParams
 from quantbot.streams.pressure import TradePressureBook
 from quantbot.streams.flow import TradeFlowBook
@@ -35,7 +36,7 @@ from quantbot.risk.global_exposure import GlobalExposureStore
 from quantbot.risk.cooldown import CooldownManager
 from quantbot.execution.executor import OrderExecutor
 from quantbot.common.types import OrderRequest, Signal, ExecutionResult
-from quantbot.journal import append_event, append_equity_snapshot, append_sizing_snapshot
+from quantbot.journal import append_event, append_equity_snapshot, append_sizing_snapshot, flush_all as flush_journals
 
 from quantbot.execution.adapters.paper_adapter import PaperAdapter, PaperConfig
 from quantbot.execution.adapters.upbit_adapter import UpbitAdapter
@@ -44,6 +45,8 @@ from quantbot.execution.adapters.binance_futures_adapter import BinanceFuturesAd
 from quantbot.execution.adapters.kis_adapter import KISAdapter
 from quantbot.execution.adapters.namoo_stock_adapter import NamooStockAdapter
 from quantbot.execution.adapters.kiwoom_rest_adapter import KiwoomRestAdapter
+from quantbot.execution.adapters._http import aclose_shared_clients, shared_async_client
+from quantbot.execution.adapters._price_cache import default_price_ttl, put_cached_price
 
 
 console = Console()
@@ -114,6 +117,11 @@ class LiveConfig:
 
     entry_tf: str = "1m"  # blender uses entry_tf; scalp always uses 1m features
     poll_sec: int = 5
+    # symbols processed concurrently per tick (bounds the burst of REST calls)
+    max_concurrent_symbols: int = 8
+    # blender: skip the orderbook fetch for flat symbols that stay HOLD whatever the book says
+    # (their dashboard book/imbalance is empty on those ticks)
+    blender_skip_idle_orderbook: bool = True
 
     # order sizing
     intended_notional: float = 100_000.0  # used when order_sizing_mode='fixed'
@@ -821,14 +829,73 @@ async def _fetch_orderbook(venue: str, symbol: str, adapter: Optional[Any] = Non
     return None
 
 
+def _orderbook_parser(venue: str, adapter: Optional[Any] = None):
+    """Parser for what _fetch_orderbook returns on this venue; bind once, reuse every tick."""
+    if venue == "upbit":
+        return orderbook_parser(OB_UPBIT_UNITS)
+    if venue in {"binance", "binance_futures"}:
+        return orderbook_parser(OB_BOOK_LISTS)
+    parse = getattr(adapter, "parse_orderbook", None)
+    return parse if callable(parse) else orderbook_parser(getattr(adapter, "orderbook_schema", OB_UNKNOWN))
+
+
+# Last add_indicators result per (venue, symbol, tf), tagged with the frame it came from
+# (len + last bar ts/close/volume). Closed bars never change, so until a new bar arrives (for
+# slow TFs, almost always) a tick reuses it; the in-progress bar's close/volume are part of
+# the tag because that bar updates in place. One slot per series, so no eviction is needed.
+_IND_CACHE: dict[tuple[str, str, str], tuple[tuple, Any]] = {}
+
+
+def _cached_indicators(venue: str, symbol: str, tf: str, df: Any) -> Any:
+    if df is None or not len(df):
+        return df
+    try:
+        last = df.iloc[-1]
+        tag = (len(df), df.index[-1], float(last["close"]), float(last["volume"]))
+    except Exception:
+        return add_indicators(df)
+    key = (venue, symbol, tf)
+    hit = _IND_CACHE.get(key)
+    if hit is not None and hit[0] == tag:
+        return hit[1]
+    out = add_indicators(df)
+    _IND_CACHE[key] = (tag, out)
+    return out
+
+
+# Directories already created this process; the bot state is rewritten every tick.
+_ENSURED_DIRS: set[str] = set()
+
+
 def _write_bot_state(cfg: LiveConfig, symbol: str, payload: Dict[str, Any]) -> None:
     d = Path(cfg.state_dir)
-    d.mkdir(parents=True, exist_ok=True)
+    if cfg.state_dir not in _ENSURED_DIRS:
+        d.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(cfg.state_dir)
     bot_id = f"{cfg.venue}_{symbol}".replace("/", "_").replace("-", "_")
     path = d / f"{bot_id}.json"
     path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
+def _load_day_start(path: Path) -> Tuple[Optional[str], Optional[float]]:
+    """(UTC date, equity) baseline for the daily-loss stop, or (None, None)."""
+    try:
+        doc = json.loads(path.read_text(encoding="utf-8"))
+        return str(doc["date"]), float(doc["equity"])
+    except Exception:
+        return None, None
+
+
+def _save_day_start(path: Path, day: str, equity: float) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps({"date": day, "equity": float(equity)}), encoding="utf-8")
+        os.replace(str(tmp), str(path))
+    except Exception:
+        pass
+
+
 def _estimate_fee(venue: str, notional: float) -> float:
     # Strategy uses fee_rate estimate; we reuse that for journaling when raw fee is missing.
     fee_rate = settings.DEFAULT_FEE_BPS / 10000.0
@@ -978,7 +1045,11 @@ def _make_adapter(cfg: LiveConfig):
 
     # live
     if venue == "upbit":
-        return UpbitAdapter(settings.UPBIT_ACCESS_KEY or "", settings.UPBIT_SECRET_KEY or "")
+        return UpbitAdapter(
+            settings.UPBIT_ACCESS_KEY or "",
+            settings.UPBIT_SECRET_KEY or "",
+            client=shared_async_client("https://api.upbit.com", 15),
+        )
     if venue == "binance":
         return BinanceAdapter(settings.BINANCE_API_KEY or "", settings.BINANCE_API_SECRET or "", base_url=settings.BINANCE_BASE_URL)
     if venue == "binance_futures":
@@ -996,13 +1067,18 @@ def _make_adapter(cfg: LiveConfig):
             base_url=settings.KIS_BASE_URL,
         )
     if venue in {"namoo", "namoo_stock"}:
-        return NamooStockAdapter(base_url=settings.NAMOO_BRIDGE_URL, account_no=settings.NAMOO_ACCOUNT_NO)
+        return NamooStockAdapter(
+            base_url=settings.NAMOO_BRIDGE_URL,
+            account_no=settings.NAMOO_ACCOUNT_NO,
+            client=shared_async_client(settings.NAMOO_BRIDGE_URL, 5.0, settings.HTTP_BACKEND),
+        )
     if venue == "kiwoom":
         return KiwoomRestAdapter(
             appkey=settings.KIWOOM_APPKEY or "",
             secretkey=settings.KIWOOM_SECRETKEY or "",
             account_no=settings.KIWOOM_ACCOUNT_NO or "",
             base_url=settings.KIWOOM_BASE_URL,
+            client=shared_async_client(settings.KIWOOM_BASE_URL, 5.0, settings.HTTP_BACKEND),
         )
 
     raise ValueError(f"Unsupported venue: {venue}")
@@ -1024,6 +1100,7 @@ async def run_live(cfg: LiveConfig) -> None:
 
     adapter = _make_adapter(cfg)
     executor = OrderExecutor(adapter)
+    parse_ob = _orderbook_parser(venue, adapter)
 
     tracker = PositionTracker(venue, path=f"state/positions_{venue}.json")
     slip_rate = (cfg.paper_slippage_bps / 10000.0) if cfg.mode == "paper" else (settings.DEFAULT_SLIPPAGE_BPS / 10000.0)
@@ -1100,7 +1177,13 @@ async def run_live(cfg: LiveConfig) -> None:
         stop_liq = asyncio.Event()
         asyncio.create_task(run_binance_futures_liquidation_stream(cfg.symbols, liq_cluster, stop_liq))
 
-    day_start_equity: Optional[float] = None
+    # Daily-loss stop baseline: the first positive equity of each UTC day, persisted so a
+    # restart mid-day keeps the original baseline instead of starting a fresh one.
+    day_start_path = Path("state") / f"day_start_{str(acct_tag).replace('/', '_')}.json"
+    day_start_date, day_start_equity = _load_day_start(day_start_path)
+    # Marks computed this tick are published to the shared price cache so order fills/equity
+    # marks within the TTL don't re-hit the ticker for a price we already have.
+    price_ttl = default_price_ttl()
 
     # UI/debug tapes (in-memory ring buffers)
     event_tape: Dict[str, Any] = {s: deque(maxlen=80) for s in cfg.symbols}
@@ -1115,336 +1198,374 @@ async def run_live(cfg: LiveConfig) -> None:
     console.print(f"[cyan]Running[/cyan] venue={venue} mode={cfg.mode} strategy={cfg.strategy} enabled={trading_enabled}")
 
     try:
-        while True:
-            t0 = time.time()
-            ts = utc_now()
+        # Optional adapter warm-up (e.g. Kiwoom background token refresh).
+        if hasattr(adapter, "start") and callable(getattr(adapter, "start")):
+            try:
+                await adapter.start()  # type: ignore[attr-defined]
+            except Exception as e:
+                console.print(f"[yellow]adapter.start failed[/yellow]: {e}")
 
-            # Snapshot equity/positions (best-effort). Some adapters are stubby; we fall back to tracker.
+        # Seed every symbol's 1m candle cache concurrently so the first tick only needs
+        # incremental fetches; bounded so a long symbol list doesn't burst the REST limits.
+        if venue not in stock_venues:
+            hist_sem = asyncio.Semaphore(4)
+
+            async def _seed_candles(symbol: str) -> None:
+                async with hist_sem:
+                    df = await _fetch_1m_candles(venue, symbol, limit=400)
+                if df is not None and len(df):
+                    candle_cache[symbol] = df
+                    candle_last_fetch_ms[symbol] = int(time.time() * 1000)
+
+            seeded = await asyncio.gather(*(_seed_candles(s) for s in cfg.symbols), return_exceptions=True)
+            for s, r in zip(cfg.symbols, seeded):
+                if isinstance(r, Exception):
+                    console.print(f"[yellow]CANDLE_SEED_FAIL[/yellow] {s} {type(r).__name__}: {r}")
+
+        entry_lock = asyncio.Lock()
+        blend_weights = BlenderWeights()
+
+        async def _tick_equity() -> float:
             try:
-                equity = float(await adapter.get_equity())
+                return float(await adapter.get_equity())
             except Exception:
-                equity = 0.0
-            if day_start_equity is None and equity > 0:
-                day_start_equity = equity
-
-            # equity history log (for dashboard equity curve) - throttle to ~1/min
-            now_ms = int(time.time() * 1000)
-            if equity > 0 and (now_ms - last_equity_log_ms) >= 60_000:
-                last_equity_log_ms = now_ms
+                return 0.0
+
+        async def _tick_prices() -> Dict[str, float]:
+            # Stock venues build bars from the last price: fetch all symbols in one batch call
+            # when the adapter has one, else concurrently. Missing symbols are retried per symbol.
+            if venue not in stock_venues:
+                return {}
+            batch = getattr(adapter, "get_last_prices", None)
+            if callable(batch):
                 try:
-                    append_equity_snapshot({
-                        "ts": ts.isoformat(),
-                        "ts_ms": now_ms,
-                        "venue": venue,
-                        "account_tag": acct_tag,
-                        "mode": cfg.mode,
-                        "strategy": cfg.strategy,
-                        "simulated": bool(cfg.mode != "live"),
-                        "equity": float(equity),
-                    })
+                    return {k: float(v) for k, v in (await batch(list(cfg.symbols))).items()}
                 except Exception:
                     pass
+            # same bound as the per-symbol fan-out: stock REST venues enforce tight per-second limits
+            sem = asyncio.Semaphore(max(1, int(cfg.max_concurrent_symbols or 1)))
 
-            for symbol in cfg.symbols:
-                # Market data
-                candle_fresh = True
-                if venue in stock_venues:
-                    try:
-                        px = float(await adapter.get_last_price(symbol))
-                    except Exception:
-                        px = 0.0
-                    if px > 0 and symbol in bar_builders:
-                        bar_builders[symbol].update(ts, px, 0.0)
-                    df_1m = bar_builders[symbol].dataframe(limit=400) if symbol in bar_builders else None
-                else:
-                    # Use cached candles to reduce REST load and avoid rate limiting.
-                    # If fetching fails (429/network/etc), back off per-symbol and keep trading using
-                    # orderbook/ticker as mark price so exits still work.
-                    cached = candle_cache.get(symbol)
-                    last_fetch = int(candle_last_fetch_ms.get(symbol, 0) or 0)
-                    need_full = (cached is None) or (now_ms - last_fetch > candle_full_refresh_every_ms) or (len(cached) < 60)
-                    candle_fresh = False
-                    backoff_until = int(candle_backoff_until_ms.get(symbol, 0) or 0)
-
-                    if cached is not None and now_ms < backoff_until:
-                        df_1m = cached
-                    else:
-                        df_1m = None
-                        last_err: Exception | None = None
-                        for i in range(3):
-                            try:
-                                if need_full:
-                                    df_1m_new = await _fetch_1m_candles(venue, symbol, limit=400)
-                                    df_1m = df_1m_new
-                                else:
-                                    df_1m_new = await _fetch_1m_candles(venue, symbol, limit=candle_incremental_limit)
-                                    df_1m = _merge_candles(cached, df_1m_new, keep=candle_keep_limit)
-                                last_err = None
-                                break
-                            except Exception as e:
-                                last_err = e
-                                await asyncio.sleep(0.35 * (2 ** i))
-
-                        if last_err is None and df_1m is not None:
-                            candle_cache[symbol] = df_1m
-                            candle_last_fetch_ms[symbol] = now_ms
-                            candle_fail_count[symbol] = 0
-                            candle_backoff_until_ms[symbol] = 0
-                            candle_fresh = True
-                        else:
-                            if last_err is not None:
-                                console.print(f"[red]CANDLE_FETCH_FAIL[/red] {symbol} {type(last_err).__name__}: {last_err}")
-                            df_1m = cached
+            async def _px(sym: str) -> float:
+                async with sem:
+                    return await adapter.get_last_price(sym)
 
-                            # Per-symbol backoff to avoid hammering REST when failing.
-                            fc = int(candle_fail_count.get(symbol, 0) or 0) + 1
-                            candle_fail_count[symbol] = fc
-                            cooldown_ms = int(min(60_000, 2_000 * (2 ** min(fc, 5))))
-                            candle_backoff_until_ms[symbol] = now_ms + cooldown_ms
+            got = await asyncio.gather(*(_px(s) for s in cfg.symbols), return_exceptions=True)
+            return {s: float(px) for s, px in zip(cfg.symbols, got) if not isinstance(px, BaseException)}
 
-                if df_1m is None or len(df_1m) < 60:
-                    continue
-
-                # Persist/reuse for multi-tf strategies
+        async def _process_symbol(symbol: str, ts: Any, equity: float, now_ms: int, px_hint: Optional[float] = None) -> None:
+            # Market data
+            candle_fresh = True
+            if venue in stock_venues:
                 try:
-                    if venue not in stock_venues and hasattr(df_1m, "index"):
-                        upsert_candles(venue, symbol, "1m", df_1m)
+                    px = float(px_hint) if px_hint else float(await adapter.get_last_price(symbol))
                 except Exception:
-                    pass
+                    px = 0.0
+                if px > 0 and symbol in bar_builders:
+                    bar_builders[symbol].update(ts, px, 0.0)
+                df_1m = bar_builders[symbol].dataframe(limit=400) if symbol in bar_builders else None
+            else:
+                # Use cached candles to reduce REST load and avoid rate limiting.
+                # If fetching fails (429/network/etc), back off per-symbol and keep trading using
+                # orderbook/ticker as mark price so exits still work.
+                cached = candle_cache.get(symbol)
+                last_fetch = int(candle_last_fetch_ms.get(symbol, 0) or 0)
+                need_full = (cached is None) or (now_ms - last_fetch > candle_full_refresh_every_ms) or (len(cached) < 60)
+                candle_fresh = False
+                backoff_until = int(candle_backoff_until_ms.get(symbol, 0) or 0)
+
+                if cached is not None and now_ms < backoff_until:
+                    df_1m = cached
+                else:
+                    df_1m = None
+                    last_err: Exception | None = None
+                    for i in range(3):
+                        try:
+                            if need_full:
+                                df_1m_new = await _fetch_1m_candles(venue, symbol, limit=400)
+                                df_1m = df_1m_new
+                            else:
+                                df_1m_new = await _fetch_1m_candles(venue, symbol, limit=candle_incremental_limit)
+                                df_1m = _merge_candles(cached, df_1m_new, keep=candle_keep_limit)
+                            last_err = None
+                            break
+                        except Exception as e:
+                            last_err = e
+                            await asyncio.sleep(0.35 * (2 ** i))
+
+                    if last_err is None and df_1m is not None:
+                        candle_cache[symbol] = df_1m
+                        candle_last_fetch_ms[symbol] = now_ms
+                        candle_fail_count[symbol] = 0
+                        candle_backoff_until_ms[symbol] = 0
+                        candle_fresh = True
+                    else:
+                        if last_err is not None:
+                            console.print(f"[red]CANDLE_FETCH_FAIL[/red] {symbol} {type(last_err).__name__}: {last_err}")
+                        df_1m = cached
 
-                df_1m = add_indicators(df_1m)
-                last_row = df_1m.iloc[-1]
-                candle_close = float(last_row["close"])
+                        # Per-symbol backoff to avoid hammering REST when failing.
+                        fc = int(candle_fail_count.get(symbol, 0) or 0) + 1
+                        candle_fail_count[symbol] = fc
+                        cooldown_ms = int(min(60_000, 2_000 * (2 ** min(fc, 5))))
+                        candle_backoff_until_ms[symbol] = now_ms + cooldown_ms
 
-                # Orderbook
-                ob_raw = await _fetch_orderbook(venue, symbol, adapter)
-                best_bid, best_ask = _best_bid_ask(venue, ob_raw)
-                ob_l2 = _orderbook_l2(venue, ob_raw, depth=10)
+            if df_1m is None or len(df_1m) < 60:
+                return
 
-                # Mark price: prefer orderbook mid (more up-to-date than 1m close).
+            # Persist/reuse for multi-tf strategies (sqlite write off the event loop so
+            # other symbols keep running while this one's rows are stored)
+            try:
+                if venue not in stock_venues and hasattr(df_1m, "index"):
+                    await asyncio.to_thread(upsert_candles, venue, symbol, "1m", df_1m)
+            except Exception:
+                pass
+
+            df_1m = _cached_indicators(venue, symbol, "1m", df_1m)
+            last_row = df_1m.iloc[-1]
+            candle_close = float(last_row["close"])
+
+            # Blender: score flat symbols without the orderbook first; if no orderbook score can
+            # lift the signal off HOLD, this tick doesn't need the book at all.
+            blend_pre: Optional[Signal] = None
+            skip_ob = False
+            if cfg.strategy != "scalp" and tracker.get(symbol).qty == 0:
+                # blender uses daily + entry_tf; load from DB (assumes ingest is running)
+                frames = await asyncio.to_thread(load_candles_multi, venue, symbol, ["1d", cfg.entry_tf], limit_per_tf=1500)
+                df_daily = _cached_indicators(venue, symbol, "1d", frames["1d"])
+                df_entry = _cached_indicators(venue, symbol, cfg.entry_tf, frames[cfg.entry_tf])
+                blend_pre = generate_signal(venue, symbol, ts, df_daily, df_entry, 0.0, 0.0, blend_weights)
+                skip_ob = bool(cfg.blender_skip_idle_orderbook) and blend_pre.side == "HOLD" and not orderbook_can_decide(blend_pre.score, blend_weights)
+
+            # Orderbook
+            ob_raw = None if skip_ob else await _fetch_orderbook(venue, symbol, adapter)
+            best_bid, best_ask = _best_bid_ask(venue, ob_raw)
+            ob_l2 = _orderbook_l2(venue, ob_raw, depth=10)
+
+            # Mark price: prefer orderbook mid (more up-to-date than 1m close).
+            last_price = candle_close
+            try:
+                if best_bid is not None and best_ask is not None and float(best_bid) > 0 and float(best_ask) > 0:
+                    last_price = (float(best_bid) + float(best_ask)) * 0.5
+            except Exception:
                 last_price = candle_close
+
+            # If candles are stale and we couldn't get a usable orderbook mid, try ticker.
+            if (not candle_fresh) and (last_price == candle_close or last_price <= 0):
                 try:
-                    if best_bid is not None and best_ask is not None and float(best_bid) > 0 and float(best_ask) > 0:
-                        last_price = (float(best_bid) + float(best_ask)) * 0.5
+                    px_now = float(await adapter.get_last_price(symbol))
                 except Exception:
-                    last_price = candle_close
-
-                # If candles are stale and we couldn't get a usable orderbook mid, try ticker.
-                if (not candle_fresh) and (last_price == candle_close or last_price <= 0):
-                    try:
-                        px_now = float(await adapter.get_last_price(symbol))
-                    except Exception:
-                        px_now = 0.0
-                    if px_now > 0:
-                        last_price = px_now
-
-                tracker.update_mark(symbol, float(last_price))
-                # Microstructure features
-                ob_imb = orderbook_imbalance_score(ob_raw) if ob_raw is not None else 0.0
-                ob_imb_delta = 0.0
-                ob_delta_snap = None
-                if ob_raw is not None and isinstance(ob_raw, dict) and ("bids" in ob_raw and "asks" in ob_raw):
-                    try:
-                        ob_delta_snap = ob_delta.update(symbol, ob_raw)
-                        ob_imb_delta = float(ob_delta_snap.imbalance_delta)
-                    except Exception:
-                        ob_delta_snap = None
-
-                now_ms = int(time.time() * 1000)
-                ps = pressure.snapshot(symbol)
-                trade_pressure = float(ps.pressure)
-                trade_pressure_notional = float(ps.notional)
-                fs = flow.snapshot(symbol, now_ms)
-                flow_dict = asdict(fs)
-                # If WS trade stream goes stale, strict pressure/flow filters can block all entries.
-                # Fallback: temporarily disable stream-dependent thresholds for this iteration.
-                ws_stale = False
+                    px_now = 0.0
+                if px_now > 0:
+                    last_price = px_now
+            elif last_price > 0:
+                put_cached_price(venue, symbol, float(last_price), price_ttl)
+
+            tracker.update_mark(symbol, float(last_price))
+            # Microstructure features
+            # parse once; the blender path below reuses the same snapshot
+            ob_snap = parse_ob(ob_raw, 10) if ob_raw is not None else None
+            ob_imb = orderbook_imbalance_score(ob_snap) if ob_snap is not None else 0.0
+            ob_imb_delta = 0.0
+            ob_delta_snap = None
+            if ob_raw is not None and isinstance(ob_raw, dict) and ("bids" in ob_raw and "asks" in ob_raw):
                 try:
-                    st = float(getattr(ps, "staleness_sec", 0.0) or 0.0)
-                    ws_stale = bool(cfg.scalp_use_ws_trades) and (st > float(cfg.scalp_ws_staleness_sec or 0))
+                    ob_delta_snap = ob_delta.update(symbol, ob_raw)
+                    ob_imb_delta = float(ob_delta_snap.imbalance_delta)
                 except Exception:
-                    ws_stale = False
+                    ob_delta_snap = None
 
-                # NOTE: params must be defined *before* any fallback logic.
-                # We build params per-iteration (cheap) so hot-reloads of env/preset overrides take effect.
-                params_eff: Optional[ScalpingParams] = None
-                if cfg.strategy == "scalp":
-                    params_base = _mk_scalp_params(cfg)
-                    params_eff = params_base
-                    if ws_stale:
-                        try:
-                            params_eff = ScalpingParams(**asdict(params_base))
-                            params_eff.trade_pressure_threshold = 0.0
-                            params_eff.min_trade_pressure_notional = 0.0
-                            params_eff.min_flow_notional_rate = 0.0
-                            params_eff.min_flow_accel = 0.0
-                            params_eff.min_large_trade_share = 0.0
-                            params_eff.min_trade_count = 0
-                        except Exception:
-                            params_eff = params_base
+            now_ms = int(time.time() * 1000)
+            ps = pressure.snapshot(symbol)
+            trade_pressure = float(ps.pressure)
+            trade_pressure_notional = float(ps.notional)
+            fs = flow.snapshot(symbol, now_ms)
+            flow_dict = asdict(fs)
+            # If WS trade stream goes stale, strict pressure/flow filters can block all entries.
+            # Fallback: temporarily disable stream-dependent thresholds for this iteration.
+            ws_stale = False
+            try:
+                st = float(getattr(ps, "staleness_sec", 0.0) or 0.0)
+                ws_stale = bool(cfg.scalp_use_ws_trades) and (st > float(cfg.scalp_ws_staleness_sec or 0))
+            except Exception:
+                ws_stale = False
+
+            # NOTE: params must be defined *before* any fallback logic.
+            # We build params per-iteration (cheap) so hot-reloads of env/preset overrides take effect.
+            params_eff: Optional[ScalpingParams] = None
+            if cfg.strategy == "scalp":
+                params_base = _mk_scalp_params(cfg)
+                params_eff = params_base
+                if ws_stale:
+                    try:
+                        params_eff = ScalpingParams(**asdict(params_base))
+                        params_eff.trade_pressure_threshold = 0.0
+                        params_eff.min_trade_pressure_notional = 0.0
+                        params_eff.min_flow_notional_rate = 0.0
+                        params_eff.min_flow_accel = 0.0
+                        params_eff.min_large_trade_share = 0.0
+                        params_eff.min_trade_count = 0
+                    except Exception:
+                        params_eff = params_base
+            recent_trades = []
+            try:
+                recent_trades = flow.recent_trades(symbol, limit=60, now_ms=now_ms, max_age_sec=120.0)
+            except Exception:
                 recent_trades = []
+
+            liq_dict = None
+            liq_snap = None
+            if cfg.strategy == "scalp" and cfg.scalp_use_liquidation_stream and venue == "binance_futures":
                 try:
-                    recent_trades = flow.recent_trades(symbol, limit=60, now_ms=now_ms, max_age_sec=120.0)
+                    liq_snap = liq_cluster.snapshot(symbol, now_ms)
+                    liq_dict = asdict(liq_snap)
                 except Exception:
-                    recent_trades = []
+                    liq_dict = None
 
-                liq_dict = None
-                liq_snap = None
-                if cfg.strategy == "scalp" and cfg.scalp_use_liquidation_stream and venue == "binance_futures":
-                    try:
-                        liq_snap = liq_cluster.snapshot(symbol, now_ms)
-                        liq_dict = asdict(liq_snap)
-                    except Exception:
-                        liq_dict = None
-
-                # Exit check (uses tracker + last price)
-                decision = exit_mgr.check(symbol, last_price)
-                pos = tracker.get(symbol)
-
-                if decision.should_exit and pos.qty != 0:
-                    close_side = "SELL" if pos.qty > 0 else "BUY"
-                    close_qty = abs(pos.qty)
-
-                    use_ioc = bool(cfg.exit_use_ioc and _venue_supports_ioc(venue) and best_bid and best_ask)
-
-                    meta = {}
-                    if venue == "binance_futures":
-                        meta["reduceOnly"] = True
-                        # For Hedge Mode accounts, Binance requires positionSide=LONG/SHORT even for reduceOnly exits.
-                        # Adapter will omit/adjust this hint automatically if account is One-way.
-                        meta["positionSide"] = "LONG" if pos.qty > 0 else "SHORT"
-
-                    res = None
-                    if trading_enabled:
-                        if use_ioc:
-                            prices = _ioc_price_ladder(
-                                side=close_side,
-                                best_bid=best_bid,
-                                best_ask=best_ask,
-                                pad_bps=cfg.ioc_price_pad_bps,
-                                max_chase_bps=cfg.ioc_max_chase_bps,
-                                hint_price=None,
-                            )
-                        else:
-                            prices = []
-
-                        if use_ioc and prices:
-                            req = OrderRequest(
-                                venue=venue,
-                                symbol=symbol,
-                                side=close_side,
-                                qty=close_qty,
-                                order_type="LIMIT",
-                                price=float(prices[0]),
-                                meta=meta,
-                            )
-                            res = await executor.execute_ioc_limit_prices_then_market(req, prices, fallback_market=True)
-                        else:
-                            req = OrderRequest(
-                                venue=venue,
-                                symbol=symbol,
-                                side=close_side,
-                                qty=close_qty,
-                                order_type="MARKET",
-                                price=None,
-                                meta=meta,
-                            )
-                            res = await executor.execute(req)
-
-                    if _exec_success(res):
-                        # fee estimate if raw missing
-                        filled_qty = float(res.update.filled_qty)
-                        fill_px = float(res.update.avg_fill_price or last_price)
-                        notional = filled_qty * fill_px
-                        fee = float(res.update.fee or _estimate_fee(venue, notional))
-                        realized = tracker.apply_fill(symbol, close_side, filled_qty, fill_px, fee=fee)
-                        append_event(
-                            {
-                                "ts": ts.isoformat(),
-                                "venue": venue,
-                                "account_tag": acct_tag,
-                                "mode": cfg.mode,
-                                "simulated": bool(cfg.mode != "live"),
-                                "symbol": symbol,
-                                "side": close_side,
-                                "qty": filled_qty,
-                                "price": fill_px,
-                                "fee": fee,
-                                "order_id": str(res.update.order_id or ""),
-                                "client_order_id": str(res.update.client_order_id or ""),
-                                "order_status": str(res.update.status or ""),
-                                "reason": decision.reason,
-                                "realized_gross_delta": realized.get("realized_pnl_delta", 0.0),
-                                "realized_net_delta": realized.get("realized_pnl_net_delta", 0.0),
-                            }
-                        )
-                        try:
-                            event_tape[symbol].append({"ts": ts.isoformat(), "type": "EXIT", "side": close_side, "qty": filled_qty, "price": fill_px, "fee": fee, "reason": decision.reason})
-                        except Exception:
-                            pass
+            # Exit check (uses tracker + last price)
+            decision = exit_mgr.check(symbol, last_price)
+            pos = tracker.get(symbol)
 
-                        # Prevent immediate re-entry flip-flop after closing.
-                        try:
-                            cooldown.on_exit_filled(symbol, now_ms=now_ms)
-                        except Exception:
-                            pass
+            if decision.should_exit and pos.qty != 0:
+                close_side = "SELL" if pos.qty > 0 else "BUY"
+                close_qty = abs(pos.qty)
+
+                use_ioc = bool(cfg.exit_use_ioc and _venue_supports_ioc(venue) and best_bid and best_ask)
 
-                    if res is None:
-                        console.print(f"[yellow]EXIT[/yellow] {symbol} {decision.reason} DRYRUN")
+                meta = {}
+                if venue == "binance_futures":
+                    meta["reduceOnly"] = True
+                    # For Hedge Mode accounts, Binance requires positionSide=LONG/SHORT even for reduceOnly exits.
+                    # Adapter will omit/adjust this hint automatically if account is One-way.
+                    meta["positionSide"] = "LONG" if pos.qty > 0 else "SHORT"
+
+                res = None
+                if trading_enabled:
+                    if use_ioc:
+                        prices = _ioc_price_ladder(
+                            side=close_side,
+                            best_bid=best_bid,
+                            best_ask=best_ask,
+                            pad_bps=cfg.ioc_price_pad_bps,
+                            max_chase_bps=cfg.ioc_max_chase_bps,
+                            hint_price=None,
+                        )
                     else:
-                        console.print(f"[yellow]EXIT[/yellow] {symbol} {decision.reason} {res.update.status} filled={res.update.filled_qty}")
-
-                # Entry logic
-                if pos.qty == 0:
-                    sig: Optional[Signal] = None
-                    if cfg.strategy == "scalp":
-                        params = _mk_scalp_params(cfg)
-                        sig = generate_scalp_signal(
+                        prices = []
+
+                    if use_ioc and prices:
+                        req = OrderRequest(
                             venue=venue,
                             symbol=symbol,
-                            last_price=last_price,
-                            df_1m=df_1m,
-                            orderbook=ob_raw,
-                            orderbook_imbalance=float(ob_imb),
-                            orderbook_imbalance_delta=float(ob_imb_delta),
-                            trade_pressure=float(trade_pressure),
-                            trade_pressure_notional=float(trade_pressure_notional),
-                            params=params_eff,
-                            in_position=False,
-                            flow=flow_dict,
-                            liq=liq_dict,
+                            side=close_side,
+                            qty=close_qty,
+                            order_type="LIMIT",
+                            price=float(prices[0]),
+                            meta=meta,
                         )
-                        try:
-                            last_signal[symbol] = {"ts": ts.isoformat(), "side": sig.side, "score": float(sig.score), "meta": sig.meta}
-                        except Exception:
-                            last_signal[symbol] = {}
+                        res = await executor.execute_ioc_limit_prices_then_market(req, prices, fallback_market=True)
                     else:
-                        # blender uses daily + entry_tf; load from DB (assumes ingest is running)
-                        df_daily = load_candles_df(venue, symbol, "1d", limit=1500)
-                        df_entry = load_candles_df(venue, symbol, cfg.entry_tf, limit=1500)
-                        df_daily = add_indicators(df_daily) if len(df_daily) else df_daily
-                        df_entry = add_indicators(df_entry) if len(df_entry) else df_entry
-                        ob_score = orderbook_imbalance_score(ob_raw) if ob_raw is not None else 0.0
-                        sig = generate_signal(venue, symbol, ts, df_daily, df_entry, 0.0, ob_score, BlenderWeights())
-
-                    # Spot/stock venues: do not open shorts by default (shorting requires margin/borrow).
-                    if sig is not None and sig.side == "SELL" and venue not in {"binance_futures"}:
-                        console.print(f"[dim]SKIP[/dim] {symbol} short entry not supported on venue={venue}")
-                        sig = None
-
-                    if sig is not None and sig.side in {"BUY", "SELL"}:
+                        req = OrderRequest(
+                            venue=venue,
+                            symbol=symbol,
+                            side=close_side,
+                            qty=close_qty,
+                            order_type="MARKET",
+                            price=None,
+                            meta=meta,
+                        )
+                        res = await executor.execute(req)
+
+                if _exec_success(res):
+                    # fee estimate if raw missing
+                    filled_qty = float(res.update.filled_qty)
+                    fill_px = float(res.update.avg_fill_price or last_price)
+                    notional = filled_qty * fill_px
+                    fee = float(res.update.fee or _estimate_fee(venue, notional))
+                    realized = tracker.apply_fill(symbol, close_side, filled_qty, fill_px, fee=fee)
+                    append_event(
+                        {
+                            "ts": ts.isoformat(),
+                            "venue": venue,
+                            "account_tag": acct_tag,
+                            "mode": cfg.mode,
+                            "simulated": bool(cfg.mode != "live"),
+                            "symbol": symbol,
+                            "side": close_side,
+                            "qty": filled_qty,
+                            "price": fill_px,
+                            "fee": fee,
+                            "order_id": str(res.update.order_id or ""),
+                            "client_order_id": str(res.update.client_order_id or ""),
+                            "order_status": str(res.update.status or ""),
+                            "reason": decision.reason,
+                            "realized_gross_delta": realized.get("realized_pnl_delta", 0.0),
+                            "realized_net_delta": realized.get("realized_pnl_net_delta", 0.0),
+                        }
+                    )
+                    try:
+                        event_tape[symbol].append({"ts": ts.isoformat(), "type": "EXIT", "side": close_side, "qty": filled_qty, "price": fill_px, "fee": fee, "reason": decision.reason})
+                    except Exception:
+                        pass
+
+                    # Prevent immediate re-entry flip-flop after closing.
+                    try:
+                        cooldown.on_exit_filled(symbol, now_ms=now_ms)
+                    except Exception:
+                        pass
+
+                if res is None:
+                    console.print(f"[yellow]EXIT[/yellow] {symbol} {decision.reason} DRYRUN")
+                else:
+                    console.print(f"[yellow]EXIT[/yellow] {symbol} {decision.reason} {res.update.status} filled={res.update.filled_qty}")
+
+            # Entry logic
+            if pos.qty == 0:
+                sig: Optional[Signal] = None
+                if cfg.strategy == "scalp":
+                    params = _mk_scalp_params(cfg)
+                    sig = generate_scalp_signal(
+                        venue=venue,
+                        symbol=symbol,
+                        last_price=last_price,
+                        df_1m=df_1m,
+                        orderbook=ob_raw,
+                        orderbook_imbalance=float(ob_imb),
+                        orderbook_imbalance_delta=float(ob_imb_delta),
+                        trade_pressure=float(trade_pressure),
+                        trade_pressure_notional=float(trade_pressure_notional),
+                        params=params_eff,
+                        in_position=False,
+                        flow=flow_dict,
+                        liq=liq_dict,
+                    )
+                    try:
+                        last_signal[symbol] = {"ts": ts.isoformat(), "side": sig.side, "score": float(sig.score), "meta": sig.meta}
+                    except Exception:
+                        last_signal[symbol] = {}
+                elif blend_pre is not None:
+                    # same imbalance as ob_imb (parsed once above); unchanged side when the book was skipped
+                    sig = blend_pre if skip_ob else generate_signal(venue, symbol, ts, df_daily, df_entry, 0.0, ob_imb, blend_weights)
+
+                # Spot/stock venues: do not open shorts by default (shorting requires margin/borrow).
+                if sig is not None and sig.side == "SELL" and venue not in {"binance_futures"}:
+                    console.print(f"[dim]SKIP[/dim] {symbol} short entry not supported on venue={venue}")
+                    sig = None
+
+                if sig is not None and sig.side in {"BUY", "SELL"}:
+                    # sizing/risk read positions other symbols may be filling: one entry at a time
+                    async with entry_lock:
                         # Per-symbol disable gate (manual-fix situations)
                         dis_until = int(entry_disabled_until_ms.get(symbol, 0) or 0)
                         if dis_until and now_ms < dis_until:
                             left = max(0.0, (dis_until - now_ms) / 1000.0)
                             console.print(f"[dim]SKIP[/dim] {symbol} entry disabled for {left:.0f}s")
-                            continue
+                            return
 
                         # Cooldown gate (entries only)
                         allow_entry, cd_reason = cooldown.allow_entry(symbol, now_ms)
                         if not allow_entry:
                             console.print(f"[dim]SKIP[/dim] {symbol} {cd_reason}")
-                            continue
+                            return
 
                         # Sizing (compute intended notional and adjust qty to exchange rules)
                         intended_notional = _compute_intended_notional(
@@ -1469,7 +1590,7 @@ async def run_live(cfg: LiveConfig) -> None:
                         )
                         if skip_reason:
                             console.print(f"[dim]SKIP[/dim] {symbol} sizing: {skip_reason}")
-                            continue
+                            return
                         intended_notional = float(intended_notional_adj)
 
                         # Risk
@@ -1690,67 +1811,117 @@ async def run_live(cfg: LiveConfig) -> None:
                             else:
                                 console.print(f"[green]ENTRY[/green] {symbol} {sig.side} score={sig.score:.2f} {res.update.status} filled={res.update.filled_qty}")
 
-                # UI state dump (cheap)
-                p = tracker.get(symbol)
+            # UI state dump (cheap)
+            p = tracker.get(symbol)
+            unrealized = 0.0
+            try:
+                if p.qty > 0:
+                    unrealized = (float(last_price) - float(p.avg_cost)) * float(p.qty)
+                elif p.qty < 0:
+                    unrealized = (float(p.avg_cost) - float(last_price)) * abs(float(p.qty))
+            except Exception:
                 unrealized = 0.0
+
+            pos_notional = abs(float(p.qty) * float(last_price)) if last_price else 0.0
+            pnl_total = float(getattr(p, "realized_pnl_net", 0.0) or 0.0) + float(unrealized)
+            pnl_pct = (pnl_total / float(equity)) if equity and equity > 0 else 0.0
+
+            # Update shared exposure state (best-effort). This lets RiskManager gate new entries
+            # across multiple bot processes.
+            if global_store is not None:
                 try:
-                    if p.qty > 0:
-                        unrealized = (float(last_price) - float(p.avg_cost)) * float(p.qty)
-                    elif p.qty < 0:
-                        unrealized = (float(p.avg_cost) - float(last_price)) * abs(float(p.qty))
+                    global_store.update(
+                        key=f"{acct_tag}:{venue}:{symbol}",
+                        account_tag=acct_tag,
+                        equity=float(equity or 0.0),
+                        abs_notional=float(pos_notional),
+                    )
                 except Exception:
-                    unrealized = 0.0
+                    pass
 
-                pos_notional = abs(float(p.qty) * float(last_price)) if last_price else 0.0
-                pnl_total = float(getattr(p, "realized_pnl_net", 0.0) or 0.0) + float(unrealized)
-                pnl_pct = (pnl_total / float(equity)) if equity and equity > 0 else 0.0
+            state_payload = {
+                "ts": ts.isoformat(),
+                "venue": venue,
+                "account_tag": acct_tag,
+                "symbol": symbol,
+                "mode": cfg.mode,
+                "strategy": cfg.strategy,
+                "equity": float(equity or 0.0),
+                "day_start_equity": float(day_start_equity or equity or 0.0),
+                "last_price": last_price,
+                "best_bid": best_bid,
+                "best_ask": best_ask,
+                "position": {**asdict(p), "unrealized_pnl": float(unrealized), "notional": float(pos_notional), "pnl_total": float(pnl_total), "pnl_pct": float(pnl_pct)},
+                "pressure": asdict(ps) if ps else None,
+                "flow": flow_dict,
+                "liq": liq_dict,
+                "ob": {
+                    "imbalance": float(ob_imb),
+                    "imbalance_delta": float(ob_imb_delta),
+                },
+                "orderbook_l2": ob_l2,
+                "trades": recent_trades,
+                "events": list(event_tape.get(symbol) or []),
+                "last_signal": last_signal.get(symbol) or {},
+                "cooldown": cooldown.snapshot(symbol, now_ms=now_ms),
+                "candles_1m": _candles_for_ui(df_1m, limit=240),
+            }
+            _write_bot_state(cfg, symbol, state_payload)
 
-                # Update shared exposure state (best-effort). This lets RiskManager gate new entries
-                # across multiple bot processes.
-                if global_store is not None:
-                    try:
-                        global_store.update(
-                            key=f"{acct_tag}:{venue}:{symbol}",
-                            account_tag=acct_tag,
-                            equity=float(equity or 0.0),
-                            abs_notional=float(pos_notional),
-                        )
-                    except Exception:
-                        pass
+        # Ticks run on a fixed monotonic schedule (t, t+poll, t+2*poll, ...) so work time
+        # doesn't accumulate into the period; after an overrun the schedule restarts from now.
+        period = max(0.0, float(cfg.poll_sec))
+        next_t = time.monotonic()
+        while True:
+            ts = utc_now()
 
-                state_payload = {
-                    "ts": ts.isoformat(),
-                    "venue": venue,
-                    "account_tag": acct_tag,
-                    "symbol": symbol,
-                    "mode": cfg.mode,
-                    "strategy": cfg.strategy,
-                    "equity": float(equity or 0.0),
-                    "day_start_equity": float(day_start_equity or equity or 0.0),
-                    "last_price": last_price,
-                    "best_bid": best_bid,
-                    "best_ask": best_ask,
-                    "position": {**asdict(p), "unrealized_pnl": float(unrealized), "notional": float(pos_notional), "pnl_total": float(pnl_total), "pnl_pct": float(pnl_pct)},
-                    "pressure": asdict(ps) if ps else None,
-                    "flow": flow_dict,
-                    "liq": liq_dict,
-                    "ob": {
-                        "imbalance": float(ob_imb),
-                        "imbalance_delta": float(ob_imb_delta),
-                    },
-                    "orderbook_l2": ob_l2,
-                    "trades": recent_trades,
-                    "events": list(event_tape.get(symbol) or []),
-                    "last_signal": last_signal.get(symbol) or {},
-                    "cooldown": cooldown.snapshot(symbol, now_ms=now_ms),
-                    "candles_1m": _candles_for_ui(df_1m, limit=240),
-                }
-                _write_bot_state(cfg, symbol, state_payload)
-
-            # Sleep with drift correction
-            dt = time.time() - t0
-            sleep_for = max(0.0, float(cfg.poll_sec) - dt)
-            await asyncio.sleep(sleep_for)
+            # Snapshot equity/positions (best-effort). Some adapters are stubby; we fall back to tracker.
+            # One account snapshot (and, for stocks, one price sweep) per tick, fetched together and
+            # shared by every symbol below.
+            equity, tick_prices = await asyncio.gather(_tick_equity(), _tick_prices())
+            today = ts.date().isoformat()
+            if equity > 0 and day_start_date != today:
+                day_start_date, day_start_equity = today, equity
+                _save_day_start(day_start_path, today, equity)
+
+            # equity history log (for dashboard equity curve) - throttle to ~1/min
+            now_ms = int(time.time() * 1000)
+            if equity > 0 and (now_ms - last_equity_log_ms) >= 60_000:
+                last_equity_log_ms = now_ms
+                try:
+                    append_equity_snapshot({
+                        "ts": ts.isoformat(),
+                        "ts_ms": now_ms,
+                        "venue": venue,
+                        "account_tag": acct_tag,
+                        "mode": cfg.mode,
+                        "strategy": cfg.strategy,
+                        "simulated": bool(cfg.mode != "live"),
+                        "equity": float(equity),
+                    })
+                except Exception:
+                    pass
+
+            # Symbols are independent: overlap their REST/DB waits instead of walking them one by one.
+            sem = asyncio.Semaphore(max(1, int(cfg.max_concurrent_symbols or 1)))
+
+            async def _bounded(symbol: str) -> None:
+                async with sem:
+                    await _process_symbol(symbol, ts, equity, now_ms, tick_prices.get(symbol))
+
+            results = await asyncio.gather(*(_bounded(s) for s in cfg.symbols), return_exceptions=True)
+            for r in results:
+                if isinstance(r, BaseException):
+                    raise r
+
+            # Sleep until the next scheduled tick
+            next_t += period
+            delay = next_t - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                next_t = time.monotonic()
+                await asyncio.sleep(0)
 
     finally:
         if stop_ws is not None:
@@ -1758,7 +1929,14 @@ async def run_live(cfg: LiveConfig) -> None:
         if stop_liq is not None:
             stop_liq.set()
         try:
-            if hasattr(adapter, "close"):
-                await adapter.close()  # type: ignore[attr-defined]
+            # flushes persisted orders, then closes the adapter's client
+            await executor.close()
         except Exception:
             pass
+        await aclose_shared_clients()
+        for aclose in (aclose_upbit_client, aclose_binance_clients):
+            try:
+                await aclose()
+            except Exception:
+                pass
+        flush_journals()
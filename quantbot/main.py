@@ -32,18 +32,20 @@ def _print_signal(sig):
     console.print(t)
     console.print(sig.meta)
 
+def _resample_and_store_all(venue: str, symbol: str, df_1m) -> None:
+    upsert_candles(venue, symbol, "1m", df_1m)
+    for tf in ["5m","10m","15m","240m","1d","1w","1M"]:
+        df_tf = resample_ohlcv(df_1m, RULE_MAP[tf])
+        upsert_candles(venue, symbol, tf, df_tf)
+
 async def run_demo():
     venue = "demo"
     symbol = DEFAULT_SYMBOLS[0]
 
     # 1) Generate demo 1m candles and persist
+    # 2) Resample to required TFs and persist (CPU/sqlite work, kept off the event loop)
     df_1m = generate_1m_series(symbol, minutes=60*24*30)
-    upsert_candles(venue, symbol, "1m", df_1m)
-
-    # 2) Resample to required TFs and persist
-    for tf in ["5m","10m","15m","240m","1d","1w","1M"]:
-        df_tf = resample_ohlcv(df_1m, RULE_MAP[tf])
-        upsert_candles(venue, symbol, tf, df_tf)
+    await asyncio.to_thread(_resample_and_store_all, venue, symbol, df_1m)
     # 3) Load daily + 15m for analysis
     df_d = load_candles_df(venue, symbol, "1d", limit=2500)
     df_15 = load_candles_df(venue, symbol, "15m", limit=2500)
@@ -130,7 +132,8 @@ async def run_demo():
     if ok and sig.side == "BUY":
         qty = intended_notional / prices[symbol]
         res = await executor.execute_from_signal(sig, qty=qty, order_type="MARKET")
-        console.print(f"[green]Executed[/green]: {res.ok} {res.reason} {res.meta}")
+        u = res.update
+        console.print(f"[green]Executed[/green]: {u.status} filled={u.filled_qty} avg={u.avg_fill_price} id={u.order_id}")
 
 def main():
     parser = argparse.ArgumentParser()
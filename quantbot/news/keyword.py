@@ -1,23 +1,31 @@
 from __future__ import annotations
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
 from typing import List, Tuple
 
 @dataclass
 class KeywordScorer:
     positive: List[str]
     negative: List[str]
+    # (keyword, hit label, weight) for both lists in scoring order, plus one alternation over
+    # all of them: most texts hit no keyword at all and are rejected in a single regex scan.
+    _terms: List[Tuple[str, str, float]] = field(init=False, repr=False, compare=False)
+    _any: re.Pattern[str] | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._terms = [(k, f"+{k}", 1.0) for k in self.positive if k]
+        self._terms += [(k, f"-{k}", -2.0) for k in self.negative if k]
+        words = {k for k, _, _ in self._terms}
+        self._any = re.compile("|".join(map(re.escape, words))) if words else None
 
     def score(self, text: str) -> Tuple[float, List[str]]:
         t = (text or "").strip()
         hits = []
         score = 0.0
-        for k in self.positive:
-            if k and k in t:
-                hits.append(f"+{k}")
-                score += 1.0
-        for k in self.negative:
-            if k and k in t:
-                hits.append(f"-{k}")
-                score -= 2.0
+        if self._any is None or self._any.search(t) is None:
+            return score, hits
+        for k, label, w in self._terms:
+            if k in t:
+                hits.append(label)
+                score += w
         return score, hits
-
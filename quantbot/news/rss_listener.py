@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import time
+from typing import AsyncIterator
+
 import feedparser
 from quantbot.common.types import NewsItem
 from quantbot.news.keyword import KeywordScorer
 from quantbot.utils.time import utc_now
 
+log = logging.getLogger(__name__)
+
 class RSSNewsListener:
     def __init__(self, feeds: list[str], scorer: KeywordScorer, poll_sec: int = 30):
         self.feeds = feeds
@@ -16,20 +22,24 @@ class RSSNewsListener:
     def poll_once(self) -> list[NewsItem]:
         items: list[NewsItem] = []
         for url in self.feeds:
-            d = feedparser.parse(url)
-            for e in d.entries:
-                uid = getattr(e, "id", None) or getattr(e, "link", None) or getattr(e, "title", "")
-                if not uid or uid in self._seen:
-                    continue
-                self._seen.add(uid)
-                title = getattr(e, "title", "")
-                summary = getattr(e, "summary", "") if hasattr(e, "summary") else ""
-                text = f"{title} {summary}"
-                s, hits = self.scorer.score(text)
-                items.append(NewsItem(
-                    ts=utc_now(), source="rss", title=title[:500], body=summary[:3500],
-                    url=getattr(e, "link", ""), score=s, hits=hits
-                ))
+            items.extend(self._new_items(feedparser.parse(url)))
+        return items
+
+    def _new_items(self, d) -> list[NewsItem]:
+        items: list[NewsItem] = []
+        for e in d.entries:
+            uid = getattr(e, "id", None) or getattr(e, "link", None) or getattr(e, "title", "")
+            if not uid or uid in self._seen:
+                continue
+            self._seen.add(uid)
+            title = getattr(e, "title", "")
+            summary = getattr(e, "summary", "") if hasattr(e, "summary") else ""
+            text = f"{title} {summary}"
+            s, hits = self.scorer.score(text)
+            items.append(NewsItem(
+                ts=utc_now(), source="rss", title=title[:500], body=summary[:3500],
+                url=getattr(e, "link", ""), score=s, hits=hits
+            ))
         return items
 
     def loop(self):
@@ -37,3 +47,30 @@ class RSSNewsListener:
             for it in self.poll_once():
                 yield it
             time.sleep(self.poll_sec)
+
+    async def stream(self) -> AsyncIterator[NewsItem]:
+        """Async counterpart of loop(): feeds are fetched/parsed concurrently in worker threads
+        and each feed's new items are yielded as soon as that feed is done, so a slow feed
+        doesn't hold back the others and the event loop is never blocked."""
+        while True:
+            pending = [asyncio.ensure_future(asyncio.to_thread(feedparser.parse, url)) for url in self.feeds]
+            try:
+                for fut in asyncio.as_completed(pending):
+                    try:
+                        d = await fut
+                    except Exception as e:
+                        log.warning("rss feed fetch failed: %s", e)
+                        continue
+                    for it in self._new_items(d):
+                        yield it
+            finally:
+                # consumer may stop mid-round (break/aclose): don't leave worker results unretrieved
+                rest = [f for f in pending if not f.done()]
+                for f in rest:
+                    f.cancel()
+                if rest:
+                    await asyncio.gather(*rest, return_exceptions=True)
+                for f in pending:
+                    if f.done() and not f.cancelled():
+                        f.exception()
+            await asyncio.sleep(self.poll_sec)
@@ -15,8 +15,13 @@ def _safe_read_json(path: Path) -> Dict[str, Any]:
         return {}
 
 
+_ENSURED_DIRS: set[Path] = set()
+
+
 def _atomic_write_json(path: Path, data: Dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.parent not in _ENSURED_DIRS:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(path.parent)
     tmp = path.with_suffix(path.suffix + ".tmp")
     tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
     os.replace(str(tmp), str(path))
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import json
 from dataclasses import dataclass, asdict
 from pathlib import Path
@@ -24,6 +25,18 @@ class PositionInfo:
     updated_at: str | None = None
 
 
+# Binance quote assets, longest first so suffix matching prefers the longer quote.
+# Also used by risk_manager and the paper adapter.
+_BINANCE_QUOTES_SORTED: tuple[str, ...] = tuple(
+    sorted(
+        ["USDT", "USDC", "BUSD", "FDUSD", "TUSD", "BTC", "ETH", "BNB", "TRY", "EUR", "GBP", "BRL", "AUD", "KRW", "JPY"],
+        key=len,
+        reverse=True,
+    )
+)
+
+
+@functools.lru_cache(maxsize=4096)
 def _parse_symbol_base_quote(venue: str, symbol: str) -> tuple[str, str]:
     if venue == "upbit":
         if "-" in symbol:
@@ -32,24 +45,7 @@ def _parse_symbol_base_quote(venue: str, symbol: str) -> tuple[str, str]:
         return symbol, "KRW"
 
     if venue in {"binance", "binance_futures"}:
-        quotes = [
-            "USDT",
-            "USDC",
-            "BUSD",
-            "FDUSD",
-            "TUSD",
-            "BTC",
-            "ETH",
-            "BNB",
-            "TRY",
-            "EUR",
-            "GBP",
-            "BRL",
-            "AUD",
-            "KRW",
-            "JPY",
-        ]
-        for q in sorted(quotes, key=len, reverse=True):
+        for q in _BINANCE_QUOTES_SORTED:
             if symbol.endswith(q) and len(symbol) > len(q):
                 return symbol[: -len(q)], q
         return symbol, ""
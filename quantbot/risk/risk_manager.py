@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 from typing import Dict, Any, Optional
 from quantbot.config import get_settings
 from quantbot.common.types import Signal
 from quantbot.risk.global_exposure import GlobalExposureStore
+from quantbot.risk.position_tracker import _BINANCE_QUOTES_SORTED
 
 settings = get_settings()
 
+@functools.lru_cache(maxsize=4096)
 def _parse_symbol_base_quote(venue: str, symbol: str) -> tuple[str, str]:
     if venue == "upbit":
         if "-" in symbol:
@@ -15,8 +18,7 @@ def _parse_symbol_base_quote(venue: str, symbol: str) -> tuple[str, str]:
             return b, q
         return symbol, "KRW"
     if venue == "binance":
-        quotes = ["USDT","USDC","BUSD","FDUSD","TUSD","BTC","ETH","BNB","TRY","EUR","GBP","BRL","AUD","KRW","JPY"]
-        for q in sorted(quotes, key=len, reverse=True):
+        for q in _BINANCE_QUOTES_SORTED:
             if symbol.endswith(q) and len(symbol) > len(q):
                 return symbol[:-len(q)], q
         return symbol, ""
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+"""Buffered writer for the `orders` table.
+
+Order placement must not wait on the database: rows are queued in memory and a
+background task bulk-inserts them every `flush_interval_sec` (or as soon as
+`max_batch` rows are waiting), one INSERT + COMMIT per batch. Rows are keyed on
+`client_order_id`: a later update for an order that is already stored (e.g. a fill
+confirmation) overwrites it instead of tripping the unique constraint.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any
+
+from sqlalchemy import insert
+
+from quantbot.common.types import OrderRequest, OrderUpdate
+from quantbot.storage.db import get_session
+from quantbot.storage.models import OrderModel
+
+
+def _order_row(req: OrderRequest, upd: OrderUpdate) -> dict[str, Any] | None:
+    key = upd.client_order_id or req.client_order_id or upd.order_id
+    if not key:
+        return None  # nothing to identify the order by (e.g. a local reject)
+    return {
+        "venue": str(req.venue),
+        "symbol": req.symbol,
+        "client_order_id": str(key),
+        "order_id": str(upd.order_id or ""),
+        "side": req.side,
+        "order_type": req.order_type,
+        "qty": float(req.qty),
+        "price": req.price,
+        "status": str(upd.status),
+        "filled_qty": float(upd.filled_qty or 0.0),
+        "avg_fill_price": upd.avg_fill_price,
+        "fee": upd.fee,
+        "ts": upd.ts,
+        "raw": upd.raw or {},
+    }
+
+
+def _upsert_stmt(dialect: str):
+    """INSERT ... ON CONFLICT (client_order_id) DO UPDATE where the dialect has it, else a plain INSERT."""
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return insert(OrderModel)
+    stmt = dialect_insert(OrderModel)
+    cols = [c.name for c in OrderModel.__table__.columns if c.name not in ("id", "client_order_id")]
+    return stmt.on_conflict_do_update(
+        index_elements=["client_order_id"],
+        set_={c: stmt.excluded[c] for c in cols},
+    )
+
+
+def _insert_rows(rows: list[dict[str, Any]]) -> None:
+    # Last update per order wins; one statement may not touch the same key twice.
+    rows = list({r["client_order_id"]: r for r in rows}.values())
+    with get_session() as s:
+        stmt = _upsert_stmt(s.get_bind().dialect.name)
+        try:
+            s.execute(stmt, rows)
+            s.commit()
+            return
+        except Exception:
+            s.rollback()
+        # One bad row must not drop the whole batch.
+        for row in rows:
+            try:
+                s.execute(stmt, [row])
+                s.commit()
+            except Exception:
+                s.rollback()
+
+
+class OrderPersister:
+    def __init__(self, *, flush_interval_sec: float = 0.25, max_batch: int = 64):
+        self.flush_interval_sec = float(flush_interval_sec)
+        self.max_batch = int(max_batch)
+        self._rows: deque[dict[str, Any]] = deque()
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def enqueue(self, req: OrderRequest, upd: OrderUpdate) -> None:
+        row = _order_row(req, upd)
+        if row is None:
+            return
+        self._rows.append(row)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        if len(self._rows) >= self.max_batch:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval_sec)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception:
+                pass
+
+    async def flush(self) -> None:
+        rows = list(self._rows)
+        if not rows:
+            return
+        self._rows.clear()
+        await asyncio.to_thread(_insert_rows, rows)
+
+    async def close(self) -> None:
+        """Stop the background task and write whatever is still queued."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        await self.flush()
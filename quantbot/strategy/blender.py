@@ -68,6 +68,19 @@ def _fib_score(df_d: pd.DataFrame) -> float:
         return 1.0
     return 0.0
 
+def _side(score: float, w: BlenderWeights) -> str:
+    if score >= w.threshold_buy:
+        return "BUY"
+    if score <= -w.threshold_sell:
+        return "SELL"
+    return "HOLD"
+
+def orderbook_can_decide(score_without_ob: float, w: BlenderWeights = BlenderWeights()) -> bool:
+    """False when no orderbook score in [-1, 1] can change the side of a signal scored with
+    orderbook_score=0 (the side is monotonic in score, so checking both extremes is enough)."""
+    swing = abs(w.orderbook)
+    return _side(score_without_ob - swing, w) != _side(score_without_ob + swing, w)
+
 def generate_signal(
     venue: Venue,
     symbol: str,
@@ -111,11 +124,7 @@ def generate_signal(
 
     score = (w.trend*s_trend) + (w.rsi*s_rsi) + (w.volume*s_vol) + (w.news*news_score) + (w.orderbook*orderbook_score) + s_fib + mtf
 
-    side = "HOLD"
-    if score >= w.threshold_buy:
-        side = "BUY"
-    elif score <= -w.threshold_sell:
-        side = "SELL"
+    side = _side(score, w)
 
     meta: Dict[str, Any] = {
         "score_breakdown": {
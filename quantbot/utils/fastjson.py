@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+"""JSON helpers for hot paths.
+
+Uses orjson when it is installed (`pip install quantbot[fast]`) and falls back
+to the stdlib json module otherwise, so callers never need their own guards.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def dumps_bytes(obj: Any, *, sort_keys: bool = False) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+        except TypeError:
+            # orjson is stricter than json (numpy scalars, non-str keys); same output via stdlib
+            pass
+    return json.dumps(obj, ensure_ascii=False, sort_keys=sort_keys, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_line(obj: Any) -> bytes:
+    """Serialize to one newline-terminated JSON line (JSONL record)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def loads(data: bytes | bytearray | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
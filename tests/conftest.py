@@ -0,0 +1,4 @@
+import os
+
+# quantbot.storage.db builds its engine at import time; keep tests off the postgres default.
+os.environ.setdefault("DB_URL", "sqlite://")
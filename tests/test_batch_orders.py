@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+import pytest
+
+from quantbot.common.types import OrderRequest
+from quantbot.execution.adapters.binance_futures_adapter import BinanceFuturesAdapter
+from quantbot.execution.executor import OrderExecutor
+
+
+class _FakeFutures(BinanceFuturesAdapter):
+    """batchOrders answered locally: client ids starting "bad" get a {"code","msg"} entry,
+    and a chunk holding a "short" id gets a response missing its last item."""
+
+    def __init__(self):
+        super().__init__("key", "secret")
+        self.chunks: list[list[str]] = []
+        self._next_id = 1000
+
+    async def get_dual_side_position(self, *, max_age_sec: int = 300):
+        return False
+
+    async def _signed_request(self, method, path, params):
+        assert (method, path) == ("POST", "/fapi/v1/batchOrders")
+        orders = json.loads(params["batchOrders"])
+        ids = [o["newClientOrderId"] for o in orders]
+        self.chunks.append(ids)
+        await asyncio.sleep(0.01 * (3 - len(self.chunks) % 3))  # chunks finish out of order
+        out = []
+        for o in orders:
+            if o["newClientOrderId"].startswith("bad"):
+                out.append({"code": -2019, "msg": "Margin is insufficient."})
+            else:
+                self._next_id += 1
+                out.append({"orderId": self._next_id, "status": "FILLED", "executedQty": o["quantity"], "avgPrice": o["price"]})
+        return out[:-1] if any(i.startswith("short") for i in ids) else out
+
+
+def _req(cid, i=0):
+    return OrderRequest(
+        venue="binance_futures", symbol="BTCUSDT", side="BUY", order_type="LIMIT",
+        qty=0.001 * (i + 1), price=100.0 + i, client_order_id=cid, meta={"timeInForce": "IOC"},
+    )
+
+
+def test_place_orders_batch_chunks_and_maps_errors():
+    a = _FakeFutures()
+    cids = [f"ok{i}" for i in range(12)]
+    cids[3] = "bad3"
+    reqs = [_req(c, i) for i, c in enumerate(cids)]
+
+    ups = asyncio.run(a.place_orders_batch(reqs))
+
+    assert sorted(len(c) for c in a.chunks) == [2, 5, 5]
+    assert [u.client_order_id for u in ups] == cids  # request order survives chunking
+    assert ups[3].status == "REJECTED" and ups[3].raw["body"]["code"] == -2019
+    ok = [u for i, u in enumerate(ups) if i != 3]
+    assert all(u.status == "FILLED" for u in ok)
+    assert [u.filled_qty for u in ok] == pytest.approx([r.qty for i, r in enumerate(reqs) if i != 3])
+
+
+def test_place_orders_batch_rejects_chunk_on_length_mismatch():
+    a = _FakeFutures()
+    cids = [f"ok{i}" for i in range(5)] + ["short5", "ok6"]
+    ups = asyncio.run(a.place_orders_batch([_req(c, i) for i, c in enumerate(cids)]))
+
+    assert [u.status for u in ups[:5]] == ["FILLED"] * 5
+    assert [u.status for u in ups[5:]] == ["REJECTED"] * 2
+    assert "unexpected batchOrders response" in ups[5].raw["error"]
+
+
+def test_execute_many_uses_batch_in_request_order():
+    a = _FakeFutures()
+    ex = OrderExecutor(a, confirm_fills=False)
+    cids = [f"ok{i}" for i in range(7)]
+    res = asyncio.run(ex.execute_many([_req(c, i) for i, c in enumerate(cids)]))
+
+    assert len(a.chunks) == 2
+    assert [r.req.client_order_id for r in res] == cids
+    assert [r.update.client_order_id for r in res] == cids
+    assert all(r.update.status == "FILLED" for r in res)
@@ -0,0 +1,57 @@
+import asyncio
+from types import SimpleNamespace
+
+from quantbot.common.types import OrderRequest, OrderUpdate
+from quantbot.execution.executor import OrderExecutor
+
+
+class _StepAdapter:
+    """Fills everything, but rejects quantities finer than the symbol's qty step (like -1111)."""
+
+    venue = "binance_futures"
+
+    def __init__(self, step: float):
+        self.step = step
+        self.sent: list[OrderRequest] = []
+
+    async def get_symbol_rules(self, symbol, *, order_type="MARKET"):
+        return SimpleNamespace(qty_step=self.step)
+
+    async def place_order(self, req):
+        self.sent.append(req)
+        steps = req.qty / self.step
+        if abs(steps - round(steps)) > 1e-6:
+            raise RuntimeError("-1111 Precision is over the maximum defined for this asset.")
+        return OrderUpdate(
+            venue=req.venue, order_id=f"o{len(self.sent)}", symbol=req.symbol, status="FILLED",
+            filled_qty=req.qty, avg_fill_price=req.price or 100.0, client_order_id=req.client_order_id,
+        )
+
+
+def test_parallel_legs_are_rounded_to_qty_step():
+    adapter = _StepAdapter(step=0.0001)
+    ex = OrderExecutor(adapter, confirm_fills=False)
+    req = OrderRequest(venue="binance_futures", symbol="BTCUSDT", side="BUY", order_type="LIMIT", qty=0.001, price=100.0, client_order_id="c1")
+
+    res = asyncio.run(ex.execute_ioc_limit_prices_then_market(req, [100.0, 100.1, 100.2], fallback_market=True, parallel=True))
+
+    legs = [r for r in adapter.sent if r.order_type == "LIMIT"]
+    market = [r for r in adapter.sent if r.order_type == "MARKET"]
+    assert len(legs) == 3 and all(abs(r.qty - 0.0003) < 1e-12 for r in legs)
+    assert len(market) == 1 and abs(market[0].qty - 0.0001) < 1e-12  # rounding remainder
+    assert res.update.status == "FILLED"
+    assert abs(res.update.filled_qty - 0.001) < 1e-12
+
+
+def test_leg_client_ids_fit_binance_limit():
+    adapter = _StepAdapter(step=0.001)
+    ex = OrderExecutor(adapter, confirm_fills=False)
+    cid = "1000000MOGUSDT-ENTRY-1760000000000"  # 34 chars, as live.py builds it
+    req = OrderRequest(venue="binance_futures", symbol="1000000MOGUSDT", side="BUY", order_type="LIMIT", qty=1.0, price=1.0, client_order_id=cid)
+
+    asyncio.run(ex.execute_ioc_limit_prices_then_market(req, [1.0, 1.1], fallback_market=True, parallel=True))
+
+    ids = [r.client_order_id for r in adapter.sent]
+    assert all(len(i) <= 36 for i in ids)
+    assert len(set(ids)) == len(ids)
+    assert ids[0].endswith("1760000000000-L0")
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import quantbot.features.indicators as ind
+
+
+def _pandas_indicators(df: pd.DataFrame, monkeypatch) -> pd.DataFrame:
+    with monkeypatch.context() as m:
+        m.setattr(ind, "_fused_indicators_jit", None)
+        return ind.add_indicators(df)
+
+
+@pytest.mark.skipif(ind._fused_indicators_jit is None, reason="numba not installed")
+def test_fused_matches_pandas_on_zero_volume_run(monkeypatch):
+    rng = np.random.default_rng(0)
+    vol = rng.random(400) * 3.7
+    vol[100:140] = 0.0  # zero-volume bars right after traded bars
+    close = 100 + np.cumsum(rng.normal(size=400))
+    close[200:240] = close[199]
+    df = pd.DataFrame({"close": close, "volume": vol})
+
+    fused = ind.add_indicators(df)
+    ref = _pandas_indicators(df, monkeypatch)
+
+    assert (fused["VOL_SMA_5"].iloc[104:140] == 0.0).all()
+    for col in ["SMA_30", "BBM_20_2", "VOL_SMA_5", "VOL_SMA_20", "VOL_SURGE"]:
+        a = fused[col].astype(float).to_numpy()
+        b = ref[col].astype(float).to_numpy()
+        assert np.array_equal(np.isnan(a), np.isnan(b)), col
+        np.testing.assert_allclose(a, b, rtol=1e-12, atol=0, equal_nan=True, err_msg=col)
+
+
+@pytest.mark.parametrize("rows", [50, 60, 80])
+def test_fibonacci_levels_matches_tail_window(rows):
+    rng = np.random.default_rng(rows)
+    low = np.arange(rows, dtype=float) + rng.random(rows)
+    df = pd.DataFrame({"high": low + 1.0, "low": low})
+    sub = df.tail(60)
+    got = ind.fibonacci_levels(df, lookback=60)
+    assert got["low"] == float(sub["low"].min())
+    assert got["high"] == float(sub["high"].max())
@@ -0,0 +1,25 @@
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+import quantbot.storage.order_persister as op
+from quantbot.common.types import OrderRequest, OrderUpdate
+from quantbot.storage.db import Base
+from quantbot.storage.models import OrderModel
+
+
+def test_insert_rows_upserts_on_client_order_id(monkeypatch):
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(op, "get_session", sessionmaker(bind=engine, future=True))
+
+    req = OrderRequest(venue="binance_futures", symbol="BTCUSDT", side="BUY", order_type="LIMIT", qty=2.0, price=100.0, client_order_id="c1")
+
+    def row(status, filled):
+        return op._order_row(req, OrderUpdate(venue="binance_futures", order_id="o1", symbol="BTCUSDT", status=status, filled_qty=filled))
+
+    op._insert_rows([row("NEW", 0.0), row("PARTIALLY_FILLED", 1.0)])  # same key twice in one batch
+    op._insert_rows([row("FILLED", 2.0)])  # later confirmation of a stored order
+
+    with op.get_session() as s:
+        got = s.execute(select(OrderModel.status, OrderModel.filled_qty)).all()
+    assert got == [("FILLED", 2.0)]
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from quantbot.common.types import OrderRequest
+from quantbot.execution.adapters.paper_adapter import PaperAdapter, PaperConfig
+
+
+class _Market:
+    def __init__(self):
+        self.px = 100.0
+
+    async def get_last_price(self, symbol):
+        return self.px
+
+
+def _adapter(tmp_path, market):
+    # long flush interval: nothing reaches the snapshot unless a test flushes explicitly
+    cfg = PaperConfig(state_path=str(tmp_path / "paper_state.json"), flush_interval_sec=3600, price_cache_ttl_sec=0)
+    return PaperAdapter("binance", cfg, market_adapter=market)
+
+
+def _crash(a):
+    """Drop the adapter without close(): the background snapshot never runs."""
+    if a._flush_task is not None:
+        a._flush_task.cancel()
+    if a._journal_fh is not None:
+        a._journal_fh.close()
+
+
+async def _buy(a, market, px, symbol="BTCUSDT"):
+    market.px = px
+    u = await a.place_order(OrderRequest(venue="binance", symbol=symbol, side="BUY", order_type="MARKET", qty=1.0))
+    assert u.status == "FILLED"
+
+
+def _position(a):
+    st = a._state
+    pos = {b: (st["qty"][i], st["avg_cost"][i]) for b, i in a._pos_idx.items()}
+    return st["cash"], pos, st["journal_seq"]
+
+
+def test_crash_before_snapshot_replays_journal(tmp_path):
+    async def run():
+        m = _Market()
+        a = _adapter(tmp_path, m)
+        await _buy(a, m, 100.0)
+        await _buy(a, m, 110.0)
+        want = _position(a)
+        _crash(a)
+        return want, _position(_adapter(tmp_path, m))
+
+    want, got = asyncio.run(run())
+    assert got == want
+
+
+def test_failed_snapshot_keeps_rotated_journal(tmp_path, monkeypatch):
+    async def run():
+        m = _Market()
+        a = _adapter(tmp_path, m)
+
+        def fail(data):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(a, "_write_state", fail)
+        await _buy(a, m, 100.0)
+        with pytest.raises(OSError):
+            await a.flush()  # journal rotated to .prev, snapshot never written
+        await _buy(a, m, 110.0, "ETHUSDT")  # the only ETH record: lost unless rotation appends to .prev
+        with pytest.raises(OSError):
+            await a.flush()  # .prev already exists: the new records are appended to it
+        await _buy(a, m, 120.0)
+        want = _position(a)
+        _crash(a)
+        assert a._journal_prev.exists()
+        return want, _position(_adapter(tmp_path, m))
+
+    want, got = asyncio.run(run())
+    assert got == want
+    assert got[1] == {"BTC": (2.0, pytest.approx(110.0 * 1.0005)), "ETH": (1.0, pytest.approx(110.0 * 1.0005))}
+
+
+def test_replaying_records_twice_is_idempotent(tmp_path):
+    async def run():
+        m = _Market()
+        a = _adapter(tmp_path, m)
+        await _buy(a, m, 100.0)
+        after_first = a._journal_file.read_bytes()
+        await _buy(a, m, 110.0)
+        want = _position(a)
+        _crash(a)
+        # .prev holds every record; the live journal repeats the older one after it
+        a._journal_prev.write_bytes(a._journal_file.read_bytes())
+        a._journal_file.write_bytes(after_first)
+        b = _adapter(tmp_path, m)
+        first = _position(b)
+        _crash(b)
+        return want, first, _position(_adapter(tmp_path, m))
+
+    want, first, second = asyncio.run(run())
+    assert first == want
+    assert second == want